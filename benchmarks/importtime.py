@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Import-time benchmark for the verschemes package.
+
+This runs ``python -X importtime`` in fresh interpreters (Python 3.7+) after a
+warm-up run that writes the bytecode cache, takes the median cumulative import
+time of each requested module, and fails if the total exceeds the budget.  Run
+it from the project root::
+
+    python benchmarks/importtime.py [--budget MS] [--runs N] [MODULE ...]
+
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+
+DEFAULT_MODULES = ['verschemes']
+DEFAULT_BUDGET_MS = 20.0
+"""The budget for the cumulative import time of the default modules."""
+
+_LINE_RE = re.compile(r'^import time:\s*(\d+) \|\s*(\d+) \| (\s*)(\S+)$')
+
+
+def cumulative_import_times(modules, runs):
+    """Return {module: [cumulative microseconds per run]}."""
+    env = dict(os.environ)
+    # Measure warm imports from cached bytecode, as installed packages are.
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    src = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                       os.pardir, 'src')
+    env['PYTHONPATH'] = os.pathsep.join(
+        [src] + [x for x in [env.get('PYTHONPATH')] if x])
+    code = 'import ' + ', '.join(modules)
+    result = dict((x, []) for x in modules)
+    for run in range(runs + 1):
+        output = subprocess.check_output(
+            [sys.executable, '-X', 'importtime', '-c', code],
+            stderr=subprocess.STDOUT, env=env, universal_newlines=True)
+        if not run:
+            continue  # warm-up run (writes the bytecode cache)
+        for line in output.splitlines():
+            match = _LINE_RE.match(line)
+            if match and match.group(4) in result:
+                result[match.group(4)].append(int(match.group(2)))
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES)
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET_MS,
+                        help="total budget in milliseconds "
+                             "(default: %(default)s)")
+    parser.add_argument('--runs', type=int, default=15)
+    args = parser.parse_args(argv)
+    times = cumulative_import_times(args.modules, args.runs)
+    total = 0.0
+    for module in args.modules:
+        median = (statistics.median(times[module]) / 1000
+                  if times[module] else 0)
+        total += median
+        print("{:<30} {:8.2f} ms".format(module, median))
+    print("{:<30} {:8.2f} ms (budget {:.2f} ms)"
+          .format('total', total, args.budget))
+    return 0 if total <= args.budget else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
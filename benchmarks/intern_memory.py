@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Memory benchmark for interning versions with an InternPool.
+
+This parses a list of version strings (``--references`` of them, cycling
+through ``--distinct`` distinct PEP 440 versions) into versions with and
+without an `~verschemes.InternPool` attached to the scheme, and reports the
+memory allocated for the versions as measured by `tracemalloc`.  Run it from
+the project root::
+
+    python benchmarks/intern_memory.py [--references N] [--distinct N]
+
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir, 'src'))
+
+from verschemes import InternPool
+from verschemes.pep440 import Pep440Version
+
+
+def distinct_strings(count):
+    """Return `count` distinct version strings, a third with pre-releases."""
+    result = []
+    for i in range(count):
+        string = '{}.{}.{}'.format(i // 400, i // 20 % 20, i % 20)
+        if i % 3 == 0:
+            string += 'b{}'.format(i % 4)
+        result.append(string)
+    return result
+
+
+def measure(strings, pool):
+    """Return (allocated bytes, seconds) for parsing all of the strings."""
+    Pep440Version.INTERN_POOL = pool
+    try:
+        tracemalloc.start()
+        start = time.time()
+        versions = [Pep440Version(x) for x in strings]
+        seconds = time.time() - start
+        allocated = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    finally:
+        Pep440Version.INTERN_POOL = None
+    del versions
+    return allocated, seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--references', type=int, default=10000000)
+    parser.add_argument('--distinct', type=int, default=300000)
+    args = parser.parse_args(argv)
+    distinct = distinct_strings(args.distinct)
+    strings = [distinct[i % len(distinct)] for i in range(args.references)]
+    for label, pool in (('plain', None), ('interned', InternPool())):
+        allocated, seconds = measure(strings, pool)
+        print("{:<10} {:10.1f} MiB {:8.2f} s"
+              .format(label, allocated / (1 << 20), seconds))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
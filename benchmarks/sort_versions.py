@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Scaling benchmark for verschemes.sort_versions.
+
+This times ``sorted`` and `~verschemes.sort_versions` on random lists of
+versions of increasing size for several version schemes and checks that the
+results are identical.  Run it from the project root::
+
+    python benchmarks/sort_versions.py [--sizes N [N ...]] [--seed N]
+
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir, 'src'))
+
+from verschemes import Version, sort_versions
+from verschemes.pep440 import Pep440Version
+from verschemes.postgresql import PgVersion
+from verschemes.xorg import XorgVersion
+
+
+GENERATORS = {
+    'default': lambda r: Version(r.randint(0, 9), r.randint(0, 99),
+                                 r.randint(0, 999)),
+    'postgresql': lambda r: PgVersion(r.randint(7, 15), r.randint(0, 6),
+                                      r.choice([None, r.randint(0, 30)])),
+    'xorg': lambda r: XorgVersion(r.randint(1, 20), r.randint(0, 20),
+                                  r.randint(0, 20)),
+    'pep440': lambda r: Pep440Version(release1=r.randint(0, 9),
+                                      release2=r.randint(0, 99)),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[1000, 10000, 100000])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    print("{:<12} {:>8} {:>10} {:>10} {:>7}"
+          .format('scheme', 'size', 'sorted', 'sort_vers', 'speedup'))
+    for name in sorted(GENERATORS):
+        for size in args.sizes:
+            r = random.Random(args.seed)
+            versions = [GENERATORS[name](r) for _ in range(size)]
+            start = time.time()
+            expected = sorted(versions)
+            middle = time.time()
+            actual = sort_versions(versions)
+            end = time.time()
+            if actual != expected:
+                print("{}: results differ".format(name))
+                return 1
+            print("{:<12} {:>8} {:>9.3f}s {:>9.3f}s {:>6.1f}x"
+                  .format(name, size, middle - start, end - middle,
+                          (middle - start) / (end - middle)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
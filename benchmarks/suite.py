@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Per-operation benchmark suite for the verschemes version schemes.
+
+Each benchmark runs one operation (parsing, construction, rendering,
+comparison, sorting, ...) over a fixed, seeded sample of versions of one
+scheme with `timeit`, and reports the best time per version.  Results can be
+saved as a JSON baseline and later runs compared with it.  Run it from the
+project root::
+
+    python benchmarks/suite.py [-k FILTER] [--save FILE] [--compare FILE]
+
+For example, save a baseline before a change and compare after it::
+
+    python benchmarks/suite.py --save /tmp/before.json
+    python benchmarks/suite.py --compare /tmp/before.json
+
+`baseline.json` in this directory is a reference run of the current code.
+
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir, 'src'))
+
+from verschemes import Version
+from verschemes.pep440 import Pep440Version
+from verschemes.postgresql import PgVersion
+from verschemes.python import PythonVersion
+from verschemes.xorg import XorgVersion
+
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        'baseline.json')
+
+SAMPLE_SIZE = 500
+"""The number of versions each benchmark operates on."""
+
+
+def _default_values(r):
+    return (r.randint(0, 9), r.randint(0, 30), r.randint(0, 99))
+
+
+def _python_values(r):
+    suffix = r.choice([None, None, ('a', r.randint(1, 4)),
+                       ('b', r.randint(1, 4)), ('c', r.randint(1, 2))])
+    return (r.randint(2, 3), r.randint(0, 12), r.randint(0, 20), suffix)
+
+
+def _pep440_values(r):
+    values = [None] * 10
+    values[1:4] = r.randint(0, 9), r.randint(0, 30), r.randint(0, 99)
+    if r.random() < 0.3:
+        values[7] = r.choice('abc'), r.randint(0, 4)
+    if r.random() < 0.2:
+        values[8] = r.randint(0, 3)
+    return tuple(values)
+
+
+def _pg_values(r):
+    return (r.randint(7, 15), r.randint(0, 6),
+            r.choice([None, r.randint(0, 30)]))
+
+
+def _xorg_values(r):
+    if r.random() < 0.3:
+        return (r.randint(1, 20), r.randint(0, 20), 99, r.randint(1, 905))
+    return (r.randint(1, 20), r.randint(0, 20), r.randint(0, 20), 0)
+
+
+SCHEMES = [
+    # (name, scheme, random values, render options, replace options)
+    ('default', Version, _default_values,
+     {'exclude_defaults': False}, {'_1': 7}),
+    ('python', PythonVersion, _python_values,
+     {'exclude_defaults': False}, {'minor': 7}),
+    ('pep440', Pep440Version, _pep440_values,
+     {'min_release_segments': 3}, {'release2': 7}),
+    ('postgresql', PgVersion, _pg_values,
+     {'exclude_defaults': False}, {'minor': 7}),
+    ('xorg', XorgVersion, _xorg_values,
+     {'exclude_defaults': False}, {'minor': 7}),
+]
+
+
+def _sortable(versions):
+    """Return the largest subset of the versions that can be sorted.
+
+    Cooked values of optional segments without defaults are `None`, which
+    cannot be compared with other values in Python 3, so only versions with
+    the same unspecified segments are sorted together.
+
+    """
+    try:
+        sorted(versions)
+        return versions
+    except TypeError:
+        groups = {}
+        for version in versions:
+            key = tuple(x is None for x in version[:])
+            groups.setdefault(key, []).append(version)
+        return max(groups.values(), key=len)
+
+
+def _operations(scheme, values, render_options, replace_options):
+    """Return a list of the (name, function, count) benchmarks of a sample.
+
+    Each function processes `count` versions.
+
+    """
+    versions = [scheme(*x) for x in values]
+    strings = [str(x) for x in versions]
+    names = [x.name for x in scheme.SEGMENT_DEFINITIONS]
+    kwargs = ([dict((n, v) for n, v in zip(names, x) if v is not None)
+               for x in values] if names else None)
+    others = [scheme(x) for x in strings]
+    sortable = _sortable(versions)
+    count = len(versions)
+    operations = [
+        ('parse', lambda: [scheme(x) for x in strings], count),
+        ('construct', lambda: [scheme(*x) for x in values], count),
+    ]
+    if kwargs is not None:
+        operations.append(
+            ('construct_kwargs', lambda: [scheme(**x) for x in kwargs],
+             count))
+    operations.extend([
+        ('str', lambda: [str(x) for x in versions], count),
+        ('render', lambda: [x.render(**render_options) for x in versions],
+         count),
+        ('replace', lambda: [x.replace(**replace_options) for x in versions],
+         count),
+        ('eq', lambda: [x == y for x, y in zip(versions, others)], count),
+        ('sort', lambda: sorted(sortable), len(sortable)),
+        # Versions are unhashable in Python 3 (they compare by their cooked
+        # values), so this measures hashing those instead.
+        ('hash', lambda: [hash(x[:]) for x in versions], count),
+    ])
+    return operations
+
+
+def run(pattern='', number=3, repeat=5, out=sys.stdout):
+    """Run the matching benchmarks, and return {name: seconds per version}."""
+    results = {}
+    for name, scheme, generate, render_options, replace_options in SCHEMES:
+        r = random.Random(name)
+        values = []
+        while len(values) < SAMPLE_SIZE:
+            candidate = generate(r)
+            try:
+                scheme(*candidate)
+            except ValueError:
+                continue
+            values.append(candidate)
+        for operation, function, count in _operations(scheme, values,
+                                                      render_options,
+                                                      replace_options):
+            key = '{}/{}'.format(name, operation)
+            if pattern not in key:
+                continue
+            best = min(timeit.repeat(function, number=number, repeat=repeat))
+            results[key] = best / number / count
+            print("{:<28} {:10.2f} us".format(key, results[key] * 1e6),
+                  file=out)
+    return results
+
+
+def compare(results, baseline, out=sys.stdout):
+    """Print the changes of the results relative to the baseline results."""
+    print("{:<28} {:>10} {:>10} {:>8}".format('benchmark', 'baseline',
+                                             'current', 'change'), file=out)
+    for key in sorted(results):
+        if key not in baseline:
+            continue
+        old, new = baseline[key], results[key]
+        print("{:<28} {:8.2f}us {:8.2f}us {:+7.1f}%"
+              .format(key, old * 1e6, new * 1e6, (new / old - 1) * 100),
+              file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-k', '--filter', default='',
+                        help="only run benchmarks whose names contain this")
+    parser.add_argument('--number', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--save', metavar='FILE',
+                        help="save the results as a JSON baseline")
+    parser.add_argument('--compare', metavar='FILE', nargs='?',
+                        const=BASELINE,
+                        help="compare with a JSON baseline (default: "
+                             "baseline.json)")
+    args = parser.parse_args(argv)
+    results = run(args.filter, args.number, args.repeat)
+    if args.save:
+        with io.open(args.save, 'w') as f:
+            f.write(json.dumps({
+                'python': platform.python_version(),
+                'results': results,
+            }, indent=2, sort_keys=True) + '\n')
+    if args.compare:
+        with io.open(args.compare) as f:
+            baseline = json.load(f)['results']
+        print()
+        compare(results, baseline)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
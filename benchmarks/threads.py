@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Multi-threaded parsing throughput benchmark for verschemes.
+
+This parses a fixed corpus of version strings of each scheme split evenly
+among increasing numbers of threads, each of which also compares its versions
+with strings (which goes through the per-thread parse cache), and reports the
+throughput and its scaling relative to one thread.  The threads only scale on
+a free-threaded build of CPython (3.13t or later) with multiple cores; with
+the GIL the throughput stays flat.  Run it from the project root::
+
+    python benchmarks/threads.py [--threads N [N ...]] [--count N]
+
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir, 'src'))
+
+from verschemes import Version
+from verschemes.corpus import generate
+from verschemes.pep440 import Pep440Version
+from verschemes.postgresql import PgVersion
+from verschemes.xorg import XorgVersion
+
+
+SCHEMES = [('default', Version), ('pep440', Pep440Version),
+           ('postgresql', PgVersion), ('xorg', XorgVersion)]
+
+
+def _work(scheme, strings, results, index):
+    versions = [scheme(x) for x in strings]
+    results[index] = sum(x <= y for x, y in zip(versions, strings))
+
+
+def run(scheme, strings, count):
+    """Return the seconds taken to process the strings with `count` threads."""
+    shares = [strings[i::count] for i in range(count)]
+    results = [None] * count
+    threads = [threading.Thread(target=_work,
+                                args=(scheme, shares[i], results, i))
+               for i in range(count)]
+    start = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.time() - start
+    if sum(results) != len(strings):
+        raise AssertionError("wrong comparison results")
+    return elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, nargs='+',
+                        default=[1, 2, 4, 8])
+    parser.add_argument('--count', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print("Python {} ({}), {} CPUs"
+          .format(sys.version.split()[0],
+                  'GIL' if gil else 'free-threaded',
+                  getattr(os, 'cpu_count', lambda: '?')()))
+    print("{:<12} {:>8} {:>12} {:>8}"
+          .format('scheme', 'threads', 'versions/s', 'scaling'))
+    for name, scheme in SCHEMES:
+        strings = list(generate(scheme, args.count, seed=0))
+        # The scaling is always relative to one thread, which is measured
+        # even if it is not one of the reported counts.
+        times = {}
+        for count in [1] + [x for x in args.threads if x != 1]:
+            times[count] = min(run(scheme, strings, count)
+                               for _ in range(args.repeat))
+        single = times[1]
+        for count in args.threads:
+            elapsed = times[count]
+            print("{:<12} {:>8} {:>12.0f} {:>7.2f}x"
+                  .format(name, count, len(strings) / elapsed,
+                          single / elapsed))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -37,5 +37,5 @@ setup(
     package_dir={'': 'src'},
     packages=['verschemes',
               'verschemes.future'],
-    install_requires=['future'],
+    install_requires=['future; python_version < "3"'],
     )
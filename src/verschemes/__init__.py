@@ -11,19 +11,55 @@ from __future__ import (absolute_import, division, print_function,
 from verschemes.future import *
 
 import collections
-import inspect
-import itertools
+import heapq
+import importlib
+import mmap
+import operator
+import os
 import re
+import sys
+import threading
 
 from verschemes._version import __version__, __version_info__
 
+from verschemes._types import int_empty_zero
+
+try:
+    from collections.abc import Iterable, Mapping
+except ImportError:  # pragma: no cover  # Python 2
+    from collections import Iterable, Mapping
+
 
 __all__ = []
 
 
+_STRING_TYPES = (str,) if future.PY3 else (str, future.native_str)
+
+_BYTES_TYPES = (bytes, bytearray, memoryview)
+
+_BYTES_ENCODING = 'utf-8'  # of version strings given as bytes
+
+
+if future.PY3:
+    def _is_class(value):
+        """Return whether `value` is a class."""
+        return isinstance(value, type)
+else:  # pragma: no cover
+    # Importing inspect is slow, but it also handles old-style classes.
+    from inspect import isclass as _is_class
+
+
 def _is_string(value):
     """Return whether `value` is a string."""
-    return isinstance(value, (str, future.native_str))
+    return isinstance(value, _STRING_TYPES)
+
+
+def _ignore_errors(errors):
+    """Return whether the `errors` argument says to ignore invalid input."""
+    if errors not in ('strict', 'ignore'):
+        raise ValueError(
+            "errors must be 'strict' or 'ignore', not {!r}.".format(errors))
+    return errors == 'ignore'
 
 
 def _validate_string(value):
@@ -35,6 +71,48 @@ def _validate_string(value):
         .format(value))
 
 
+# The module-level caches are safe to use from multiple threads without any
+# locking when reading them:
+#
+# * Caches of values that never change once computed (e.g., compiled regular
+#   expressions) are plain dicts whose entries are only ever added with a
+#   single `dict.setdefault`, so concurrent first uses agree on one value.
+# * Bounded caches that are cleared when full are kept per thread (see
+#   `_ThreadCaches`), so no thread sees another one clearing them.
+# * Mappings that are changed by registration (i.e., the converters) are
+#   replaced by changed copies instead of being changed in place, and the
+#   caches derived from them are replaced along with them.
+#
+# `_cache_lock` serializes the writers of the latter.
+_cache_lock = threading.Lock()
+
+
+class _ThreadCaches(threading.local):
+
+    """The bounded caches, each of which is kept per thread."""
+
+    def __init__(self):
+        self.parse = {}
+        self.projections = {}
+
+
+_thread_caches = _ThreadCaches()
+
+
+_bytes_regex_cache = {}
+
+
+def _bytes_regex(regex, encoding):
+    """Return the bytes form of the compiled (str) regular expression."""
+    key = regex.pattern, regex.flags, encoding
+    try:
+        return _bytes_regex_cache[key]
+    except KeyError:
+        result = re.compile(regex.pattern.encode(encoding),
+                            regex.flags & ~re.UNICODE)
+        return _bytes_regex_cache.setdefault(key, result)
+
+
 __all__.append('DEFAULT_FIELD_TYPE')
 DEFAULT_FIELD_TYPE = int
 """The type used for fields with no type explicitly specified."""
@@ -88,7 +166,7 @@ class SegmentField(collections.namedtuple('_SegmentField',
 
         """
         # Validate type.
-        if not inspect.isclass(type):
+        if not _is_class(type):
             raise TypeError(
                 "The 'type' argument must be a class.")
 
@@ -200,7 +278,7 @@ class SegmentDefinition(collections.namedtuple('_SegmentDefinition',
         if isinstance(fields, SegmentField):
             fields = (fields,)
         elif (not isinstance(fields, tuple) and
-              isinstance(fields, collections.Iterable)):
+              isinstance(fields, Iterable)):
             fields = tuple(fields)
         if not all(isinstance(x, SegmentField) for x in fields):
             raise ValueError(
@@ -242,7 +320,7 @@ class SegmentDefinition(collections.namedtuple('_SegmentDefinition',
             value_string = value
         else:
             values = (list(value)
-                      if isinstance(value, collections.Iterable) else
+                      if isinstance(value, Iterable) else
                       [value])
             if len(values) > len(fields):
                 raise ValueError(
@@ -253,13 +331,12 @@ class SegmentDefinition(collections.namedtuple('_SegmentDefinition',
                 values.append(None)
             value_string = "".join(x.render(None if y is None else x.type(y))
                                    for x, y in zip(fields, values))
-        re_pattern = '^' + "".join('(?P<{}>{})'.format(x.name, x.re_pattern)
-                                   for x in fields) + '$'
-        match = re.match(re_pattern, value_string)
+        regex, segment_type = _fields_metadata(fields)
+        match = regex.match(value_string)
         if not match:
             raise ValueError(
                 "Version segment {!r} does not match {!r}."
-                .format(value_string, re_pattern))
+                .format(value_string, regex.pattern))
         result = []
         for i in range(len(fields)):
             field = fields[i]
@@ -269,10 +346,7 @@ class SegmentDefinition(collections.namedtuple('_SegmentDefinition',
             except (TypeError, ValueError):
                 value = None
             result.append(value)
-        return (result[0] if len(fields) == 1 else
-                collections.namedtuple('Segment',
-                                       ' '.join(x.name for x in fields)
-                                       )(*result))
+        return result[0] if segment_type is None else segment_type(*result)
 
     @property
     def re_pattern(self):
@@ -325,11 +399,105 @@ class SegmentDefinition(collections.namedtuple('_SegmentDefinition',
                         for i in range(len(self.fields))))
 
 
+_fields_cache = {}
+
+
+def _fields_metadata(fields):
+    """Return the compiled regex and `Segment` class for the fields.
+
+    These are generated on first use and cached for each distinct sequence of
+    fields.  The `Segment` class is `None` for a single field.
+
+    """
+    try:
+        return _fields_cache[fields]
+    except KeyError:
+        pass
+    regex = re.compile('^' + "".join('(?P<{}>{})'.format(x.name, x.re_pattern)
+                                     for x in fields) + '$')
+    segment_type = (None if len(fields) == 1 else
+                    collections.namedtuple('Segment',
+                                           ' '.join(x.name for x in fields)))
+    return _fields_cache.setdefault(fields, (regex, segment_type))
+
+
+_PARSE_CACHE_SIZE = 4096  # per thread
+
+_PROJECTION_CACHE_SIZE = 4096  # per thread
+_projection_lengths = {}
+
+
 __all__.append('DEFAULT_SEGMENT_DEFINITION')
 DEFAULT_SEGMENT_DEFINITION = SegmentDefinition()
 """The default `SegmentDefinition` instance."""
 
 
+_bytes_plans = {}
+
+
+def _bytes_plan(scheme):
+    """Return how to parse bytes version strings of the scheme.
+
+    This is the bytes form of the scheme's regular expression (`None` for
+    the default implementation) and, for each segment definition (just the
+    default one for the default implementation), a tuple of the definition,
+    the bytes form of its fields' regular expression, its `Segment` class,
+    and the name and type of each field.  It is generated on first use and
+    cached for each scheme.
+
+    """
+    try:
+        return _bytes_plans[scheme]
+    except KeyError:
+        pass
+    definitions = scheme.SEGMENT_DEFINITIONS
+    if definitions:
+        regex = _bytes_regex(scheme.REGULAR_EXPRESSION, _BYTES_ENCODING)
+    else:
+        regex, definitions = None, (DEFAULT_SEGMENT_DEFINITION,)
+    segments = []
+    for definition in definitions:
+        fields_regex, segment_type = _fields_metadata(definition.fields)
+        segments.append((definition,
+                         _bytes_regex(fields_regex, _BYTES_ENCODING),
+                         segment_type,
+                         tuple((x.name, x.type) for x in definition.fields)))
+    return _bytes_plans.setdefault(scheme, (regex, segments))
+
+
+def _bytes_field(type_, value):
+    """Return the field value of the type for the bytes (or `None`)."""
+    try:
+        return type_(value if type_ is int or value is None else
+                     value.decode(_BYTES_ENCODING))
+    except (TypeError, ValueError):
+        return None
+
+
+def _bytes_segment(plan, value, matched):
+    """Validate the bytes segment string and return its value.
+
+    The result is the same as that of `SegmentDefinition.validate_value` for
+    the decoded string, but only the values of the fields that are not of
+    the `int` type are decoded.  If the value was `matched` as part of the
+    version's regular expression, a single field is not matched again.
+
+    """
+    definition, regex, segment_type, fields = plan
+    if value is None:
+        return definition.validate_value(value)
+    if matched and segment_type is None:
+        return _bytes_field(fields[0][1], value)
+    match = regex.match(value)
+    if not match:
+        raise ValueError(
+            "Version segment {!r} does not match {!r}."
+            .format(value, regex.pattern))
+    if segment_type is None:
+        return _bytes_field(fields[0][1], match.group(fields[0][0]))
+    return segment_type(*[_bytes_field(x, match.group(y)) for y, x in fields])
+
+
 class _VersionMeta(type):
 
     __class_cache = {}
@@ -348,14 +516,12 @@ class _VersionMeta(type):
             raise TypeError(
                 "SEGMENT_DEFINITIONS must be defined.")
         definitions = cls.__validate_definitions(definitions)
-        regex = cls.__generate_re(definitions)
+        pattern = cls.__generate_re(definitions)
 
         # Add properties for segment names.
-        names = set(dct) | set(itertools.chain.from_iterable(dir(x)
-                                                              for x in bases))
         for i, segment in enumerate(definitions):
             sname = segment.name
-            if not sname or sname in names:
+            if not sname or cls.__is_defined(sname, dct, bases):
                 # no name or already defined
                 continue
             func = lambda o, i=i: o[i]
@@ -368,15 +534,22 @@ class _VersionMeta(type):
         # Create the new class.
         result = type.__new__(cls, name, bases, dct)
 
-        # Store the metadata generated above for future access.
-        cls.__class_cache[result] = definitions, regex
+        # Store the metadata generated above for future access.  The regular
+        # expressions are compiled on first use; threads racing to do that
+        # just compile equal ones, and the last one stored is kept.
+        cls.__class_cache[result] = [definitions, pattern, None, None]
 
         # Return the new class.
         return result
 
+    @staticmethod
+    def __is_defined(name, dct, bases):
+        return name in dct or any(name in vars(x)
+                                  for base in bases for x in base.__mro__)
+
     @staticmethod
     def __validate_definitions(definitions):
-        if not (isinstance(definitions, collections.Iterable) and
+        if not (isinstance(definitions, Iterable) and
                 all(isinstance(x, SegmentDefinition) for x in definitions)):
             raise TypeError(
                 "SEGMENT_DEFINITIONS is not a sequence of SegmentDefinitions.")
@@ -433,7 +606,7 @@ class _VersionMeta(type):
             if not definitions[i].required:
                 pattern += '?'
             segment = ''
-        return re.compile('^' + pattern + '$')
+        return pattern
 
     @property
     def SEGMENT_DEFINITIONS(cls):
@@ -443,7 +616,34 @@ class _VersionMeta(type):
     @property
     def REGULAR_EXPRESSION(cls):
         """The compiled regular expression that must be matched."""
-        return cls.__class_cache[cls][1]
+        metadata = cls.__class_cache[cls]
+        regex = metadata[2]
+        if regex is None and metadata[1] is not None:
+            regex = metadata[2] = re.compile('^' + metadata[1] + '$')
+        return regex
+
+    @property
+    def SEARCH_REGULAR_EXPRESSION(cls):
+        """The compiled regular expression for finding versions in text.
+
+        This is the unanchored form of `REGULAR_EXPRESSION` (also available
+        for the default implementation) restricted to matches that start with
+        a digit and are not within a longer run of digits, nor right after a
+        '.' (so the trailing segments of a longer version are not found as
+        another version).
+
+        """
+        metadata = cls.__class_cache[cls]
+        regex = metadata[3]
+        if regex is None:
+            pattern = metadata[1]
+            if pattern is None:
+                pattern = '{0}(?:{1}{0})*'.format(
+                    DEFAULT_SEGMENT_DEFINITION.re_pattern,
+                    re.escape(DEFAULT_SEGMENT_DEFINITION.separator))
+            regex = metadata[3] = re.compile(
+                '(?<![0-9.])(?=[0-9])(?:' + pattern + ')(?![0-9])')
+        return regex
 
 
 __all__.append('Version')
@@ -460,7 +660,8 @@ class Version(future.with_metaclass(_VersionMeta, tuple)):
     rules (i.e., a version scheme), and the instances of that class are version
     identifiers that follow those rules.
 
-    Pass the constructor either a version identifier as a `str` or the
+    Pass the constructor either a version identifier as a `str` (or, as of
+    version 1.3, as UTF-8 `bytes`, `bytearray`, or `memoryview`) or the
     individual segment values in order corresponding to the
     `SEGMENT_DEFINITIONS` defined by the class (or any number of integers if
     using the default implementation).  Optional segments and segments with
@@ -508,9 +709,21 @@ class Version(future.with_metaclass(_VersionMeta, tuple)):
 
     """
 
+    INTERN_POOL = None
+    """The `InternPool` of the instances of this class, if any.
+
+    When this is set (as a class attribute, which subclasses inherit), the
+    constructor returns the pool's canonical instance for each version.
+
+    """
+
     def __new__(cls, *args, **kwargs):
         segment_definitions = cls.SEGMENT_DEFINITIONS
-        if len(args) == 1 and _is_string(args[0]):
+        validated = False  # whether the values in `args` are validated
+        if len(args) == 1 and isinstance(args[0], _BYTES_TYPES):
+            args = cls._bytes_values(args[0])
+            validated = True
+        elif len(args) == 1 and _is_string(args[0]):
             # Process a version string passed as the only argument.
             string = args[0]
             if segment_definitions:
@@ -551,14 +764,36 @@ class Version(future.with_metaclass(_VersionMeta, tuple)):
             args[segment_indices[k]] = v
 
         # Validate and transform the values in `args`.
-        args = [(segment_definitions[i] if segment_definitions else
-                 DEFAULT_SEGMENT_DEFINITION).validate_value(args[i])
-                for i in range(len(args))]
+        if validated:
+            for k in kwargs:
+                i = segment_indices[k]
+                args[i] = segment_definitions[i].validate_value(args[i])
+        else:
+            args = [(segment_definitions[i] if segment_definitions else
+                     DEFAULT_SEGMENT_DEFINITION).validate_value(args[i])
+                    for i in range(len(args))]
 
         # Instantiate, validate, and return the new object.
         result = super().__new__(cls, args)
         result.validate()
-        return result
+        pool = cls.INTERN_POOL
+        return result if pool is None else pool.intern(result)
+
+    @classmethod
+    def _bytes_values(cls, data):
+        """Return the validated segment values of the bytes version string."""
+        regex, segments = _bytes_plan(cls)
+        if regex is None:
+            separator = DEFAULT_SEGMENT_SEPARATOR.encode(_BYTES_ENCODING)
+            return [_bytes_segment(segments[0], x, False)
+                    for x in bytes(data).split(separator)]
+        match = regex.match(data)
+        if not match:
+            raise ValueError(
+                "Version string {!r} does not match {!r}."
+                .format(bytes(data), regex.pattern))
+        return [_bytes_segment(x, y, True)
+                for x, y in zip(segments, match.groups())]
 
     def __repr__(self):
         cls = type(self)
@@ -568,17 +803,83 @@ class Version(future.with_metaclass(_VersionMeta, tuple)):
     def __str__(self):
         return self.render()
 
+    def _compare(self, other, op):
+        """Return the result of the comparison operator `op` with `other`.
+
+        Versions of different schemes are first converted to the same scheme
+        if a converter between them is registered (see `_convert_pair`), and
+        strings are parsed into this version's scheme when they can be.
+        Otherwise `other` is compared with this version converted to its type
+        (e.g., the rendered string) if that is possible.
+
+        """
+        if isinstance(other, Version):
+            if type(other) is not type(self):
+                pair = _convert_pair(self, other)
+                if pair is None:
+                    return NotImplemented
+                self, other = pair
+            return op(self[:], other[:])
+        if isinstance(other, LazyVersion):
+            return NotImplemented
+        if _is_string(other):
+            parsed = self._parse(other)
+            if parsed is not None:
+                return op(self[:], parsed[:])
+        as_other = self._coerce_to_type(type(other))
+        if as_other is None:
+            return (False if op is operator.eq else
+                    True if op is operator.ne else
+                    NotImplemented)
+        return op(as_other, other)
+
     def __eq__(self, other):
-        if not isinstance(other, Version):
-            as_other = self._coerce_to_type(type(other))
-            return False if as_other is None else (as_other == other)
-        return self[:] == other[:]
+        if type(other) is type(self):
+            return self[:] == other[:]
+        return self._compare(other, operator.eq)
+
+    def __ne__(self, other):
+        if type(other) is type(self):
+            return self[:] != other[:]
+        return self._compare(other, operator.ne)
 
     def __lt__(self, other):
-        if not isinstance(other, Version):
-            as_other = self._coerce_to_type(type(other))
-            return NotImplemented if as_other is None else (as_other < other)
-        return self[:] < other[:]
+        if type(other) is type(self):
+            return self[:] < other[:]
+        return self._compare(other, operator.lt)
+
+    def __le__(self, other):
+        if type(other) is type(self):
+            return self[:] <= other[:]
+        return self._compare(other, operator.le)
+
+    def __gt__(self, other):
+        if type(other) is type(self):
+            return self[:] > other[:]
+        return self._compare(other, operator.gt)
+
+    def __ge__(self, other):
+        if type(other) is type(self):
+            return self[:] >= other[:]
+        return self._compare(other, operator.ge)
+
+    @classmethod
+    def _parse(cls, string):
+        """Return the cached version for the string, or `None` if invalid."""
+        cache = _thread_caches.parse
+        key = cls, string
+        try:
+            return cache[key]
+        except KeyError:
+            pass
+        try:
+            result = cls(string)
+        except (TypeError, ValueError):
+            result = None
+        if len(cache) >= _PARSE_CACHE_SIZE:
+            cache.clear()
+        cache[key] = result
+        return result
 
     def _coerce_to_type(self, type_):
         try:
@@ -705,7 +1006,7 @@ class Version(future.with_metaclass(_VersionMeta, tuple)):
         def callback_affirmative(callback, index):
             args = [self, index]
             if (not callable(callback) and
-                isinstance(callback, collections.Iterable)):
+                isinstance(callback, Iterable)):
                 args.extend(callback[1:])
                 callback = callback[0]
             return callback(*args)
@@ -748,9 +1049,966 @@ class Version(future.with_metaclass(_VersionMeta, tuple)):
                 values[int(k[1:])] = kwargs.pop(k)
         return type(self)(*values, **kwargs)
 
+    @classmethod
+    def _trusted(cls, values):
+        """Return an instance with the already validated raw values.
+
+        The segment values are not validated again, but intersegment
+        validation is still done by `validate`, and the canonical instance is
+        returned if the class has an `INTERN_POOL`.
+
+        """
+        result = tuple.__new__(cls, values)
+        result.validate()
+        pool = cls.INTERN_POOL
+        return result if pool is None else pool.intern(result)
+
+    def project(self, scheme):
+        """Return the version in a scheme made of its leading segments.
+
+        The `SEGMENT_DEFINITIONS` of `scheme` must be the same as the first
+        segment definitions of this version's scheme, which is the case when
+        a scheme's definitions are the concatenation of another scheme's and
+        some more.  The values of those segments are reused without
+        validating them again, and a bounded number of the resulting versions
+        are kept for reuse (by each thread).
+
+        """
+        length = self._projection_length(scheme)
+        if not length:
+            raise TypeError(
+                "The segment definitions of {!r} are not a prefix of those of "
+                "{!r}.".format(scheme, type(self)))
+        return self._projected(scheme, length)
+
+    def _leading_version(self, scheme):
+        """Return the version in a scheme made of its leading segments.
+
+        The version is projected if the scheme allows it (see `project`), and
+        otherwise constructed from the leading segment values, e.g., for a
+        subclass whose segment definitions differ from the scheme's.
+
+        """
+        length = self._projection_length(scheme)
+        if length:
+            return self._projected(scheme, length)
+        return scheme(*[self[i]
+                        for i in range(len(scheme.SEGMENT_DEFINITIONS))])
+
+    def _projection_length(self, scheme):
+        """Return the number of segments projected to the scheme, or zero.
+
+        Zero means that the scheme's definitions are not a prefix of this
+        version's.
+
+        """
+        key = (type(self), scheme)
+        length = _projection_lengths.get(key)
+        if length is None:
+            definitions = scheme.SEGMENT_DEFINITIONS
+            prefix = (definitions and
+                      type(self).SEGMENT_DEFINITIONS[:len(definitions)] ==
+                      definitions)
+            length = _projection_lengths.setdefault(
+                key, len(definitions) if prefix else 0)
+        return length
+
+    def _projected(self, scheme, length):
+        """Return the projection of the leading `length` segments."""
+        if scheme is type(self):
+            return self
+        cache = _thread_caches.projections
+        key = (scheme, tuple.__getitem__(self, slice(0, length)))
+        try:
+            result = cache[key]
+        except KeyError:
+            pass
+        except TypeError:  # unhashable segment values
+            return scheme._trusted(key[1])
+        else:
+            pool = scheme.INTERN_POOL  # which may have been set since
+            return result if pool is None else pool.intern(result)
+        if len(cache) >= _PROJECTION_CACHE_SIZE:
+            cache.clear()
+        result = cache[key] = scheme._trusted(key[1])
+        return result
+
     def validate(self):
         """Override this in subclasses that require intersegment validation.
 
         Raise an appropriate exception if validation fails.
 
         """
+
+    @classmethod
+    def lazy(cls, string):
+        """Return a `LazyVersion` of this class for the version string.
+
+        The string is matched against the version scheme immediately, but the
+        individual segment values are only validated when they are needed.
+
+        """
+        return LazyVersion(cls, string)
+
+    @classmethod
+    def _from_search_match(cls, string):
+        try:
+            return cls(string)
+        except ValueError:
+            return None
+
+    @classmethod
+    def finditer(cls, text):
+        """Yield a ``(span, version)`` pair for each version found in `text`.
+
+        The versions are found with `SEARCH_REGULAR_EXPRESSION`, and `span` is
+        the ``(start, end)`` tuple of the version's position in `text`.
+        Empty matches and matches that are not valid versions (e.g., that fail
+        :meth:`validate`) are skipped.
+
+        """
+        for match in cls.SEARCH_REGULAR_EXPRESSION.finditer(text):
+            if match.end() == match.start():
+                continue
+            version = cls._from_search_match(match.group())
+            if version is not None:
+                yield match.span(), version
+
+    @classmethod
+    def search(cls, text):
+        """Return the first ``(span, version)`` pair found in `text`.
+
+        Return `None` if there is no version in `text`.  See
+        :meth:`finditer`.
+
+        """
+        for result in cls.finditer(text):
+            return result
+
+    @classmethod
+    def finditer_file(cls, path, encoding='utf-8'):
+        """Yield a ``(span, version)`` pair for each version in a file.
+
+        The file is memory-mapped and searched with the bytes form of
+        `SEARCH_REGULAR_EXPRESSION`, so a file of any size is scanned without
+        reading it into memory.  The spans are byte offsets into the file.
+        See :meth:`finditer`.
+
+        """
+        regex = _bytes_regex(cls.SEARCH_REGULAR_EXPRESSION, encoding)
+        with open(path, 'rb') as f:
+            if not os.fstat(f.fileno()).st_size:
+                return
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            matches = match = None
+            try:
+                matches = regex.finditer(data)
+                for match in matches:
+                    if match.end() == match.start():
+                        continue
+                    version = cls._from_search_match(
+                        match.group().decode(encoding))
+                    if version is not None:
+                        yield match.span(), version
+            finally:
+                # The buffer cannot be closed while a match refers to it.
+                matches = match = None
+                data.close()
+
+    @classmethod
+    def parse_many(cls, strings, errors='strict'):
+        """Return a list of the versions of this class parsed from strings.
+
+        Each string may be a `str` or a UTF-8 `bytes`, `bytearray`, or
+        `memoryview` (e.g., a line read from a binary file or socket without
+        its line ending), which is parsed without being decoded except for the
+        values of `str` fields.  Invalid strings raise `ValueError` unless
+        `errors` is 'ignore', in which case the list has `None` for them.
+
+        """
+        ignore = _ignore_errors(errors)
+        result = []
+        for string in strings:
+            try:
+                version = cls(string)
+            except (TypeError, ValueError):
+                if not ignore:
+                    raise
+                version = None
+            result.append(version)
+        return result
+
+    @classmethod
+    def compare_strings(cls, string1, string2):
+        """Compare two version strings of this class.
+
+        Return a negative integer, zero, or a positive integer if `string1`
+        represents a version that is less than, equal to, or greater than the
+        version represented by `string2`.  The result is the same as that of
+        comparing the `Version` instances parsed from the strings, but if the
+        class has segment definitions, no intersegment validation (see
+        :meth:`validate`), and no comparison of its own, the segment values are
+        only validated up to the first differing segment.
+
+        """
+        if not _lazy_compares(cls):
+            version1, version2 = cls(string1), cls(string2)
+            return (version2 < version1) - (version1 < version2)
+        return cls.lazy(string1)._compare(cls.lazy(string2))
+
+    @classmethod
+    def sort_strings(cls, strings, reverse=False):
+        """Return a new list of the version strings sorted by their versions.
+
+        The order is the same as when sorting the `Version` instances parsed
+        from the strings (and the sort is stable), but if the class has
+        segment definitions, no intersegment validation, and no comparison of
+        its own, the segment values of each pair are only validated up to the
+        first differing segment.
+
+        """
+        key = cls.lazy if _lazy_compares(cls) else cls
+        return sorted(strings, key=key, reverse=reverse)
+
+
+def _function(method):
+    return getattr(method, '__func__', method)
+
+
+def _needs_construction(scheme):
+    """Return whether matching the scheme's regex is not enough to accept.
+
+    A string matching the regular expression of a scheme that does not
+    override `Version.validate` (or the constructor) always makes a valid
+    version, because the segment values have then already matched the same
+    patterns that they are validated with.
+
+    """
+    return (_function(scheme.validate) is not _function(Version.validate) or
+            scheme.__new__ is not Version.__new__)
+
+
+def _lazy_compares(scheme):
+    """Return whether the lazy versions of the scheme compare like versions.
+
+    This is not the case if the scheme needs construction, it is the default
+    implementation, which has no regular expression to match (so the lazy
+    versions may not be valid), or it overrides the comparison.
+
+    """
+    return (bool(scheme.SEGMENT_DEFINITIONS) and
+            not _needs_construction(scheme) and _ordered_by_keys(scheme))
+
+
+_UNSET = object()
+
+
+__all__.append('LazyVersion')
+@python_2_unicode_compatible
+class LazyVersion(object):
+
+    """A version string whose segment values are validated on demand.
+
+    Instances are normally created with `Version.lazy`.  The version string is
+    matched against the scheme's `~Version.REGULAR_EXPRESSION` immediately, so
+    a string that cannot possibly be a version is rejected right away, but each
+    segment value is only converted and validated by its `SegmentDefinition`
+    the first time it is accessed, compared, or rendered.
+
+    Indexing by position, slice, or segment name and segment-name attributes
+    return the cooked segment value(s) just as with a `Version`.  Comparisons
+    with other lazy versions and with `Version` instances stop at the first
+    differing segment, so the trailing segments of most versions never have to
+    be validated.
+
+    The intersegment validation done by `Version.validate` only happens when
+    the full `Version` is built by :meth:`materialize`.
+
+    """
+
+    __slots__ = ('_scheme', '_match', '_values', '_keys', '_version')
+
+    def __init__(self, scheme, string):
+        string = _validate_string(string)
+        if scheme.SEGMENT_DEFINITIONS:
+            regex = scheme.REGULAR_EXPRESSION
+            match = regex.match(string)
+            if not match:
+                raise ValueError(
+                    "Version string {!r} does not match {!r}."
+                    .format(string, regex.pattern))
+            count = len(scheme.SEGMENT_DEFINITIONS)
+        else:
+            match = string.split(DEFAULT_SEGMENT_SEPARATOR)
+            count = len(match)
+        self._scheme = scheme
+        self._match = match
+        self._values = [_UNSET] * count
+        self._keys = [_UNSET] * count
+        self._version = None
+
+    @property
+    def scheme(self):
+        """The `Version` subclass that this version will materialize as."""
+        return self._scheme
+
+    def __len__(self):
+        return len(self._values)
+
+    def __repr__(self):
+        return "{}.{}.lazy({!r})".format(
+            self._scheme.__module__, self._scheme.__name__, self._string())
+
+    def __str__(self):
+        return self.materialize().render()
+
+    def _string(self):
+        match = self._match
+        return (DEFAULT_SEGMENT_SEPARATOR.join(match)
+                if isinstance(match, list) else
+                match.string)
+
+    def _definition(self, index):
+        definitions = self._scheme.SEGMENT_DEFINITIONS
+        return (definitions[index] if definitions else
+                DEFAULT_SEGMENT_DEFINITION)
+
+    def _raw(self, index):
+        value = self._values[index]
+        if value is _UNSET:
+            match = self._match
+            definition = self._definition(index)
+            value = definition.validate_value(
+                match[index] if isinstance(match, list) else
+                match.group(index + 1))
+            self._values[index] = value
+            self._keys[index] = (value if value is not None else
+                                 definition.default)
+        return value
+
+    def _cooked(self, index):
+        key = self._keys[index]
+        if key is _UNSET:
+            self._raw(index)
+            key = self._keys[index]
+        return key
+
+    def _index(self, item):
+        if _is_string(item):
+            definitions = self._scheme.SEGMENT_DEFINITIONS
+            for index, definition in enumerate(definitions):
+                if definition.name == item:
+                    return index
+            raise KeyError(item)
+        return range(len(self))[item]
+
+    def get_raw_item(self, item=None):
+        """Return the raw segment value (or values if `item` is a slice).
+
+        This is the lazy equivalent of `Version.get_raw_item`.
+
+        """
+        if item is None:
+            item = slice(0, len(self))
+        if isinstance(item, slice):
+            return tuple(self._raw(i) for i in range(len(self))[item])
+        return self._raw(self._index(item))
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return tuple(self._cooked(i) for i in range(len(self))[item])
+        return self._cooked(self._index(item))
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __iter__(self):
+        return (self._raw(i) for i in range(len(self)))
+
+    def materialize(self):
+        """Return the fully validated `Version` for this version string.
+
+        The result is built only once; the segment values already validated
+        are reused.  It is the canonical instance if the scheme has an
+        `~Version.INTERN_POOL`.
+
+        """
+        if self._version is None:
+            values = [self._raw(i) for i in range(len(self))]
+            self._version = self._scheme._trusted(values)
+        return self._version
+
+    def _other_scheme(self, other):
+        """Return the materialized versions if `other` is of another scheme.
+
+        Such versions are compared like the `Version` instances are, with one
+        converted to the other's scheme.  `None` is returned otherwise.
+
+        """
+        if isinstance(other, LazyVersion):
+            if other._scheme is self._scheme:
+                return None
+            other = other.materialize()
+        elif type(other) is self._scheme:
+            return None
+        return self.materialize(), other
+
+    def _compare(self, other):
+        """Compare the cooked values like tuples, stopping at a difference.
+
+        `other` is a version (lazy or not) of the same scheme or a tuple of
+        cooked values.
+
+        """
+        keys, count, other_count = self._keys, len(self), len(other)
+        other_keys = other._keys if isinstance(other, LazyVersion) else None
+        for i in range(min(count, other_count)):
+            value = keys[i]
+            if value is _UNSET:
+                value = self._cooked(i)
+            if other_keys is None:
+                other_value = other[i]
+            else:
+                other_value = other_keys[i]
+                if other_value is _UNSET:
+                    other_value = other._cooked(i)
+            if value != other_value:
+                return -1 if value < other_value else 1
+        return (count > other_count) - (count < other_count)
+
+    def __eq__(self, other):
+        if isinstance(other, (LazyVersion, Version)):
+            pair = self._other_scheme(other)
+            if pair is not None:
+                return pair[0] == pair[1]
+            return self._compare(other) == 0
+        return self.materialize() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __lt__(self, other):
+        if isinstance(other, (LazyVersion, Version)):
+            pair = self._other_scheme(other)
+            if pair is not None:
+                return pair[0] < pair[1]
+            return self._compare(other) < 0
+        return self.materialize() < other
+
+    def __le__(self, other):
+        if isinstance(other, (LazyVersion, Version)):
+            pair = self._other_scheme(other)
+            if pair is not None:
+                return pair[0] <= pair[1]
+            return self._compare(other) <= 0
+        return not other < self.materialize()
+
+    def __gt__(self, other):
+        if isinstance(other, (LazyVersion, Version)):
+            pair = self._other_scheme(other)
+            if pair is not None:
+                return pair[0] > pair[1]
+            return self._compare(other) > 0
+        return other < self.materialize()
+
+    def __ge__(self, other):
+        if isinstance(other, (LazyVersion, Version)):
+            pair = self._other_scheme(other)
+            if pair is not None:
+                return pair[0] >= pair[1]
+            return self._compare(other) >= 0
+        return not self.materialize() < other
+
+    def __hash__(self):
+        return hash(self[:])
+
+
+__all__.append('FIELD_TYPES')
+FIELD_TYPES = {
+    'int': int,
+    'int_empty_zero': int_empty_zero,
+    'str': str,
+}
+"""The field types that can be named in a scheme specification."""
+
+
+def _field_from_spec(spec):
+    if isinstance(spec, SegmentField):
+        return spec
+    spec = dict(spec)
+    if 'type' in spec and _is_string(spec['type']):
+        try:
+            spec['type'] = FIELD_TYPES[spec['type']]
+        except KeyError:
+            raise ValueError(
+                "Unknown field type {!r}.".format(spec['type']))
+    return SegmentField(**spec)
+
+
+def _definition_from_spec(spec):
+    if isinstance(spec, SegmentDefinition):
+        return spec
+    spec = dict(spec)
+    if 'fields' in spec:
+        fields = spec['fields']
+        if isinstance(fields, Mapping):
+            fields = [fields]
+        spec['fields'] = tuple(_field_from_spec(x) for x in fields)
+    return SegmentDefinition(**spec)
+
+
+_scheme_cache = {}
+
+
+__all__.append('make_scheme')
+def make_scheme(name, segment_definitions, base=Version):
+    """Return a `Version` subclass with the given segment definitions.
+
+    `segment_definitions` is a sequence whose elements are `SegmentDefinition`
+    instances or mappings of their constructor arguments.  The 'fields' of such
+    a mapping may likewise be `SegmentField` instances or mappings, and a
+    field's 'type' may be given by its name in `FIELD_TYPES`.
+
+    The classes are cached, so the same class is returned for the same name,
+    base, and (equal) segment definitions instead of creating and validating
+    another class.
+
+    """
+    definitions = tuple(_definition_from_spec(x) for x in segment_definitions)
+    key = name, base, definitions
+    try:
+        return _scheme_cache[key]
+    except KeyError:
+        pass
+    result = type(base)(future.native_str(name), (base,),
+                        {'SEGMENT_DEFINITIONS': definitions})
+    return _scheme_cache.setdefault(key, result)
+
+
+__all__.append('scheme_from_spec')
+def scheme_from_spec(spec, base=Version):
+    """Return the `Version` subclass for a declarative specification.
+
+    `spec` is a mapping (or a JSON object string) with the class 'name' and its
+    'segments', which are passed to `make_scheme`.  For example:
+
+    >>> Calendar = scheme_from_spec('{"name": "Calendar", "segments": ['
+    ...     '{"name": "year", "fields": {"re_pattern": "[0-9]{4}"}},'
+    ...     '{"name": "month"}]}')
+    >>> print(Calendar('2014.07'))
+    2014.7
+
+    """
+    if _is_string(spec):
+        import json
+        spec = json.loads(spec)
+    return make_scheme(spec['name'], spec['segments'], base)
+
+
+__all__.append('InternPool')
+class InternPool(object):
+
+    """A pool of canonical `Version` instances.
+
+    :meth:`intern` returns the one instance in the pool that is the same
+    version (of the same class with the same raw segment values) as the given
+    version, so that equal versions referenced from many places share memory.
+    The values of multiple-field segments (`Segment` instances) are shared
+    the same way.
+
+    A pool is usually attached to a version scheme by setting its
+    `Version.INTERN_POOL` class attribute, after which constructing versions
+    of that scheme (and its subclasses) returns interned instances::
+
+        Pep440Version.INTERN_POOL = InternPool()
+
+    `Version` instances are tuples, which cannot be weakly referenced, so the
+    pool holds strong references to its versions until :meth:`clear` is
+    called (or the pool is discarded).
+
+    A pool may be used by multiple threads; they always get the same
+    canonical instances.
+
+    """
+
+    def __init__(self):
+        self._versions = {}
+        self._segments = {}
+
+    def __len__(self):
+        return len(self._versions)
+
+    def intern(self, version):
+        """Return the pooled instance equal to the version, adding it if new.
+
+        The raw segment values of the version must be hashable.
+
+        """
+        values = tuple.__getitem__(version, slice(None))
+        key = type(version), values
+        try:
+            return self._versions[key]
+        except KeyError:
+            pass
+        segments = self._segments
+        interned = tuple(segments.setdefault((type(x), x), x)
+                         if isinstance(x, tuple) else x for x in values)
+        if any(x is not y for x, y in zip(interned, values)):
+            version = tuple.__new__(type(version), interned)
+        return self._versions.setdefault(key, version)
+
+    def clear(self):
+        """Remove all of the versions and segment values from the pool."""
+        self._versions.clear()
+        self._segments.clear()
+
+
+_converters = {}
+_converter_cache = {}
+
+
+__all__.append('register_converter')
+def register_converter(source, target, converter=None):
+    """Register a function converting `source` versions to `target` versions.
+
+    The converter is also used for subclasses of `source` (the most derived
+    registered class wins) but only for exactly the `target` class.  It should
+    raise `ValueError` for versions that have no equivalent in `target`.
+
+    Registered converters are used by `convert` and by comparisons between
+    versions of the two schemes, which otherwise cannot be ordered (unless
+    one scheme is derived from the other, when their segment values are just
+    compared positionally).  The converter may be used as a decorator when only
+    the first two arguments are given.
+
+    """
+    def register(converter):
+        global _converters, _converter_cache
+        with _cache_lock:
+            converters = dict(_converters)
+            converters[source, target] = converter
+            _converters = converters
+            _converter_cache = {}
+        return converter
+    return register if converter is None else register(converter)
+
+
+_pending_converters = {}  # module name -> [(class name, target, converter)]
+
+
+def _register_converter_on_import(module, name, target, converter):
+    """Register a converter from the class `name` of the module once imported.
+
+    This keeps a scheme module from importing another scheme module just to
+    register a converter from its versions, which cannot be used before that
+    module is imported anyway.
+
+    """
+    with _cache_lock:
+        _pending_converters.setdefault(module, []).append(
+            (name, target, converter))
+
+
+def _register_pending_converters():
+    """Register the pending converters of the modules imported so far."""
+    for module in [x for x in _pending_converters if x in sys.modules]:
+        with _cache_lock:
+            pending = _pending_converters.pop(module, ())
+        for name, target, converter in pending:
+            register_converter(getattr(sys.modules[module], name), target,
+                               converter)
+
+
+def _find_converter(source, target):
+    # The cache is read before the converters, so a result computed from
+    # converters older than the cache is never stored in it.
+    cache = _converter_cache
+    key = source, target
+    try:
+        return cache[key]
+    except KeyError:
+        pass
+    if _pending_converters:
+        _register_pending_converters()
+    converters = _converters
+    result = None
+    for base in source.__mro__:
+        result = converters.get((base, target))
+        if result is not None:
+            break
+    return cache.setdefault(key, result)
+
+
+def _convert_pair(version1, version2):
+    """Return the versions of different schemes in the same scheme if able.
+
+    The second version is preferably converted to the scheme of the first,
+    and otherwise the first to the scheme of the second.  If neither has a
+    converter to the other's scheme that succeeds, the versions are returned
+    unchanged if one scheme is derived from the other or they have the same
+    segment definitions, and `None` is returned otherwise, since the segment
+    values of unrelated schemes cannot be compared positionally.
+
+    """
+    for source, target in ((version2, version1), (version1, version2)):
+        converter = _find_converter(type(source), type(target))
+        if converter is not None:
+            try:
+                converted = converter(source)
+            except (TypeError, ValueError):
+                continue
+            return ((version1, converted) if source is version2 else
+                    (converted, version2))
+    scheme1, scheme2 = type(version1), type(version2)
+    if (issubclass(scheme1, scheme2) or issubclass(scheme2, scheme1) or
+            scheme1.SEGMENT_DEFINITIONS == scheme2.SEGMENT_DEFINITIONS):
+        return version1, version2
+    return None
+
+
+__all__.append('convert')
+def convert(version, scheme):
+    """Return the version converted to the given scheme.
+
+    The version is returned as is if it is already of the scheme.  Otherwise
+    the converter registered with `register_converter` is used, and
+    `TypeError` is raised if there is none.
+
+    """
+    if type(version) is scheme:
+        return version
+    converter = _find_converter(type(version), scheme)
+    if converter is None:
+        raise TypeError(
+            "There is no converter from {!r} to {!r}."
+            .format(type(version), scheme))
+    return converter(version)
+
+
+def _ordered_by_keys(scheme):
+    """Return whether the versions of the scheme are ordered by their keys.
+
+    The keys are the cooked segment values, unless the scheme overrides the
+    comparison of its versions.
+
+    """
+    return _function(scheme.__lt__) is _function(Version.__lt__)
+
+
+class _OrderKey(object):
+
+    """The sort key of a version of a scheme that overrides its comparison.
+
+    The keys are ordered by comparing the versions, but they are equal (and
+    hashed) by the cooked segment values, just like the keys of the versions
+    of other schemes.
+
+    """
+
+    __slots__ = ('cooked', 'version')
+
+    def __init__(self, version):
+        self.cooked = version[:]
+        self.version = version
+
+    def __eq__(self, other):
+        return isinstance(other, _OrderKey) and self.cooked == other.cooked
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __lt__(self, other):
+        return self.version < other.version
+
+    def __hash__(self):
+        return hash(self.cooked)
+
+
+def _cooked_keys(scheme, versions):
+    """Return a list of the cooked segment values of the versions."""
+    definitions = scheme.SEGMENT_DEFINITIONS
+    if not definitions:
+        return [tuple(x) for x in versions]  # no defaults to apply
+    defaults = tuple(x.default for x in definitions)
+    if all(x is None for x in defaults):
+        return [tuple(x) for x in versions]
+    return [tuple(d if v is None else v for v, d in zip(x, defaults))
+            for x in versions]
+
+
+def _packed_keys(keys):
+    """Return the keys packed into integers in the same order, if possible.
+
+    This is possible if all of the keys have the same number of values, and
+    all of the values are non-negative integers.  Each column of values is
+    then given just enough bits for its maximum value.
+
+    """
+    if len(set(len(x) for x in keys)) != 1:
+        return None
+    result = [0] * len(keys)
+    for column in zip(*keys):
+        try:
+            low, high = min(column), max(column)
+        except TypeError:
+            return None
+        if not (isinstance(low, int) and isinstance(high, int) and
+                low >= 0):
+            return None
+        width = high.bit_length()
+        result = [(x << width) | y for x, y in zip(result, column)]
+    return result
+
+
+__all__.append('sort_versions')
+def sort_versions(versions, reverse=False):
+    """Return a new list of the versions in order.
+
+    The result is the same as ``sorted(versions, reverse=reverse)``, but the
+    versions are not compared with each other.  When they are all of the same
+    scheme, each version's cooked segment values are computed once as the
+    sort key, and when those are all non-negative integers (as in the default
+    `Version` scheme with versions of the same length, `PgVersion`, and
+    `XorgVersion`), they are packed into a single integer, so that the sort
+    compares only integers.  Otherwise (including when the scheme overrides
+    the comparison of its versions) the versions are just sorted.
+
+    """
+    versions = list(versions)
+    if not versions:
+        return versions
+    scheme = type(versions[0])
+    if (not issubclass(scheme, Version) or not _ordered_by_keys(scheme) or
+            any(type(x) is not scheme for x in versions)):
+        return sorted(versions, reverse=reverse)
+    keys = _cooked_keys(scheme, versions)
+    packed = _packed_keys(keys)
+    if packed is not None:
+        keys = packed
+    order = sorted(range(len(versions)), key=keys.__getitem__,
+                   reverse=reverse)
+    return [versions[x] for x in order]
+
+
+__all__.append('latest')
+def latest(iterable, n=1, where=None, scheme=None):
+    """Return a list of the `n` highest versions of the iterable in order.
+
+    The items may be version strings, which are parsed as versions of
+    `scheme`, or versions, which are converted to `scheme` (see `convert`).
+    If no `scheme` is given, it is the type of the first item (or `Version` if
+    that is a string).  If `where` is given, only the versions for which it
+    returns a true value are considered.  The result is the same as
+    ``sorted(versions, reverse=True)[:n]`` of those versions (so the first of
+    equal versions wins, and the highest version is first), but only `n`
+    versions are kept at a time.
+
+    Unless the scheme overrides the comparison of its versions, each string
+    is first matched as a `LazyVersion` and compared with the lowest of the
+    versions kept so far, which usually only validates its leading segments,
+    and it is only fully parsed (and given to `where`) if it is higher.
+    Invalid values in the trailing segments of the strings that are skipped
+    are therefore not detected.
+
+    """
+    if n <= 0:
+        return []
+    heap = []  # (key, -index, version), the lowest first
+    by_keys = scheme is None or _ordered_by_keys(scheme)
+    for index, item in enumerate(iterable):
+        if scheme is None:
+            if _is_string(item):
+                scheme = Version
+            elif isinstance(item, Version):
+                scheme = type(item)
+            else:
+                raise TypeError(
+                    "{!r} is not a version.".format(item))
+            by_keys = _ordered_by_keys(scheme)
+        full = len(heap) >= n
+        if _is_string(item):
+            if by_keys:
+                lazy = scheme.lazy(item)
+                if full and lazy._compare(heap[0][0]) <= 0:
+                    continue
+                version = lazy.materialize()
+            else:
+                version = scheme(item)
+        else:
+            version = convert(item, scheme)
+        key = version[:] if by_keys else _OrderKey(version)
+        if full and not heap[0][0] < key:
+            continue
+        if where is not None and not where(version):
+            continue
+        if full:
+            heapq.heapreplace(heap, (key, -index, version))
+        else:
+            heapq.heappush(heap, (key, -index, version))
+    heap.sort(reverse=True)
+    return [x[2] for x in heap]
+
+
+__all__.append('RENDER_BUFFER_SIZE')
+RENDER_BUFFER_SIZE = 1 << 16
+"""The approximate number of characters buffered by `render_many`."""
+
+
+__all__.append('render_many')
+def render_many(versions, out, sep='\n', buffer_size=RENDER_BUFFER_SIZE,
+                **render_options):
+    """Write the rendered versions to the text stream `out`.
+
+    This is equivalent to ``out.write(sep.join(str(x) for x in versions))`` but
+    the output is written in chunks of about `buffer_size` characters, so any
+    number of versions (which may come from an iterator) can be written in
+    constant memory.
+
+    Any `render_options` are passed to each version's
+    :meth:`~Version.render` method; without them, `str` is used.
+
+    Return the number of versions written.
+
+    """
+    render = ((lambda x: x.render(**render_options)) if render_options else
+              str)
+    chunk = []
+    size = count = 0
+    for version in versions:
+        if count:
+            chunk.append(sep)
+        string = render(version)
+        chunk.append(string)
+        count += 1
+        size += len(string) + len(sep)
+        if size >= buffer_size:
+            out.write("".join(chunk))
+            chunk = []
+            size = 0
+    if chunk:
+        out.write("".join(chunk))
+    return count
+
+
+_SUBMODULES = frozenset(['aio', 'corpus', 'extsort', 'pep440', 'postgresql',
+                         'python', 'registry', 'shared', 'stats',
+                         'versionset', 'xorg'])
+
+
+def __getattr__(name):
+    """Import a submodule on its first access as an attribute.
+
+    This makes e.g. ``verschemes.pep440`` available after just ``import
+    verschemes`` (in Python 3.7+) without importing every version scheme up
+    front.
+
+    """
+    if name in _SUBMODULES:
+        return importlib.import_module('verschemes.' + name)
+    raise AttributeError(
+        "module {!r} has no attribute {!r}".format(__name__, name))
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""verschemes command line interface
+
+Run ``python -m verschemes --help`` for usage.  The version schemes are
+identified by their names in the `~verschemes.registry.DEFAULT_REGISTRY`.
+
+"""
+
+# Support Python 2 & 3.
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from verschemes.future import *
+
+import argparse
+import io
+import sys
+
+from verschemes import extsort
+from verschemes.registry import DEFAULT_REGISTRY
+
+
+def _sort(args):
+    scheme = DEFAULT_REGISTRY[args.scheme]
+    options = dict(scheme=scheme, unique=args.unique,
+                   chunk_size=args.chunk_size, processes=args.processes,
+                   encoding=args.encoding, tmpdir=args.tmpdir)
+    if args.input != '-' and args.output != '-':
+        extsort.sort_file(args.input, args.output, **options)
+        return 0
+    lines = (sys.stdin if args.input == '-' else
+             io.open(args.input, encoding=args.encoding))
+    out = (sys.stdout if args.output == '-' else
+           io.open(args.output, 'w', encoding=args.encoding))
+    try:
+        extsort.sort_lines(lines, out, **options)
+    finally:
+        for stream in (lines, out):
+            if stream not in (sys.stdin, sys.stdout):
+                stream.close()
+    return 0
+
+
+def main(argv=None):
+    """Run the command line interface with the arguments."""
+    parser = argparse.ArgumentParser(prog='python -m verschemes')
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.required = True
+    sort = subparsers.add_parser(
+        'sort', help="sort a file of versions, one per line",
+        description="Sort (and optionally deduplicate) a file of versions in "
+                    "bounded memory, writing them normalized.")
+    sort.add_argument('input', nargs='?', default='-',
+                      help="the input file (default: standard input)")
+    sort.add_argument('-o', '--output', default='-',
+                      help="the output file, which may be the input file "
+                           "(default: standard output)")
+    sort.add_argument('-s', '--scheme', default='default',
+                      choices=DEFAULT_REGISTRY.names(),
+                      help="the version scheme (default: %(default)s)")
+    sort.add_argument('-u', '--unique', action='store_true',
+                      help="leave out versions equal to the previous one")
+    sort.add_argument('--chunk-size', type=int,
+                      default=extsort.DEFAULT_CHUNK_SIZE,
+                      help="the number of lines sorted in memory at a time "
+                           "(default: %(default)s)")
+    sort.add_argument('-j', '--processes', type=int, default=None,
+                      help="the number of worker processes")
+    sort.add_argument('--encoding', default='utf-8')
+    sort.add_argument('--tmpdir', default=None,
+                      help="the directory for temporary files")
+    sort.set_defaults(function=_sort)
+    args = parser.parse_args(argv)
+    return args.function(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -21,10 +21,10 @@ class int_empty_zero(int):
     """
 
     def __new__(cls, *args, **kwargs):
-        if args:
-            if args[0] == '':
-                args = list(args)
-                args[0] = 0
-        elif 'x' in kwargs and kwargs['x'] == '':
-            kwargs['x'] = 0
+        if not args and 'x' in kwargs:
+            # `int` does not take `x` as a keyword argument since Python 3.7.
+            args = (kwargs.pop('x'),)
+        if args and args[0] == '':
+            args = list(args)
+            args[0] = 0
         return super().__new__(cls, *args, **kwargs)
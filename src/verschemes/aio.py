@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""verschemes.aio module
+
+The asyncio verschemes module parses large numbers of version strings in
+`asyncio` applications without blocking the event loop for long.
+
+The strings are parsed in chunks.  Chunks of at least `DEFAULT_OFFLOAD_SIZE`
+strings are parsed by an executor (the event loop's default thread pool unless
+one is given, which may also be a `concurrent.futures.ProcessPoolExecutor`),
+and smaller ones are parsed in the event loop, which is given control between
+chunks.  For example:
+
+>>> import asyncio
+>>> from verschemes.aio import aparse_batch
+>>> from verschemes.pep440 import Pep440Version
+>>> versions = asyncio.run(aparse_batch(['1.0', '1.1b2'], Pep440Version))
+>>> [str(x) for x in versions]
+['1.0', '1.1b2']
+
+The scheme must be importable by the worker processes when a process executor
+is used.  This module requires Python 3.7 or later.
+
+"""
+
+# Support Python 2 & 3.
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from verschemes.future import *
+
+import asyncio
+import concurrent.futures
+
+from verschemes import Version, _fields_metadata, _ignore_errors
+
+
+__all__ = []
+
+__all__.append('DEFAULT_CHUNK_SIZE')
+DEFAULT_CHUNK_SIZE = 1000
+"""The default number of strings parsed together."""
+
+__all__.append('DEFAULT_OFFLOAD_SIZE')
+DEFAULT_OFFLOAD_SIZE = 200
+"""The default size of the smallest chunk that is parsed by the executor.
+
+Smaller chunks are parsed in the event loop, which bounds how long it is
+blocked at a time.
+
+"""
+
+
+def _parse_chunk(scheme, strings, ignore, raw):
+    """Return the versions of the strings.
+
+    If `raw` is true, the raw segment values of each version are returned
+    instead (with the `Segment` values as plain tuples), which unlike versions
+    can be pickled.
+
+    """
+    result = []
+    for string in strings:
+        try:
+            version = scheme(string)
+        except (TypeError, ValueError):
+            if not ignore:
+                raise
+            version = None
+        if raw and version is not None:
+            version = tuple(tuple(x) if isinstance(x, tuple) else x
+                            for x in tuple.__iter__(version))
+        result.append(version)
+    return result
+
+
+def _from_raw(scheme, values):
+    """Return the version of the raw values returned by `_parse_chunk`."""
+    definitions = scheme.SEGMENT_DEFINITIONS
+    if definitions:
+        values = [_fields_metadata(d.fields)[1](*v)
+                  if v is not None and len(d.fields) > 1 else v
+                  for d, v in zip(definitions, values)]
+    version = tuple.__new__(scheme, values)  # already validated
+    pool = scheme.INTERN_POOL
+    return version if pool is None else pool.intern(version)
+
+
+def _submit(scheme, strings, executor, ignore):
+    """Return the future of the strings' `_parse_chunk` by the executor."""
+    raw = isinstance(executor, concurrent.futures.ProcessPoolExecutor)
+    future = asyncio.get_running_loop().run_in_executor(
+        executor, _parse_chunk, scheme, strings, ignore, raw)
+    return future, raw
+
+
+async def _parse(scheme, strings, executor, offload_size, ignore,
+                 submitted=None):
+    """Return the versions of the strings, yielding control afterward.
+
+    The chunk is parsed by the executor (if it was not already `submitted`)
+    unless it has fewer than `offload_size` strings.
+
+    """
+    if submitted is None and len(strings) < offload_size:
+        result = _parse_chunk(scheme, strings, ignore, False)
+        await asyncio.sleep(0)
+        return result
+    future, raw = submitted or _submit(scheme, strings, executor, ignore)
+    result = await future
+    if raw:
+        result = [None if x is None else _from_raw(scheme, x)
+                  for x in result]
+    return result
+
+
+def _discard(submitted):
+    """Cancel the submitted futures, or retrieve the results of done ones.
+
+    This keeps a failed or cancelled parse from leaving futures whose
+    exceptions are never retrieved.
+
+    """
+    for future, _ in filter(None, submitted):
+        if not future.cancel() and not future.cancelled():
+            future.exception()
+
+
+async def _chunks(strings, size):
+    """Yield lists of up to `size` items of the (async) iterable."""
+    chunk = []
+    if hasattr(strings, '__aiter__'):
+        async for string in strings:
+            chunk.append(string)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    else:
+        for string in strings:
+            chunk.append(string)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+__all__.append('aparse_many')
+async def aparse_many(strings, scheme=Version, executor=None,
+                      chunk_size=DEFAULT_CHUNK_SIZE,
+                      offload_size=DEFAULT_OFFLOAD_SIZE, errors='strict'):
+    """Yield the versions of the scheme parsed from the strings.
+
+    `strings` may be an iterable or an asynchronous iterable.  The strings are
+    collected into chunks of `chunk_size` strings, one chunk at a time, so a
+    smaller chunk size lowers the latency of slow streams.
+
+    Invalid strings raise `ValueError` unless `errors` is 'ignore', in which
+    case `None` is yielded for them.
+
+    """
+    ignore = _ignore_errors(errors)
+    async for chunk in _chunks(strings, chunk_size):
+        for version in await _parse(scheme, chunk, executor, offload_size,
+                                    ignore):
+            yield version
+
+
+__all__.append('aparse_batch')
+async def aparse_batch(strings, scheme=Version, executor=None,
+                       chunk_size=DEFAULT_CHUNK_SIZE,
+                       offload_size=DEFAULT_OFFLOAD_SIZE, errors='strict'):
+    """Return a list of the versions of the scheme parsed from the strings.
+
+    The large chunks of the strings are all submitted to the executor at
+    once, so a process executor parses them in parallel.
+
+    Invalid strings raise `ValueError` unless `errors` is 'ignore', in which
+    case the list has `None` for them.
+
+    """
+    ignore = _ignore_errors(errors)
+    strings = list(strings)
+    chunks = [strings[i:i + chunk_size]
+              for i in range(0, len(strings), chunk_size)]
+    submitted = [_submit(scheme, x, executor, ignore)
+                 if len(x) >= offload_size else None for x in chunks]
+    result = []
+    try:
+        for chunk, future in zip(chunks, submitted):
+            result.extend(await _parse(scheme, chunk, executor, offload_size,
+                                       ignore, future))
+    except BaseException:
+        _discard(submitted)
+        raise
+    return result
@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+"""verschemes.corpus module
+
+The corpus verschemes module generates deterministic streams of synthetic
+version strings for benchmarking and fuzzing.
+
+The strings are derived from a version scheme's
+`~verschemes.Version.SEGMENT_DEFINITIONS`: each optional segment is included
+or left out at random, separators are sampled from their
+`~verschemes.SegmentDefinition.separator_re_pattern` (so alternative input
+spellings such as '-dev' for '.dev' appear), and field values are sampled from
+their `~verschemes.SegmentField.re_pattern`, with integer fields mostly given
+long-tailed numbers instead.  Every string is checked by constructing a version
+from it, and rejected strings are regenerated, so the valid strings are always
+accepted by the scheme.  A share of deliberately invalid strings can be mixed
+in.
+
+Segment values can be overridden with functions of the random number
+generator; some overrides for the included schemes (e.g., X.org snapshot
+numbers around 900) are built in.
+
+"""
+
+# Support Python 2 & 3.
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from verschemes.future import *
+
+import random
+import re
+import string
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover
+    import sre_parse
+
+from verschemes import DEFAULT_SEGMENT_DEFINITION, Version
+
+
+__all__ = []
+
+__all__.append('MAX_ATTEMPTS')
+MAX_ATTEMPTS = 1000
+"""The number of candidates generated for a string before giving up."""
+
+_MAX_REPEAT = 3  # extra repetitions of unbounded repeats
+_MAX_NUMBER = 10 ** 6
+_ANY = string.ascii_letters + string.digits + string.punctuation
+_CATEGORIES = {
+    sre_parse.CATEGORY_DIGIT: string.digits,
+    sre_parse.CATEGORY_NOT_DIGIT: string.ascii_letters + '.-_+!',
+    sre_parse.CATEGORY_WORD: string.ascii_letters + string.digits + '_',
+    sre_parse.CATEGORY_NOT_WORD: '.-+!~',
+    sre_parse.CATEGORY_SPACE: ' ',
+    sre_parse.CATEGORY_NOT_SPACE: string.ascii_letters + string.digits,
+}
+
+
+def _sample_in(items, r):
+    """Return a character matching the items of an IN (character set)."""
+    choices = []
+    negate = False
+    for op, av in items:
+        if op is sre_parse.NEGATE:
+            negate = True
+        elif op is sre_parse.LITERAL:
+            choices.append(chr(av))
+        elif op is sre_parse.RANGE:
+            choices.extend(chr(x) for x in range(av[0], av[1] + 1))
+        elif op is sre_parse.CATEGORY:
+            choices.extend(_CATEGORIES.get(av, ''))
+    if negate:
+        choices = [x for x in _ANY if x not in choices]
+    return r.choice(choices) if choices else ''
+
+
+def _sample(parsed, r, groups):
+    """Return a string sampled from the parsed regular expression."""
+    result = []
+    for op, av in parsed:
+        if op is sre_parse.LITERAL:
+            result.append(chr(av))
+        elif op is sre_parse.NOT_LITERAL:
+            result.append(r.choice([x for x in _ANY if ord(x) != av]))
+        elif op is sre_parse.ANY:
+            result.append(r.choice(_ANY))
+        elif op is sre_parse.IN:
+            result.append(_sample_in(av, r))
+        elif op is sre_parse.BRANCH:
+            result.append(_sample(r.choice(av[1]), r, groups))
+        elif op is sre_parse.SUBPATTERN:
+            value = _sample(av[-1], r, groups)
+            if av[0] is not None:
+                groups[av[0]] = value
+            result.append(value)
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+            low, high, item = av
+            if high == sre_parse.MAXREPEAT:
+                high = low + _MAX_REPEAT
+            result.extend(_sample(item, r, groups)
+                          for _ in range(r.randint(low, high)))
+        elif op is sre_parse.GROUPREF:
+            result.append(groups.get(av, ''))
+        elif op is sre_parse.CATEGORY:
+            result.append(r.choice(_CATEGORIES.get(av, 'x')))
+        # Anchors and lookarounds (AT, ASSERT, ASSERT_NOT) match no text;
+        # candidates that violate them are rejected later.
+    return ''.join(result)
+
+
+_parse_cache = {}
+
+
+__all__.append('sample_pattern')
+def sample_pattern(pattern, r):
+    """Return a random string that the regular expression pattern may match.
+
+    Lookaround assertions are ignored, so the result is not guaranteed to
+    match.  Unbounded repeats are repeated at most a few extra times.
+
+    """
+    try:
+        parsed = _parse_cache[pattern]
+    except KeyError:
+        parsed = _parse_cache.setdefault(pattern, sre_parse.parse(pattern))
+    return _sample(parsed, r, {})
+
+
+__all__.append('long_tailed')
+def long_tailed(r, alpha=1.2, low=0):
+    """Return a random long-tailed (Pareto) integer of at least `low`.
+
+    Small numbers are the most common, but large ones keep occurring, like
+    the release numbers of real projects.
+
+    """
+    return min(int(r.paretovariate(alpha)) - 1, _MAX_NUMBER) + low
+
+
+def _xorg_snapshot(r):
+    x = r.random()
+    return (None if x < 0.5 else
+            str(r.randint(1, 899)) if x < 0.7 else
+            str(r.randint(900, 905)))
+
+
+def _python_suffix(r):
+    x = r.random()
+    return (None if x < 0.7 else
+            '+' if x < 0.75 else
+            r.choice('abc') + str(r.randint(1, 4)))
+
+
+def _pep440_pre_release(r):
+    if r.random() < 0.7:
+        return None
+    level = r.choice(['a', 'a', 'b', 'b', 'rc', 'rc', 'c', 'alpha', 'beta',
+                      'RC', 'A', 'B'])
+    return level + r.choice(['', str(long_tailed(r, 1.5))])
+
+
+__all__.append('DEFAULT_OVERRIDES')
+DEFAULT_OVERRIDES = {
+    'verschemes.xorg.XorgVersion': {
+        'patch': lambda r: '99' if r.random() < 0.4 else str(long_tailed(r)),
+        'snapshot': _xorg_snapshot,
+    },
+    'verschemes.postgresql.PgMajorVersion': {
+        'major1': lambda r: str(r.randint(6, 17)),
+        'major2': lambda r: str(r.randint(0, 6)),
+    },
+    'verschemes.postgresql.PgVersion': {
+        'minor': lambda r: (None if r.random() < 0.1 else
+                            str(long_tailed(r, 0.8))),
+    },
+    'verschemes.python.PythonMajorVersion': {
+        'major': lambda r: str(r.choice([2, 3, 3, 3])),
+    },
+    'verschemes.python.PythonVersion': {
+        'suffix': _python_suffix,
+    },
+    'verschemes.pep440.Pep440Version': {
+        'epoch': lambda r: str(r.randint(1, 2)) if r.random() < 0.05 else None,
+        'pre_release': _pep440_pre_release,
+    },
+}
+"""Built-in segment overrides of the included schemes by class path.
+
+These make the generated versions look more like real ones.  They apply to
+subclasses too, and the `overrides` argument of `generate` takes precedence
+over them.
+
+"""
+
+
+def _default_overrides(scheme):
+    result = {}
+    for cls in reversed(scheme.__mro__):
+        path = '{}.{}'.format(cls.__module__, cls.__name__)
+        result.update(DEFAULT_OVERRIDES.get(path, {}))
+    return result
+
+
+def _field_string(field, r, patterns):
+    """Return a random string for the field."""
+    if issubclass(field.type, int) and r.random() < 0.9:
+        value = str(long_tailed(r))
+        if r.random() < 0.02:
+            value = '0' + value  # an occasional unnormalized leading zero
+        regex = patterns.get(field.re_pattern)
+        if regex is None:
+            regex = patterns[field.re_pattern] = re.compile(
+                '(?:' + field.re_pattern + r')\Z')
+        if regex.match(value):
+            return value
+    return sample_pattern(field.re_pattern, r)
+
+
+def _candidate(scheme, r, overrides, optional_ratio, patterns):
+    """Return a random string built from the scheme's segments."""
+    definitions = scheme.SEGMENT_DEFINITIONS
+    if not definitions:
+        definitions = (DEFAULT_SEGMENT_DEFINITION,) * min(
+            long_tailed(r, 1.5, 1), 6)
+    parts = []
+    for i, definition in enumerate(definitions):
+        override = overrides.get(definition.name, overrides.get(i))
+        if override is not None:
+            value = override(r)
+        elif definition.optional and r.random() >= optional_ratio:
+            value = None
+        else:
+            value = ''.join(_field_string(x, r, patterns)
+                            for x in definition.fields)
+        if value is None:
+            continue
+        if parts:
+            parts.append(sample_pattern(definition.separator_re_pattern, r)
+                         if definition.separator_re_pattern and
+                         r.random() < 0.5 else
+                         definition.separator)
+        parts.append(value)
+    return ''.join(parts)
+
+
+def _accepts(scheme, string):
+    try:
+        scheme(string)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+_JUNK = '.-_+!~ xX'
+
+
+def _mutate(string, r):
+    """Return the string with a random corruption."""
+    position = r.randint(0, len(string))
+    x = r.random()
+    if x < 0.4 or not string:
+        return string[:position] + r.choice(_JUNK) + string[position:]
+    if x < 0.7:
+        return string[:position] + string[position + 1:]
+    if x < 0.9:
+        return string + r.choice(['.', '-', 'x', '..1', '-beta-'])
+    return r.choice(['', 'v', 'version ']) + string + r.choice(['', ' ', '?'])
+
+
+__all__.append('generate')
+def generate(scheme=Version, count=None, seed=None, invalid_ratio=0.0,
+             optional_ratio=0.5, overrides=None):
+    """Yield random version strings of the scheme.
+
+    The same `seed` always gives the same strings.  `count` strings are
+    generated (or endlessly if it is `None`), one at a time, so any number of
+    them can be streamed in constant memory.
+
+    Each string is invalid (rejected by the scheme) with a probability of
+    `invalid_ratio`; the others are all valid.  Each optional segment without
+    an override is included with a probability of `optional_ratio`.
+
+    `overrides` maps segment names (or indices) to functions that take the
+    `random.Random` instance and return the segment's string (without the
+    separator) or `None` to leave the segment out.  They take precedence over
+    the `DEFAULT_OVERRIDES`.
+
+    `ValueError` is raised if no valid (or invalid) string can be generated in
+    `MAX_ATTEMPTS` attempts.
+
+    """
+    r = random.Random(seed)
+    segment_overrides = _default_overrides(scheme)
+    segment_overrides.update(overrides or {})
+    patterns = {}
+    generated = 0
+    while count is None or generated < count:
+        invalid = r.random() < invalid_ratio
+        for _ in range(MAX_ATTEMPTS):
+            candidate = _candidate(scheme, r, segment_overrides,
+                                   optional_ratio, patterns)
+            if invalid:
+                candidate = _mutate(candidate, r)
+            if _accepts(scheme, candidate) is not invalid:
+                break
+        else:
+            raise ValueError(
+                "No {} string of {!r} could be generated in {} attempts."
+                .format('invalid' if invalid else 'valid', scheme,
+                        MAX_ATTEMPTS))
+        yield candidate
+        generated += 1
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""verschemes.extsort module
+
+The external sort verschemes module sorts (and optionally deduplicates) files
+of version strings that are too large to sort in memory.
+
+The input is read in chunks of lines, and each chunk is parsed into versions
+of the given scheme, sorted with `~verschemes.sort_versions`, and written to a
+temporary file as a sorted run.  Each line of a run holds the version's sort
+key (its cooked segment values) and its normalized string in JSON, so the runs
+can be merged with `heapq.merge` without parsing the versions again (unless
+the scheme overrides the comparison of its versions).  Memory
+use is bounded by the chunk size (times the number of worker processes).
+
+This is also available from the command line as ``python -m verschemes sort``.
+
+"""
+
+# Support Python 2 & 3.
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from verschemes.future import *
+
+import collections
+import heapq
+import io
+import json
+import os
+import shutil
+import tempfile
+
+from verschemes import (Version, _cooked_keys, _OrderKey, _ordered_by_keys,
+                        sort_versions)
+
+
+__all__ = []
+
+
+_replace = getattr(os, 'replace', os.rename)  # Python 2 has no os.replace
+
+
+__all__.append('DEFAULT_CHUNK_SIZE')
+DEFAULT_CHUNK_SIZE = 100000
+"""The default number of lines sorted in memory at a time."""
+
+
+def _chunks(lines, size):
+    """Yield lists of up to `size` of the nonblank stripped lines."""
+    chunk = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        chunk.append(line)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _write_run(scheme, strings, unique, path, encoding):
+    """Write the sorted versions of the strings as a run file at `path`."""
+    versions = sort_versions(scheme(x) for x in strings)
+    keys = _cooked_keys(scheme, versions)
+    with io.open(path, 'w', encoding=encoding) as run:
+        previous = None
+        for key, version in zip(keys, versions):
+            if unique and key == previous:
+                continue
+            previous = key
+            run.write(json.dumps([key, str(version)]) + '\n')
+    return path
+
+
+def _sort_run(args):
+    """Call `_write_run` with the tuple of arguments (in a worker process)."""
+    return _write_run(*args)
+
+
+def _read_run(path, index, encoding, scheme):
+    """Yield the ``(key, index, position, string)`` entries of a run file.
+
+    The keys are the stored cooked values unless the scheme overrides the
+    comparison of its versions.
+
+    """
+    by_keys = _ordered_by_keys(scheme)
+    with io.open(path, encoding=encoding) as run:
+        for position, line in enumerate(run):
+            key, string = json.loads(line)
+            if not by_keys:
+                key = _OrderKey(scheme(string))
+            yield key, index, position, string
+
+
+__all__.append('sort_lines')
+def sort_lines(lines, out, scheme=Version, unique=False,
+               chunk_size=DEFAULT_CHUNK_SIZE, processes=None,
+               encoding='utf-8', tmpdir=None):
+    """Write the sorted versions of the lines to the text stream `out`.
+
+    `lines` is an iterable of version strings (e.g., a text file); surrounding
+    whitespace is stripped and blank lines are skipped.  Each version is
+    written normalized (as rendered by `str`) on its own line, in the same
+    order as `~verschemes.sort_versions` would give.  Versions that are equal
+    (ignoring the rendering) to the version before them are left out if
+    `unique` is true.
+
+    At most `chunk_size` lines are sorted in memory at a time.  If
+    `processes` is greater than one, the chunks are parsed and sorted in a
+    pool of that many worker processes, and `scheme` must then be picklable
+    (i.e., defined at the top level of a module).  The temporary run files
+    are created in a new directory in `tmpdir` (the system default if `None`)
+    and removed afterwards.
+
+    Return the number of versions written.
+
+    """
+    directory = tempfile.mkdtemp(prefix='verschemes-', dir=tmpdir)
+    try:
+        paths = _sorted_runs(lines, scheme, unique, chunk_size, processes,
+                             encoding, directory)
+        merged = heapq.merge(*[_read_run(x, i, encoding, scheme)
+                               for i, x in enumerate(paths)])
+        count = 0
+        previous = None
+        for key, index, position, string in merged:
+            if unique and key == previous:
+                continue
+            previous = key
+            out.write(string + '\n')
+            count += 1
+        return count
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def _sorted_runs(lines, scheme, unique, chunk_size, processes, encoding,
+                 directory):
+    """Write the sorted runs of the lines, and return their paths in order."""
+    def tasks():
+        for i, chunk in enumerate(_chunks(lines, chunk_size)):
+            path = os.path.join(directory, 'run{}'.format(i))
+            yield scheme, chunk, unique, path, encoding
+    if not processes or processes <= 1:
+        return [_sort_run(x) for x in tasks()]
+    import multiprocessing
+    pool = multiprocessing.Pool(processes)
+    try:
+        # Submit at most two chunks per process ahead of the finished runs to
+        # keep the memory use bounded.
+        pending = collections.deque()
+        paths = []
+        for task in tasks():
+            if len(pending) >= 2 * processes:
+                paths.append(pending.popleft().get())
+            pending.append(pool.apply_async(_sort_run, (task,)))
+        paths.extend(x.get() for x in pending)
+        pool.close()
+        return paths
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+__all__.append('sort_file')
+def sort_file(input_path, output_path, scheme=Version, unique=False,
+              chunk_size=DEFAULT_CHUNK_SIZE, processes=None,
+              encoding='utf-8', tmpdir=None):
+    """Sort the version file at `input_path` into the file at `output_path`.
+
+    The paths may be the same.  See `sort_lines` for the other arguments.
+    Return the number of versions written.
+
+    """
+    directory = os.path.dirname(os.path.abspath(output_path))
+    handle, temporary = tempfile.mkstemp(prefix='.verschemes-',
+                                         dir=directory)
+    try:
+        with io.open(handle, 'w', encoding=encoding) as out:
+            with io.open(input_path, encoding=encoding) as lines:
+                count = sort_lines(lines, out, scheme, unique, chunk_size,
+                                   processes, encoding, tmpdir)
+        _replace(temporary, output_path)
+    except BaseException:
+        os.remove(temporary)
+        raise
+    return count
@@ -3,20 +3,27 @@
 
 This is equivalent to future.builtins with customizations.
 
+In Python 3, the `future` package is not imported at all; the builtins are
+used as they are, and `future` is a module of native stand-ins for the few
+`future.utils` names that verschemes uses.
+
 """
 
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 
-from future.builtins import *
-from future.builtins import __all__ as _all
-from future import utils as future
+import sys
 
 
-_all = set(_all)
+if sys.version_info[0] >= 3:
+    from verschemes.future import _native as future
+    _all = set()
+else:  # pragma: no cover
+    from future.builtins import *
+    from future.builtins import __all__ as _all
+    from future import utils as future
 
-if future.PY2:
-    _all |= set(['str', 'super', 'type'])
+    _all = set(_all) | set(['str', 'super', 'type'])
     from verschemes.future.newstr import newstr as str
     from verschemes.future.newsuper import newsuper as super
     from verschemes.future.newtype import newtype as type
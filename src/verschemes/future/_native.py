@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""Native stand-ins for the `future.utils` names used by verschemes.
+
+This is used instead of the `future` package in Python 3, where none of its
+compatibility layer is needed, so that importing verschemes stays cheap.
+
+"""
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+
+__all__ = ['PY2', 'PY3', 'native_str', 'python_2_unicode_compatible',
+           'with_metaclass']
+
+PY2 = False
+PY3 = True
+
+native_str = str
+
+
+def python_2_unicode_compatible(cls):
+    """Return the class unchanged; `__str__` already returns text."""
+    return cls
+
+
+def with_metaclass(meta, *bases):
+    """Create a base class with a metaclass.
+
+    This is the same as :func:`future.utils.with_metaclass`: the temporary
+    class is replaced by a class with the real bases as soon as it is
+    subclassed, so `meta` never sees the temporary class.
+
+    """
+    class metaclass(meta):
+        __call__ = type.__call__
+        __init__ = type.__init__
+
+        def __new__(cls, name, this_bases, d):
+            if this_bases is None:
+                return type.__new__(cls, name, (), d)
+            return meta(name, bases, d)
+    return metaclass(str('temporary_class'), None, {})
@@ -14,11 +14,39 @@ _builtin_super = super
 
 _SENTINEL = object()
 
+_owner_cache = {}
+
+
+def _find_owner(code, mro, type_or_obj):
+    """Return the class in `mro` that owns the method with the code object."""
+    for typ in mro:
+        #  Find the class that owns the currently-executing method.
+        for meth in typ.__dict__.values():
+            # *** CUSTOMIZATION ***
+            # We must not drill down into properties due to side effects.
+            if isinstance(meth, property):
+                continue
+            # *** END CUSTOMIZATION ***
+            # Drill down through any wrappers to the underlying func.
+            # This handles e.g. classmethod() and staticmethod().
+            try:
+                while not isinstance(meth,FunctionType):
+                    try:
+                        meth = meth.__func__
+                    except AttributeError:
+                        meth = meth.__get__(type_or_obj)
+            except (AttributeError, TypeError):
+                continue
+            if meth.func_code is code:
+                return typ   # Aha!  Found you.
+    raise RuntimeError('super() called outside a method')  # pragma: no cover
+
 
 def newsuper(typ=_SENTINEL, type_or_obj=_SENTINEL, framedepth=1):
     """Fix for :meth:`~future.builtins.newsuper.newsuper`.
 
-    See the '*** CUSTOMIZATION ***' block below.
+    See the '*** CUSTOMIZATION ***' block in `_find_owner`.  The owning class
+    found for each code object and MRO is memoized.
 
     """
     #  Infer the correct call if used without arguments.
@@ -41,35 +69,12 @@ def newsuper(typ=_SENTINEL, type_or_obj=_SENTINEL, framedepth=1):
             except AttributeError:  # pragma: no cover
                 raise RuntimeError('super() used with a non-newstyle class')
 
-        #   A ``for...else`` block?  Yes!  It's odd, but useful.
-        #   If unfamiliar with for...else, see:
-        #
-        #       http://psung.blogspot.com/2007/12/for-else-in-python.html
-        for typ in mro:
-            #  Find the class that owns the currently-executing method.
-            for meth in typ.__dict__.values():
-                # *** CUSTOMIZATION ***
-                # We must not drill down into properties due to side effects.
-                if isinstance(meth, property):
-                    continue
-                # *** END CUSTOMIZATION ***
-                # Drill down through any wrappers to the underlying func.
-                # This handles e.g. classmethod() and staticmethod().
-                try:
-                    while not isinstance(meth,FunctionType):
-                        try:
-                            meth = meth.__func__
-                        except AttributeError:
-                            meth = meth.__get__(type_or_obj)
-                except (AttributeError, TypeError):
-                    continue
-                if meth.func_code is f.f_code:
-                    break   # Aha!  Found you.
-            else:
-                continue    #  Not found! Move onto the next class in MRO.
-            break    #  Found! Break out of the search loop.
-        else:
-            raise RuntimeError('super() called outside a method')  # pragma: no cover
+        # The owning class only depends on the code object and the MRO, so
+        # it is only searched for once for each combination.
+        key = f.f_code, mro[0]
+        typ = _owner_cache.get(key)
+        if typ is None:
+            typ = _owner_cache[key] = _find_owner(f.f_code, mro, type_or_obj)
 
     #  Dispatch to builtin super().
     if type_or_obj is not _SENTINEL:
@@ -20,7 +20,8 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from verschemes.future import *
 
-from verschemes import SegmentDefinition, SegmentField, Version
+from verschemes import (SegmentDefinition, SegmentField, Version,
+                        _register_converter_on_import)
 from verschemes._types import int_empty_zero
 
 
@@ -213,3 +214,28 @@ class Pep440Version(Version):
              min_release_segments))
         return super().render(exclude_defaults, include_callbacks,
                               exclude_callbacks)
+
+
+def _from_python(version):
+    """Convert a Python version (of any depth) to a `Pep440Version`.
+
+    Unreleased ('+' suffix) versions have no PEP 440 equivalent.
+
+    """
+    from verschemes import python
+    values = [None] * len(SEGMENTS)
+    release = tuple.__getitem__(version, slice(0, python.SUFFIX))
+    values[RELEASE1:RELEASE1 + len(release)] = release
+    if len(version) > python.SUFFIX:
+        suffix = version[python.SUFFIX]
+        if suffix is not None:
+            if suffix.releaselevel == '+':
+                raise ValueError(
+                    "Unreleased version {!r} has no PEP 440 equivalent."
+                    .format(str(version)))
+            values[PRE_RELEASE] = suffix
+    return Pep440Version(*values)
+
+
+_register_converter_on_import('verschemes.python', 'PythonMajorVersion',
+                              Pep440Version, _from_python)
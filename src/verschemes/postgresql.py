@@ -12,7 +12,9 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from verschemes.future import *
 
-from verschemes import SegmentDefinition, Version
+import bisect
+
+from verschemes import SegmentDefinition, Version, register_converter
 
 
 __all__ = []
@@ -49,12 +51,12 @@ class PgMajorVersion(Version):
 
     @property
     def major_version(self):
-        """Return a new `PgMajorVersion` with the object's values.
+        """Return the `PgMajorVersion` projection of the object.
 
         This is mainly useful in subclasses.
 
         """
-        return PgMajorVersion(self[MAJOR1], self[MAJOR2])
+        return self._leading_version(PgMajorVersion)
 
 
 __all__.append('PgVersion')
@@ -74,3 +76,172 @@ class PgVersion(PgMajorVersion):
             default=0,
         ),
     )
+
+
+def _keys(version):
+    """Return the major key and the minor of the `PgVersion`."""
+    if not isinstance(version, PgVersion):
+        version = PgVersion(version)
+    major1, major2, minor = tuple.__getitem__(version, slice(None))
+    return (major1, major2), (0 if minor is None else minor), version
+
+
+def _major_key(major):
+    """Return the major key of the PostgreSQL version (of any depth)."""
+    if not isinstance(major, PgMajorVersion):
+        major = PgMajorVersion(major)
+    return tuple.__getitem__(major, slice(0, 2))
+
+
+__all__.append('PgVersionIndex')
+class PgVersionIndex(object):
+
+    """An index of known PostgreSQL versions grouped by major version.
+
+    Each major version keeps a sorted list of its known minors, so
+    `latest`, `behind_by`, and `upgrade_path` are answered with dictionary
+    lookups and binary searches, and `add` inserts into the one affected
+    group instead of re-sorting the whole inventory.
+
+    The version that each of some servers (any hashable names) is running can
+    be tracked too, which `servers_behind` reports on.
+
+    >>> index = PgVersionIndex(['9.3.4', '9.3.9', '9.4.1'])
+    >>> index.add('9.3.5', server='db1')
+    >>> str(index.latest('9.3'))
+    '9.3.9'
+    >>> index.behind_by('9.3.5')
+    1
+    >>> [str(x) for x in index.upgrade_path('9.3.5')]
+    ['9.3.9', '9.4.1']
+
+    """
+
+    def __init__(self, versions=(), servers=None):
+        """Add the versions and the mapping of servers to their versions."""
+        self._majors = []  # sorted major keys
+        self._minors = {}  # major key -> sorted minors
+        self._versions = {}  # (major key, minor) -> PgVersion
+        self._servers = {}  # server -> (major key, minor)
+        self.update(versions)
+        if servers is not None:
+            for server, version in servers.items():
+                self.add(version, server)
+
+    def __len__(self):
+        return len(self._versions)
+
+    def __contains__(self, version):
+        try:
+            major, minor, version = _keys(version)
+        except (TypeError, ValueError):
+            return False
+        return (major, minor) in self._versions
+
+    def __iter__(self):
+        """Iterate over the known versions in order."""
+        for major in self._majors:
+            for minor in self._minors[major]:
+                yield self._versions[major, minor]
+
+    def add(self, version, server=None):
+        """Add the version, optionally as the one the server is running."""
+        major, minor, version = _keys(version)
+        if (major, minor) not in self._versions:
+            self._versions[major, minor] = version
+            minors = self._minors.get(major)
+            if minors is None:
+                bisect.insort(self._majors, major)
+                minors = self._minors[major] = []
+            bisect.insort(minors, minor)
+        if server is not None:
+            self._servers[server] = major, minor
+
+    def update(self, versions):
+        """Add each of the versions."""
+        for version in versions:
+            self.add(version)
+
+    def majors(self):
+        """Return a list of the known major versions in order."""
+        return [PgMajorVersion(*x) for x in self._majors]
+
+    def latest(self, major):
+        """Return the newest known `PgVersion` of the major version.
+
+        `major` can be a `PgMajorVersion` or anything it can be constructed
+        from, or a `PgVersion`, whose minor is ignored.  `KeyError` is raised
+        if no version of the major version is known.
+
+        """
+        key = _major_key(major)
+        return self._versions[key, self._minors[key][-1]]
+
+    def latest_per_major(self):
+        """Return a list of the newest known version of each major version."""
+        return [self._versions[x, self._minors[x][-1]] for x in self._majors]
+
+    def behind_by(self, version):
+        """Return the number of known newer minors of the version's major."""
+        major, minor, version = _keys(version)
+        minors = self._minors.get(major, ())
+        return len(minors) - bisect.bisect_right(minors, minor)
+
+    def server_version(self, server):
+        """Return the version that the server is running."""
+        return self._versions[self._servers[server]]
+
+    def servers_behind(self, n=1):
+        """Return a dict of the servers at least `n` minors behind the latest.
+
+        The values are the numbers of known newer minors within the servers'
+        major versions.
+
+        """
+        result = {}
+        for server, (major, minor) in self._servers.items():
+            minors = self._minors[major]
+            behind = len(minors) - bisect.bisect_right(minors, minor)
+            if behind >= n:
+                result[server] = behind
+        return result
+
+    def upgrade_path(self, version, target=None):
+        """Return a list of the versions to upgrade to in order.
+
+        The path is the newest known minor of the version's major (if it is
+        not already that) and then `target`, which defaults to the newest
+        known version and can be a `PgVersion` (or anything it can be
+        constructed from) or a `PgMajorVersion`, which means its newest known
+        minor.  The path is empty if the version is not older than the
+        target.
+
+        """
+        major, minor, version = _keys(version)
+        if target is None or (isinstance(target, PgMajorVersion) and
+                               not isinstance(target, PgVersion)):
+            if target is None:
+                if not self._majors:
+                    return []
+                target_major = self._majors[-1]
+            else:
+                target_major = _major_key(target)
+            target_minor = self._minors[target_major][-1]
+            target = self._versions[target_major, target_minor]
+        else:
+            target_major, target_minor, target = _keys(target)
+        if (target_major, target_minor) <= (major, minor):
+            return []
+        result = []
+        if target_major != major:
+            minors = self._minors.get(major)
+            if minors and minors[-1] > minor:
+                result.append(self._versions[major, minors[-1]])
+        result.append(target)
+        return result
+
+
+@register_converter(PgMajorVersion, Version)
+def _to_version(version):
+    """Convert the version to a `~verschemes.Version` of its cooked values."""
+    return Version(*version[:])
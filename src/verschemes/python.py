@@ -45,12 +45,12 @@ class PythonMajorVersion(Version):
 
     @property
     def major_version(self):
-        """Return a new `PythonMajorVersion` with the object's values.
+        """Return the `PythonMajorVersion` projection of the object.
 
         This is mainly useful in subclasses.
 
         """
-        return PythonMajorVersion(self[MAJOR])
+        return self._leading_version(PythonMajorVersion)
 
 
 __all__.append('PythonMinorVersion')
@@ -78,12 +78,12 @@ class PythonMinorVersion(PythonMajorVersion):
 
     @property
     def minor_version(self):
-        """Return a new `PythonMinorVersion` with the object's values.
+        """Return the `PythonMinorVersion` projection of the object.
 
         This is mainly useful in subclasses.
 
         """
-        return PythonMinorVersion(self[MAJOR], self[MINOR])
+        return self._leading_version(PythonMinorVersion)
 
 
 __all__.append('PythonMicroVersion')
@@ -112,12 +112,12 @@ class PythonMicroVersion(PythonMinorVersion):
 
     @property
     def micro_version(self):
-        """Return a new `PythonMicroVersion` with the object's values.
+        """Return the `PythonMicroVersion` projection of the object.
 
         This is mainly useful in subclasses.
 
         """
-        return PythonMicroVersion(self[MAJOR], self[MINOR], self[MICRO])
+        return self._leading_version(PythonMicroVersion)
 
 
 __all__.append('PythonVersion')
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""verschemes.registry module
+
+The registry verschemes module keeps a set of named version schemes
+(`~verschemes.Version` subclasses) and detects which of them accept a given
+version string.
+
+The regular expressions of all of the registered schemes are combined into one
+pattern with a named group per scheme, so a single match of a string finds
+every scheme whose `~verschemes.Version.REGULAR_EXPRESSION` it matches.  Only
+those candidate schemes with intersegment validation are then asked to
+construct the version.
+
+"""
+
+# Support Python 2 & 3.
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from verschemes.future import *
+
+import re
+import threading
+
+from verschemes import Version, _is_string, _needs_construction
+from verschemes.pep440 import Pep440Version
+from verschemes.postgresql import PgVersion
+from verschemes.python import PythonVersion
+from verschemes.xorg import XorgVersion
+
+
+__all__ = []
+
+
+_GROUP_NAME_RE = re.compile(r'\(\?P([<=])')
+
+
+def _scheme_pattern(scheme, index):
+    """Return the scheme's anchored pattern with uniquely named groups."""
+    regex = scheme.REGULAR_EXPRESSION
+    if regex is None:
+        regex = scheme.SEARCH_REGULAR_EXPRESSION
+        pattern = regex.pattern
+    else:
+        pattern = regex.pattern[1:-1]  # strip the anchors
+    prefix = 'scheme{}_'.format(index)
+    return _GROUP_NAME_RE.sub(lambda m: '(?P' + m.group(1) + prefix, pattern)
+
+
+__all__.append('SchemeRegistry')
+class SchemeRegistry(object):
+
+    """A collection of named version schemes.
+
+    Schemes are kept in registration order, which is also the order of the
+    schemes returned by :meth:`detect`.
+
+    A registry may be used by multiple threads, even while schemes are being
+    registered.
+
+    """
+
+    def __init__(self, schemes=()):
+        """Register the given schemes.
+
+        `schemes` may be a mapping of names to schemes or a sequence of
+        schemes and/or ``(name, scheme)`` pairs.
+
+        """
+        # The schemes tuple is replaced (never changed) by registration, and
+        # the detection state derived from it is rebuilt when it is stale.
+        self._schemes = ()
+        self._state = None
+        self._lock = threading.Lock()
+        if hasattr(schemes, 'items'):
+            schemes = schemes.items()
+        for scheme in schemes:
+            if isinstance(scheme, tuple):
+                self.register(scheme[1], scheme[0])
+            else:
+                self.register(scheme)
+
+    def __len__(self):
+        return len(self._schemes)
+
+    def __iter__(self):
+        return iter([x[1] for x in self._schemes])
+
+    def __contains__(self, item):
+        return any(item in x for x in self._schemes)
+
+    def __getitem__(self, name):
+        for scheme_name, scheme in self._schemes:
+            if scheme_name == name:
+                return scheme
+        raise KeyError(name)
+
+    def names(self):
+        """Return a list of the names of the registered schemes."""
+        return [x[0] for x in self._schemes]
+
+    def register(self, scheme, name=None):
+        """Register the `~verschemes.Version` subclass with the given name.
+
+        The name defaults to the qualified name of the class.  The scheme is
+        returned, so this can be used as a class decorator.
+
+        """
+        if not (isinstance(scheme, type) and issubclass(scheme, Version)):
+            raise TypeError(
+                "{!r} is not a Version subclass.".format(scheme))
+        if name is None:
+            name = '{}.{}'.format(scheme.__module__, scheme.__name__)
+        with self._lock:
+            if name in self.names():
+                raise ValueError(
+                    "A scheme named {!r} is already registered.".format(name))
+            self._schemes += ((name, scheme),)
+        return scheme
+
+    def unregister(self, item):
+        """Remove the scheme with the given name (or the given scheme)."""
+        with self._lock:
+            schemes = self._schemes
+            for i, entry in enumerate(schemes):
+                if item in entry:
+                    self._schemes = schemes[:i] + schemes[i + 1:]
+                    return
+        raise KeyError(item)
+
+    def _detection_state(self):
+        """Return the (schemes, regex, construction flags) for detection."""
+        schemes = self._schemes
+        state = self._state
+        if state is None or state[0] is not schemes:
+            regex = re.compile('^' + ''.join(
+                '(?:(?=(?P<scheme{}>{})$))?'
+                .format(i, _scheme_pattern(x[1], i))
+                for i, x in enumerate(schemes)))
+            construct = [_needs_construction(x[1]) for x in schemes]
+            state = self._state = schemes, regex, construct
+        return state
+
+    @property
+    def regular_expression(self):
+        """The compiled combined regular expression of all of the schemes.
+
+        The group named 'schemeN' matches if the string matches the regular
+        expression of the N-th scheme in registration order.
+
+        """
+        return self._detection_state()[1]
+
+    def detect(self, string):
+        """Return a list of the registered schemes that accept the string.
+
+        A scheme accepts the string if constructing an instance of it from the
+        string succeeds.  Only the schemes whose regular expressions match the
+        string and that have additional validation are actually constructed.
+
+        """
+        if not _is_string(string):
+            raise TypeError(
+                "{!r} is not a string.".format(string))
+        schemes, regex, construct = self._detection_state()
+        match = regex.match(string)
+        result = []
+        for i, (name, scheme) in enumerate(schemes):
+            if match.group('scheme{}'.format(i)) is None:
+                continue
+            if construct[i]:
+                try:
+                    scheme(string)
+                except (TypeError, ValueError):
+                    continue
+            result.append(scheme)
+        return result
+
+    def detect_many(self, strings):
+        """Return a list of the :meth:`detect` results for the strings."""
+        return [self.detect(x) for x in strings]
+
+
+__all__.append('DEFAULT_REGISTRY')
+DEFAULT_REGISTRY = SchemeRegistry([
+    ('default', Version),
+    ('python', PythonVersion),
+    ('pep440', Pep440Version),
+    ('postgresql', PgVersion),
+    ('xorg', XorgVersion),
+])
+"""The registry of the schemes included in the verschemes package."""
+
+
+__all__.append('register')
+def register(scheme, name=None):
+    """Register the scheme in the `DEFAULT_REGISTRY`."""
+    return DEFAULT_REGISTRY.register(scheme, name)
+
+
+__all__.append('detect')
+def detect(string):
+    """Return the schemes in the `DEFAULT_REGISTRY` that accept the string."""
+    return DEFAULT_REGISTRY.detect(string)
+
+
+__all__.append('detect_many')
+def detect_many(strings):
+    """Return the `detect` results for each of the strings."""
+    return DEFAULT_REGISTRY.detect_many(strings)
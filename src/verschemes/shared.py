@@ -0,0 +1,471 @@
+# -*- coding: utf-8 -*-
+"""verschemes.shared module
+
+The shared verschemes module stores the segment values of many versions in a
+table in shared memory (or in a memory-mapped file), so that other processes,
+such as the workers of a `multiprocessing` pool, can read the versions without
+copying or parsing them again.
+
+The table has a column of 64-bit signed integers (in the native byte order)
+for each field of each segment of the scheme, holding `NONE` for the fields of
+absent segments and `NULL` for fields without a value (e.g., the serial of the
+'+' suffix of a Python version).  The values of `str` fields (e.g., the level
+of a PEP 440 pre-release) are stored as indexes into the sorted list of the
+column's distinct strings, so the codes are in the same order as the strings.
+Each column is contiguous, so it can be read as a `memoryview` or a NumPy
+array without copying it, and a version is only built when its row is
+accessed.
+
+>>> from verschemes.postgresql import PgVersion
+>>> from verschemes.shared import VersionTable
+>>> with VersionTable.create([PgVersion('9.3.4'), PgVersion('10.1')]) as table:
+...     other = VersionTable.attach(table.name)
+...     print(other[1], other.columns)
+...     other.close()
+10.1 ['major1', 'major2', 'minor']
+
+The process that creates a table owns it and should `~VersionTable.unlink` it
+when no process needs it anymore (which happens when its ``with`` block is
+exited); every process should `~VersionTable.close` its own table object.
+Views of the columns must be released before the table is closed.
+
+Shared memory requires Python 3.8 or later.  On Python versions before 3.13,
+only processes started by `multiprocessing` from the creating process (which
+share its resource tracker) should attach to a table in shared memory,
+because the resource tracker of any other process removes the shared memory
+when that process exits.
+
+"""
+
+# Support Python 2 & 3.
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from verschemes.future import *
+
+import array
+import importlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+from verschemes import (DEFAULT_SEGMENT_DEFINITION, Version, _fields_metadata,
+                        _is_string, convert)
+
+
+__all__ = []
+
+__all__.append('NONE')
+NONE = -(1 << 63)
+"""The value stored in the columns of the fields of absent segments."""
+
+__all__.append('NULL')
+NULL = NONE + 1
+"""The value stored in the columns of fields that are `None` in a segment."""
+
+_NULL = object()  # the raw value of a field that is None in a segment
+
+_MAGIC = b'VERSTAB1'
+_HEADER = struct.Struct(str('<8sQ'))  # the magic and the JSON header length
+_MAXIMUM = (1 << 63) - 1
+
+
+def _offset(length):
+    """Return the offset of the columns after a header of the length."""
+    return (_HEADER.size + length + 7) // 8 * 8
+
+
+def _scheme_path(scheme):
+    return '{}:{}'.format(scheme.__module__,
+                          getattr(scheme, '__qualname__', scheme.__name__))
+
+
+def _import_scheme(path):
+    module, _, name = path.partition(':')
+    try:
+        result = importlib.import_module(module)
+        for attribute in name.split('.'):
+            result = getattr(result, attribute)
+    except (ImportError, AttributeError):
+        raise ValueError(
+            "The scheme {!r} of the table cannot be imported; it must be "
+            "given.".format(path))
+    return result
+
+
+def _columns(scheme, width):
+    """Return the (segment index, field index, field, name) of each column.
+
+    The default scheme (without segment definitions) has `width` columns.
+
+    """
+    definitions = scheme.SEGMENT_DEFINITIONS
+    if not definitions:
+        field = DEFAULT_SEGMENT_DEFINITION.fields[0]
+        return [(i, None, field, str(i)) for i in range(width)]
+    result = []
+    for index, definition in enumerate(definitions):
+        name = definition.name or str(index)
+        fields = definition.fields
+        if len(fields) == 1:
+            result.append((index, None, fields[0], name))
+            continue
+        for field_index, field in enumerate(fields):
+            result.append((index, field_index, field,
+                           '{}.{}'.format(name, field.name)))
+    return result
+
+
+def _encode(version, segment, field_index):
+    """Return the raw value of the field of the version's segment.
+
+    This is `None` if the segment is absent and `_NULL` if the field is.
+
+    """
+    value = (tuple.__getitem__(version, segment)
+             if segment < len(version) else None)
+    if value is not None and field_index is not None:
+        value = value[field_index]
+        if value is None:
+            return _NULL
+    return value
+
+
+class _SharedMemory(object):
+
+    def __init__(self, name, size=None):
+        from multiprocessing import shared_memory
+        if size is not None:
+            memory = shared_memory.SharedMemory(name, create=True, size=size)
+        elif sys.version_info >= (3, 13):
+            memory = shared_memory.SharedMemory(name, track=False)
+        else:
+            memory = shared_memory.SharedMemory(name)
+        self._memory = memory
+        self.buffer = memory.buf
+        self.name = memory.name
+
+    def close(self):
+        self.buffer = None
+        self._memory.close()
+
+    def unlink(self):
+        self._memory.unlink()
+
+
+class _MappedFile(object):
+
+    def __init__(self, path, size=None):
+        if size is None:
+            with open(path, 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            with open(path, 'w+b') as f:
+                f.truncate(size)
+                self._map = mmap.mmap(f.fileno(), 0)
+        self.buffer = memoryview(self._map)
+        self.name = path
+
+    def close(self):
+        self.buffer.release()
+        self._map.close()
+
+    def unlink(self):
+        os.remove(self.name)
+
+
+__all__.append('VersionTable')
+class VersionTable(object):
+
+    """A table of versions of one scheme in shared memory or a mapped file.
+
+    Tables are made with :meth:`create` and opened by other processes with
+    :meth:`attach`; the constructor is not public.  A table is a read-only
+    sequence of its versions.
+
+    """
+
+    def __init__(self, storage, scheme, owner):
+        self._storage = storage
+        self._name = storage.name
+        self._unlink = storage.unlink
+        self._bytes = self._data = None
+        self.owner = owner
+        """Whether this object created the table."""
+        try:
+            self._load(scheme)
+        except Exception:
+            self.close()
+            raise
+
+    def _load(self, scheme):
+        buffer = self._storage.buffer
+        magic, length = _HEADER.unpack_from(buffer)
+        if magic != _MAGIC:
+            raise ValueError(
+                "{!r} is not a version table.".format(self._storage.name))
+        with buffer[_HEADER.size:_HEADER.size + length] as header:
+            header = json.loads(header.tobytes().decode('utf-8'))
+        if header['byteorder'] != sys.byteorder:
+            raise ValueError(
+                "The table has the wrong byte order.")
+        if scheme is None:
+            scheme = _import_scheme(header['scheme'])
+        columns = _columns(scheme, header['width'])
+        if [x[3] for x in columns] != header['columns']:
+            raise ValueError(
+                "The columns of the table {} do not match the scheme {!r}."
+                .format(header['columns'], scheme))
+        self._scheme = scheme
+        self._rows = rows = header['rows']
+        self._strings = header['strings']
+        self._names = dict((x[3], i) for i, x in enumerate(columns))
+        self._segments = self._plan(scheme, columns)
+        offset = _offset(length)
+        self._bytes = buffer[offset:offset + 8 * rows * len(columns)]
+        self._data = self._bytes.cast(str('q'))
+
+    def _plan(self, scheme, columns):
+        """Return the (Segment class, columns) of each segment.
+
+        Each of the columns is given as (index, conversion), where the
+        conversion of the stored integer to the field value is `None` for
+        `int` fields.
+
+        """
+        result = []
+        for index, _, field, name in columns:
+            if not result or result[-1][0] != index:
+                result.append((index, []))
+            if field.type is int:
+                conversion = None
+            elif field.type is str:
+                conversion = self._strings[name].__getitem__
+            else:
+                conversion = field.type
+            result[-1][1].append((self._names[name], conversion))
+        definitions = scheme.SEGMENT_DEFINITIONS
+        return [(_fields_metadata(definitions[i].fields)[1]
+                 if len(x) > 1 else None, x) for i, x in result]
+
+    @classmethod
+    def create(cls, versions, scheme=None, name=None, path=None):
+        """Return a new table of the versions.
+
+        The versions may be given as strings, which are parsed as versions of
+        `scheme`, or as versions, which are converted to `scheme` (see
+        `~verschemes.convert`).  If no `scheme` is given, it is the type of the
+        first version (or `~verschemes.Version` if that is a string).  Other
+        processes must be able to import the scheme to attach to the table
+        without giving it.
+
+        The table is made in a memory-mapped file at `path` if that is given,
+        and otherwise in shared memory named `name` (or a unique name if that
+        is not given either).  `TypeError` is raised for segment field values
+        that are neither `int` (within 64 bits) nor `str`.
+
+        """
+        versions = list(versions)
+        if scheme is None:
+            scheme = (type(versions[0])
+                      if versions and isinstance(versions[0], Version) else
+                      Version)
+        versions = [scheme(x) if _is_string(x) else convert(x, scheme)
+                    for x in versions]
+        width = (0 if scheme.SEGMENT_DEFINITIONS else
+                 max([len(x) for x in versions] or [0]))
+        columns = _columns(scheme, width)
+        data, strings = [], {}
+        for segment, field_index, field, column_name in columns:
+            values = [_encode(x, segment, field_index) for x in versions]
+            if field.type is str:
+                table = sorted(set(x for x in values
+                                   if x is not None and x is not _NULL))
+                codes = dict((x, i) for i, x in enumerate(table))
+                codes[None], codes[_NULL] = NONE, NULL
+                values = [codes[x] for x in values]
+                strings[column_name] = table
+            else:
+                for value in values:
+                    if value is not None and value is not _NULL and not (
+                            isinstance(value, int) and
+                            NULL < value <= _MAXIMUM):
+                        raise TypeError(
+                            "The {} value {!r} cannot be stored."
+                            .format(column_name, value))
+                values = [NONE if x is None else NULL if x is _NULL else x
+                          for x in values]
+            data.append(array.array(str('q'), values))
+        header = json.dumps({
+            'byteorder': sys.byteorder,
+            'columns': [x[3] for x in columns],
+            'rows': len(versions),
+            'scheme': _scheme_path(scheme),
+            'strings': strings,
+            'width': width,
+        }, sort_keys=True).encode('utf-8')
+        offset = _offset(len(header))
+        size = offset + 8 * len(versions) * len(columns)
+        storage = (_MappedFile(path, size) if path is not None else
+                   _SharedMemory(name, size))
+        try:
+            buffer = storage.buffer
+            _HEADER.pack_into(buffer, 0, _MAGIC, len(header))
+            buffer[_HEADER.size:_HEADER.size + len(header)] = header
+            for column in data:
+                column = column.tobytes()
+                buffer[offset:offset + len(column)] = column
+                offset += len(column)
+            return cls(storage, scheme, True)
+        except Exception:
+            if storage.buffer is not None:
+                storage.close()
+            storage.unlink()
+            raise
+
+    @classmethod
+    def attach(cls, name=None, path=None, scheme=None):
+        """Return the existing table in shared memory or a file.
+
+        Exactly one of the shared memory `name` and the file `path` must be
+        given.  The `scheme` must be given if the table's scheme cannot be
+        imported (e.g., it is defined in a function).  Tables in files are
+        attached read-only.
+
+        """
+        if (name is None) == (path is None):
+            raise TypeError(
+                "Exactly one of name and path must be given.")
+        storage = (_MappedFile(path) if path is not None else
+                   _SharedMemory(name))
+        return cls(storage, scheme, False)
+
+    @property
+    def name(self):
+        """The name of the shared memory or the path of the file."""
+        return self._name
+
+    @property
+    def scheme(self):
+        """The `~verschemes.Version` subclass of the versions."""
+        return self._scheme
+
+    @property
+    def columns(self):
+        """The list of the column names.
+
+        The columns of the fields of a segment with several fields are named
+        ``'segment.field'``, and segments without a name are named by their
+        index.
+
+        """
+        return sorted(self._names, key=self._names.get)
+
+    def strings(self, name):
+        """Return the sorted list of the distinct strings of the column.
+
+        The values of the column are indexes into this list.
+
+        """
+        return list(self._strings[name])
+
+    def column(self, name):
+        """Return a `memoryview` of the integers of the column.
+
+        The view must be released before the table is closed.
+
+        """
+        index = self._names[name]
+        return self._data[index * self._rows:(index + 1) * self._rows]
+
+    def numpy(self, name=None):
+        """Return a NumPy array of the column, or of all of the columns.
+
+        The array of all of the columns has a row for each column.  The arrays
+        share the table's memory and must be deleted before the table is
+        closed.  This requires NumPy.
+
+        """
+        import numpy
+        result = numpy.frombuffer(self._data, dtype=numpy.int64)
+        if name is None:
+            return result.reshape(len(self._names), self._rows)
+        index = self._names[name]
+        return result[index * self._rows:(index + 1) * self._rows]
+
+    def __len__(self):
+        return self._rows
+
+    def __repr__(self):
+        return "<{}.{} {!r} of {} {} versions>".format(
+            type(self).__module__, type(self).__name__, self.name, self._rows,
+            _scheme_path(self._scheme))
+
+    def _version(self, row):
+        data, rows = self._data, self._rows
+        values = []
+        for segment, columns in self._segments:
+            fields = []
+            for column, conversion in columns:
+                value = data[column * rows + row]
+                if value == NONE:
+                    fields = None
+                    break
+                fields.append(None if value == NULL else
+                              value if conversion is None else
+                              conversion(value))
+            values.append(None if fields is None else
+                          fields[0] if segment is None else
+                          segment(*fields))
+        if not self._scheme.SEGMENT_DEFINITIONS:
+            while values and values[-1] is None:
+                values.pop()
+        version = tuple.__new__(self._scheme, values)  # already validated
+        pool = self._scheme.INTERN_POOL
+        return version if pool is None else pool.intern(version)
+
+    def __getitem__(self, item):
+        """Return the version of the row (or a list of them for a slice)."""
+        if isinstance(item, slice):
+            return [self._version(x) for x in range(self._rows)[item]]
+        return self._version(range(self._rows)[item])
+
+    def __iter__(self):
+        return (self._version(x) for x in range(self._rows))
+
+    def close(self):
+        """Close this process's access to the table.
+
+        This does nothing if it is already closed.
+
+        """
+        for view in (self._data, self._bytes):
+            if view is not None:
+                view.release()
+        self._bytes = self._data = None
+        if self._storage is not None:
+            self._storage.close()
+            self._storage = None
+
+    def unlink(self):
+        """Remove the table's shared memory or file.
+
+        Processes that are attached can still use the table until they close
+        it.  This should only be done once, normally by the owner.
+
+        """
+        self._unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close the table, and unlink it if this object is the owner."""
+        self.close()
+        if self.owner:
+            self.unlink()
+
+    def __del__(self):
+        if getattr(self, '_storage', None) is not None:
+            self.close()
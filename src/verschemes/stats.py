@@ -0,0 +1,349 @@
+# -*- coding: utf-8 -*-
+"""verschemes.stats module
+
+The statistics verschemes module counts the calls of, and accumulates the time
+spent in, the phases of the library's hot paths per version scheme, and it
+counts the hits and misses of the library's caches.
+
+Nothing is instrumented until `enable` is called, which replaces the
+instrumented functions and methods with measuring wrappers; `disable` restores
+the originals, so there is no cost at all when disabled.  For example:
+
+>>> from verschemes import stats
+>>> from verschemes.pep440 import Pep440Version
+>>> with stats.measure() as result:
+...     version = Pep440Version('1.2b3')
+>>> result['phases']['new']['calls']
+1
+>>> result['phases']['segment']['calls']
+1
+
+The phases are:
+
+* 'new': `~verschemes.Version` construction (which includes all of the
+  following parsing and validation phases),
+* 'match': the matching of version strings by the scheme's regular
+  expression,
+* 'validate_value': the validation of each segment value,
+* 'segment': the creation of the `Segment` values of multiple-field segments,
+* 'validate': the schemes' `~verschemes.Version.validate` hooks,
+* 'render': `~verschemes.Version.render`,
+* 'render_callback': the rendering callbacks (e.g., for excluding defaults),
+* 'compare': the comparison operators.
+
+The caches are 'parse' (strings parsed for comparisons), 'projection'
+(`~verschemes.Version.project`), 'intern' (`~verschemes.InternPool`s), and
+'fields' (the compiled metadata of segment fields).
+
+Methods of version schemes created while the instrumentation is enabled are
+not instrumented, and the counters are not thread-safe.
+
+"""
+
+# Support Python 2 & 3.
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from verschemes.future import *
+
+import collections
+import contextlib
+import functools
+import threading
+import time
+
+import verschemes
+from verschemes import InternPool, SegmentDefinition, Version, _VersionMeta
+
+
+__all__ = []
+
+__all__.append('PHASES')
+PHASES = ('new', 'match', 'validate_value', 'segment', 'validate', 'render',
+          'render_callback', 'compare')
+"""The names of the measured phases."""
+
+__all__.append('CACHES')
+CACHES = ('parse', 'projection', 'intern', 'fields')
+"""The names of the measured caches."""
+
+_COMPARISONS = ('__eq__', '__ne__', '__lt__', '__le__', '__gt__', '__ge__')
+
+_clock = getattr(time, 'perf_counter', time.time)
+
+# (phase, scheme) -> [calls, seconds]
+_phases = collections.defaultdict(lambda: [0, 0.0])
+# cache -> [hits, misses]
+_caches = collections.defaultdict(lambda: [0, 0])
+
+
+class _ThreadState(threading.local):
+
+    """The state of the measurements in progress, which is kept per thread."""
+
+    def __init__(self):
+        # The schemes of the versions being constructed (innermost last).
+        self.schemes = []
+        # The phases being measured (to not count nested calls, e.g., via
+        # super())
+        self.active = set()
+
+
+_thread_state = _ThreadState()
+
+# (owner, name, original attribute) of the replaced attributes
+_patches = []
+
+
+def _name(cls):
+    return None if cls is None else '{}.{}'.format(cls.__module__,
+                                                   cls.__name__)
+
+
+def _record(phase, scheme, start):
+    counter = _phases[phase, _name(scheme)]
+    counter[0] += 1
+    counter[1] += _clock() - start
+
+
+def _timed(phase, function, scheme=lambda args: type(args[0])):
+    """Return a wrapper of the function that records the phase.
+
+    Calls made while the phase is already being measured are not recorded
+    separately.
+
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        active = _thread_state.active
+        if phase in active:
+            return function(*args, **kwargs)
+        active.add(phase)
+        start = _clock()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _record(phase, scheme(args), start)
+            active.discard(phase)
+    return wrapper
+
+
+def _counted(cache, function, size):
+    """Return a wrapper of the function that counts the cache's hits.
+
+    A call is a miss if it changes the size of the cache.
+
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        before = size(args)
+        result = function(*args, **kwargs)
+        _caches[cache][size(args) != before] += 1  # [hits, misses][miss]
+        return result
+    return wrapper
+
+
+def _patch(owner, name, replacement):
+    _patches.append((owner, name, owner.__dict__[name]))
+    setattr(owner, name, replacement)
+
+
+def _current_scheme(args):
+    schemes = _thread_state.schemes
+    return schemes[-1] if schemes else None
+
+
+class _TimedRegex(object):
+
+    """A compiled regular expression whose matching is recorded."""
+
+    __slots__ = ('_regex', '_scheme')
+
+    def __init__(self, regex, scheme):
+        self._regex = regex
+        self._scheme = scheme
+
+    def __getattr__(self, name):
+        return getattr(self._regex, name)
+
+    def match(self, *args, **kwargs):
+        start = _clock()
+        try:
+            return self._regex.match(*args, **kwargs)
+        finally:
+            _record('match', self._scheme, start)
+
+
+def _schemes_defining(names):
+    """Yield (scheme, name) for the Version subclasses defining the names."""
+    pending = [Version]
+    seen = set()
+    while pending:
+        cls = pending.pop()
+        if cls in seen:
+            continue
+        seen.add(cls)
+        pending.extend(cls.__subclasses__())
+        for name in list(vars(cls)):
+            if name in names or (name.startswith('_render_') and
+                                 name.endswith('_callback') and
+                                 'render_callback' in names):
+                yield cls, name
+
+
+__all__.append('is_enabled')
+def is_enabled():
+    """Return whether the instrumentation is enabled."""
+    return bool(_patches)
+
+
+__all__.append('enable')
+def enable():
+    """Start recording the statistics (if not already enabled)."""
+    if _patches:
+        return
+    original_new = Version.__dict__['__new__']
+    new = getattr(original_new, '__func__', original_new)
+
+    @functools.wraps(new)
+    def timed_new(cls, *args, **kwargs):
+        schemes = _thread_state.schemes
+        schemes.append(cls)
+        start = _clock()
+        try:
+            return new(cls, *args, **kwargs)
+        finally:
+            _record('new', cls, start)
+            schemes.pop()
+    _patch(Version, '__new__', staticmethod(timed_new))
+
+    regex_property = _VersionMeta.__dict__['REGULAR_EXPRESSION']
+    _patch(_VersionMeta, 'REGULAR_EXPRESSION', property(
+        lambda cls: _TimedRegex(regex_property.fget(cls), cls)
+        if cls.SEGMENT_DEFINITIONS else None,
+        doc=regex_property.__doc__))
+
+    _patch(SegmentDefinition, 'validate_value', _timed(
+        'validate_value', SegmentDefinition.__dict__['validate_value'],
+        _current_scheme))
+
+    fields_metadata = verschemes._fields_metadata
+
+    def timed_fields_metadata(fields):
+        regex, segment_type = fields_metadata(fields)
+        if segment_type is not None:
+            segment_type = _timed('segment', segment_type, _current_scheme)
+        return regex, segment_type
+    _patch(verschemes, '_fields_metadata', _counted(
+        'fields', timed_fields_metadata,
+        lambda args: len(verschemes._fields_cache)))
+
+    for name in _COMPARISONS:
+        _patch(Version, name, _timed('compare', Version.__dict__[name]))
+    for scheme, name in list(_schemes_defining(('validate', 'render',
+                                                'render_callback'))):
+        phase = name if name in ('validate', 'render') else 'render_callback'
+        _patch(scheme, name, _timed(phase, scheme.__dict__[name]))
+
+    parse = Version.__dict__['_parse'].__func__
+    _patch(Version, '_parse', classmethod(_counted(
+        'parse', parse, lambda args: len(verschemes._thread_caches.parse))))
+    _patch(Version, '_projected', _counted(
+        'projection', Version.__dict__['_projected'],
+        lambda args: len(verschemes._thread_caches.projections)))
+    _patch(InternPool, 'intern', _counted(
+        'intern', InternPool.__dict__['intern'], lambda args: len(args[0])))
+
+
+__all__.append('disable')
+def disable():
+    """Stop recording the statistics, and restore the original functions.
+
+    The statistics recorded so far are kept.
+
+    """
+    while _patches:
+        owner, name, original = _patches.pop()
+        setattr(owner, name, original)
+
+
+__all__.append('reset')
+def reset():
+    """Clear the statistics recorded so far."""
+    _phases.clear()
+    _caches.clear()
+
+
+def _state():
+    return (dict((k, list(v)) for k, v in _phases.items()),
+            dict((k, list(v)) for k, v in _caches.items()))
+
+
+def _snapshot(phases, caches):
+    result = {
+        'enabled': is_enabled(),
+        'phases': dict((x, {'calls': 0, 'seconds': 0.0, 'schemes': {}})
+                       for x in PHASES),
+        'caches': {},
+    }
+    for (phase, scheme), (calls, seconds) in phases.items():
+        if not calls:
+            continue
+        totals = result['phases'][phase]
+        totals['calls'] += calls
+        totals['seconds'] += seconds
+        totals['schemes'][scheme] = {'calls': calls, 'seconds': seconds}
+    for cache in CACHES:
+        hits, misses = caches.get(cache, (0, 0))
+        result['caches'][cache] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / (hits + misses) if hits + misses else None,
+        }
+    return result
+
+
+__all__.append('snapshot')
+def snapshot():
+    """Return a dict of the statistics recorded so far.
+
+    The dict has these items:
+
+    * 'enabled': whether the instrumentation is enabled,
+    * 'phases': a dict of each phase name to a dict of its total 'calls' and
+      'seconds' and its 'schemes', a dict of the qualified names of the
+      version schemes (or `None` where the scheme is unknown) to dicts of
+      their 'calls' and 'seconds', and
+    * 'caches': a dict of each cache name to a dict of its 'hits', 'misses',
+      and 'hit_rate' (`None` if the cache has not been used).
+
+    """
+    return _snapshot(*_state())
+
+
+__all__.append('measure')
+@contextlib.contextmanager
+def measure():
+    """Return a context manager that measures the statistics of its block.
+
+    The instrumentation is enabled for the block (unless it already is), and
+    the context manager's value is a dict that gets filled in with the
+    `snapshot` of just the statistics recorded in the block when it exits.
+
+    """
+    was_enabled = is_enabled()
+    phases, caches = _state()
+    result = {}
+    enable()
+    try:
+        yield result
+    finally:
+        if not was_enabled:
+            disable()
+        after_phases, after_caches = _state()
+        for key, (calls, seconds) in phases.items():
+            after_phases[key][0] -= calls
+            after_phases[key][1] -= seconds
+        for key, (hits, misses) in caches.items():
+            after_caches[key][0] -= hits
+            after_caches[key][1] -= misses
+        result.update(_snapshot(after_phases, after_caches))
@@ -0,0 +1,481 @@
+# -*- coding: utf-8 -*-
+"""verschemes.versionset module
+
+The version set verschemes module provides mutable collections of versions
+that are kept in order, so that changing a few entries does not require
+sorting all of them again.
+
+Each collection holds versions of one scheme.  The versions are kept by their
+cooked segment values (the values that they are compared by), which are
+computed once per version and stored in a sorted list of sorted sublists, so
+inserting or removing a version only moves the items of one short sublist, and
+finding a position is a binary search of the sublists' last items and then of
+one sublist.  Membership is a dictionary lookup.  (A scheme that overrides the
+comparison of its versions is kept in the order given by comparing them.)
+
+>>> from verschemes.versionset import VersionSet
+>>> versions = VersionSet(['1.10', '1.2', '1.9.1'])
+>>> versions.add('1.9')
+>>> [str(x) for x in versions]
+['1.2', '1.9', '1.9.1', '1.10']
+>>> str(versions.floor('1.9.5'))
+'1.9.1'
+>>> [str(x) for x in versions.irange('1.3', '1.9.1')]
+['1.9', '1.9.1']
+
+Versions are compared just like the `~verschemes.Version` instances, so
+versions that cannot be compared with each other (e.g., one without a value
+for an optional segment that has no default and one with a value for it)
+cannot be in the same collection; `TypeError` is raised for them.
+
+"""
+
+# Support Python 2 & 3.
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from verschemes.future import *
+
+import bisect
+import itertools
+
+try:
+    from collections.abc import Mapping, MutableMapping, MutableSet
+except ImportError:  # pragma: no cover  # Python 2
+    from collections import Mapping, MutableMapping, MutableSet
+
+from verschemes import (Version, _is_string, _OrderKey, _ordered_by_keys,
+                        convert)
+
+
+__all__ = []
+
+_LOAD = 256  # the typical sublist length (they are split at twice this)
+
+
+class _SortedVersions(object):
+
+    """The ordered storage shared by `VersionSet` and `VersionSortedDict`."""
+
+    def __init__(self, scheme):
+        self._scheme = scheme
+        self._lists = []  # sorted sublists of the keys
+        self._maxes = []  # the last key of each sublist
+        self._versions = {}  # key -> version
+
+    @property
+    def scheme(self):
+        """The `~verschemes.Version` subclass of the versions."""
+        return self._scheme
+
+    def _version(self, version):
+        """Return the version (which may be a string) as one of the scheme.
+
+        The scheme is set to the version's type if it is not set yet (or
+        to `~verschemes.Version` for a string).
+
+        """
+        scheme = self._scheme
+        if _is_string(version):
+            if scheme is None:
+                scheme = self._scheme = Version
+            return scheme(version)
+        if scheme is None:
+            if not isinstance(version, Version):
+                raise TypeError(
+                    "{!r} is not a version.".format(version))
+            scheme = self._scheme = type(version)
+        return convert(version, scheme)
+
+    def _key(self, version):
+        """Return the sort key of the version and the version."""
+        version = self._version(version)
+        if _ordered_by_keys(self._scheme):
+            return version[:], version
+        return _OrderKey(version), version
+
+    def __len__(self):
+        return len(self._versions)
+
+    def _insert(self, key):
+        """Insert the new key into its place."""
+        lists, maxes = self._lists, self._maxes
+        if not maxes:
+            lists.append([key])
+            maxes.append(key)
+            return
+        i = bisect.bisect_left(maxes, key)
+        if i == len(maxes):
+            i -= 1
+            lists[i].append(key)
+            maxes[i] = key
+        else:
+            bisect.insort(lists[i], key)
+        if len(lists[i]) > 2 * _LOAD:
+            sublist = lists[i]
+            lists[i:i + 1] = sublist[:_LOAD], sublist[_LOAD:]
+            maxes[i:i + 1] = sublist[_LOAD - 1], sublist[-1]
+
+    def _remove(self, key):
+        """Remove the existing key."""
+        lists, maxes = self._lists, self._maxes
+        i = bisect.bisect_left(maxes, key)
+        sublist = lists[i]
+        j = bisect.bisect_left(sublist, key)
+        del sublist[j]
+        if not sublist:
+            del lists[i]
+            del maxes[i]
+        elif j == len(sublist):
+            maxes[i] = sublist[-1]
+
+    def _merge(self, new):
+        """Add the new versions, a mapping of their unique keys to them.
+
+        A few keys are just inserted.  Otherwise all of the keys are rebuilt
+        into new sublists, which takes linear time for the keys of another
+        collection because `sorted` merges sorted runs in linear time.
+
+        """
+        keys = sorted(new)
+        kept = self._versions
+        if len(keys) < 64 or len(keys) * 16 < len(kept):
+            for key in keys:
+                self._insert(key)
+                kept[key] = new[key]
+            return
+        merged = sorted(itertools.chain(itertools.chain(*self._lists), keys))
+        self._lists = [merged[i:i + _LOAD]
+                       for i in range(0, len(merged), _LOAD)]
+        self._maxes = [x[-1] for x in self._lists]
+        kept.update(new)
+
+    def _clear(self):
+        del self._lists[:]
+        del self._maxes[:]
+        self._versions.clear()
+
+    def _bisect(self, key, right=False):
+        """Return the (sublist, index) position of the key.
+
+        The position is before any equal key, or after it if `right` is true.
+
+        """
+        maxes = self._maxes
+        i = (bisect.bisect_right if right else bisect.bisect_left)(maxes, key)
+        if i == len(maxes):
+            return i, 0
+        sublist = self._lists[i]
+        return i, (bisect.bisect_right if right else
+                   bisect.bisect_left)(sublist, key)
+
+    def _forward(self, i, j):
+        """Yield the keys from the position on."""
+        lists = self._lists
+        while i < len(lists):
+            for key in lists[i][j:]:
+                yield key
+            i, j = i + 1, 0
+
+    def _backward(self, i, j):
+        """Yield the keys before the position in reverse order."""
+        lists = self._lists
+        if i == len(lists):
+            i, j = i - 1, None
+        while i >= 0:
+            sublist = lists[i]
+            for key in reversed(sublist[:j]):
+                yield key
+            i, j = i - 1, None
+
+    def _keys(self, reverse=False):
+        if reverse:
+            return self._backward(len(self._lists), 0)
+        return itertools.chain(*self._lists)
+
+    def __iter__(self):
+        """Iterate over the versions in order."""
+        versions = self._versions
+        return (versions[x] for x in self._keys())
+
+    def __reversed__(self):
+        versions = self._versions
+        return (versions[x] for x in self._keys(reverse=True))
+
+    def _query_key(self, version):
+        """Return the sort key of the version to look for.
+
+        `None` is returned if the scheme is not set yet (so there are no
+        versions to find), so that a query does not set it.
+
+        """
+        if self._scheme is None:
+            return None
+        return self._key(version)[0]
+
+    def _first(self, keys):
+        for key in keys:
+            return self._versions[key]
+
+    def min(self):
+        """Return the lowest version.
+
+        `ValueError` is raised if there are no versions.
+
+        """
+        if not self._lists:
+            raise ValueError(
+                "There are no versions.")
+        return self._versions[self._lists[0][0]]
+
+    def max(self):
+        """Return the highest version.
+
+        `ValueError` is raised if there are no versions.
+
+        """
+        if not self._lists:
+            raise ValueError(
+                "There are no versions.")
+        return self._versions[self._lists[-1][-1]]
+
+    def floor(self, version):
+        """Return the highest version not higher than the version, if any."""
+        return self._first(self._backward(
+            *self._bisect(self._query_key(version), right=True)))
+
+    def ceiling(self, version):
+        """Return the lowest version not lower than the version, if any."""
+        return self._first(self._forward(
+            *self._bisect(self._query_key(version))))
+
+    def irange(self, minimum=None, maximum=None, inclusive=(True, True),
+               reverse=False):
+        """Iterate over the versions between `minimum` and `maximum` in order.
+
+        `None` means no limit.  Whether each limit itself is included is given
+        by the pair `inclusive`.  The versions are in descending order if
+        `reverse` is true.
+
+        """
+        low = None if minimum is None else self._query_key(minimum)
+        high = None if maximum is None else self._query_key(maximum)
+        if reverse:
+            keys = (self._backward(len(self._lists), 0) if high is None else
+                    self._backward(*self._bisect(high, right=inclusive[1])))
+            if low is not None:
+                keys = itertools.takewhile(
+                    (lambda x: not x < low) if inclusive[0] else
+                    (lambda x: low < x), keys)
+        else:
+            keys = (self._forward(0, 0) if low is None else
+                    self._forward(*self._bisect(low, right=not inclusive[0])))
+            if high is not None:
+                keys = itertools.takewhile(
+                    (lambda x: not high < x) if inclusive[1] else
+                    (lambda x: x < high), keys)
+        versions = self._versions
+        return (versions[x] for x in keys)
+
+    def _keyed(self, versions):
+        """Yield the (key, version) pairs of the versions.
+
+        The keys of another collection of the same scheme are reused.
+
+        """
+        if isinstance(versions, _SortedVersions):
+            if self._scheme is None:
+                self._scheme = versions._scheme
+            if versions._scheme is self._scheme:
+                kept = versions._versions
+                return ((x, kept[x]) for x in versions._keys())
+        return (self._key(x) for x in versions)
+
+    def _new(self, keyed):
+        """Return the mapping of the new keys of the pairs to the versions."""
+        kept = self._versions
+        new = {}
+        for key, version in keyed:
+            if key not in kept and key not in new:
+                new[key] = version
+        return new
+
+
+__all__.append('VersionSet')
+class VersionSet(_SortedVersions, MutableSet):
+
+    """A mutable set of versions of one scheme kept in order.
+
+    Iteration is in ascending order.  Versions may be given as strings, which
+    are parsed with the `scheme`, or as versions of other schemes, which are
+    converted to it with `~verschemes.convert`.  If no `scheme` is given, it
+    is the type of the first version added (or `~verschemes.Version` if that
+    is a string).
+
+    Equal versions are the same member; the first one added is kept.
+
+    """
+
+    def __init__(self, versions=(), scheme=None):
+        super().__init__(scheme)
+        self.update(versions)
+
+    def __repr__(self):
+        return "{}.{}({!r}, scheme={})".format(
+            type(self).__module__, type(self).__name__,
+            [str(x) for x in self],
+            None if self._scheme is None else
+            '{}.{}'.format(self._scheme.__module__, self._scheme.__name__))
+
+    def __contains__(self, version):
+        try:
+            key = self._query_key(version)
+        except (TypeError, ValueError):
+            return False
+        return key in self._versions
+
+    def _from_iterable(self, versions):
+        return type(self)(versions, self._scheme)
+
+    def add(self, version):
+        """Add the version if an equal one is not already in the set."""
+        key, version = self._key(version)
+        if key not in self._versions:
+            self._insert(key)
+            self._versions[key] = version
+
+    def discard(self, version):
+        """Remove the version if it is in the set."""
+        try:
+            key = self._query_key(version)
+        except (TypeError, ValueError):
+            return
+        if key in self._versions:
+            self._remove(key)
+            del self._versions[key]
+
+    def remove(self, version):
+        """Remove the version; `KeyError` is raised if it is not in the set."""
+        if version not in self:
+            raise KeyError(version)
+        self.discard(version)
+
+    def clear(self):
+        """Remove all of the versions."""
+        self._clear()
+
+    def update(self, *others):
+        """Add the versions of each of the iterables.
+
+        The versions of another `VersionSet` of the same scheme are merged in
+        linear time, and the versions of other iterables are sorted first.
+
+        """
+        for versions in others:
+            self._merge(self._new(self._keyed(versions)))
+
+    def copy(self):
+        """Return a shallow copy of the set."""
+        return type(self)(self, self._scheme)
+
+
+__all__.append('VersionSortedDict')
+class VersionSortedDict(_SortedVersions, MutableMapping):
+
+    """A mutable mapping of versions of one scheme to values kept in order.
+
+    The keys are versions, in ascending order, and are given just like the
+    versions of a `VersionSet`.  Setting the value of a version that is equal
+    to one already in the mapping keeps that one.
+
+    """
+
+    def __init__(self, items=(), scheme=None):
+        super().__init__(scheme)
+        self._values = {}  # key -> value
+        self.update(items)
+
+    def __repr__(self):
+        return "{}.{}({!r}, scheme={})".format(
+            type(self).__module__, type(self).__name__,
+            [(str(k), v) for k, v in self.items()],
+            None if self._scheme is None else
+            '{}.{}'.format(self._scheme.__module__, self._scheme.__name__))
+
+    def __getitem__(self, version):
+        try:
+            key = self._query_key(version)
+        except (TypeError, ValueError):
+            raise KeyError(version)
+        try:
+            return self._values[key]
+        except KeyError:
+            raise KeyError(version)
+
+    def __setitem__(self, version, value):
+        key, version = self._key(version)
+        if key not in self._versions:
+            self._insert(key)
+            self._versions[key] = version
+        self._values[key] = value
+
+    def __delitem__(self, version):
+        try:
+            key = self._query_key(version)
+        except (TypeError, ValueError):
+            raise KeyError(version)
+        if key not in self._versions:
+            raise KeyError(version)
+        self._remove(key)
+        del self._versions[key]
+        del self._values[key]
+
+    def __contains__(self, version):
+        try:
+            return self._query_key(version) in self._versions
+        except (TypeError, ValueError):
+            return False
+
+    def __eq__(self, other):
+        if not isinstance(other, VersionSortedDict):
+            return NotImplemented
+        return self._scheme is other._scheme and self._values == other._values
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def clear(self):
+        """Remove all of the items."""
+        self._clear()
+        self._values.clear()
+
+    def update(self, *others, **kwargs):
+        """Set the items of the mappings or iterables of pairs.
+
+        The items of another `VersionSortedDict` of the same scheme are merged
+        in linear time, and other items are sorted first.
+
+        """
+        if kwargs:
+            raise TypeError(
+                "Versions cannot be given as keyword arguments.")
+        for items in others:
+            if isinstance(items, VersionSortedDict):
+                keyed = list(self._keyed(items))
+                values = [items._values[k] for k in items._keys()]
+            else:
+                if isinstance(items, Mapping):
+                    items = items.items()
+                keyed, values = [], []
+                for version, value in items:
+                    keyed.append(self._key(version))
+                    values.append(value)
+            try:
+                self._merge(self._new(keyed))
+            finally:
+                self._values.update((k, v) for (k, _), v in zip(keyed, values)
+                                    if k in self._versions)
+
+    def copy(self):
+        """Return a shallow copy of the mapping."""
+        return type(self)(self, self._scheme)
@@ -15,7 +15,7 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from verschemes.future import *
 
-from verschemes import SegmentDefinition, Version
+from verschemes import SegmentDefinition, Version, register_converter
 
 
 __all__ = []
@@ -28,12 +28,64 @@ SEGMENTS = (
     SNAPSHOT,
 ) = tuple(range(4))
 
+_CLASSIFIED = slice(PATCH, SNAPSHOT + 1)  # the values classified
+
 __all__.append('PRE_FULL_RELEASE')
 PRE_FULL_RELEASE = 99
 
 __all__.append('BRANCH_START_SNAPSHOT')
 BRANCH_START_SNAPSHOT = 900
 
+__all__.extend(['CLASSIFICATIONS', 'IS_RELEASE', 'IS_FULL_RELEASE',
+                'IS_PRE_FULL_RELEASE', 'IS_BUGFIX_RELEASE', 'IS_DEVELOPMENT',
+                'IS_BRANCH_START', 'IS_RELEASE_CANDIDATE'])
+CLASSIFICATIONS = (
+    IS_RELEASE,
+    IS_FULL_RELEASE,
+    IS_PRE_FULL_RELEASE,
+    IS_BUGFIX_RELEASE,
+    IS_DEVELOPMENT,
+    IS_BRANCH_START,
+    IS_RELEASE_CANDIDATE,
+) = tuple(1 << x for x in range(7))
+
+
+def _classify(patch, snapshot):
+    """Return the `CLASSIFICATIONS` flags for the cooked values."""
+    if snapshot == 0:
+        flags = IS_RELEASE | (IS_FULL_RELEASE if patch == 0 else
+                              IS_BUGFIX_RELEASE)
+    elif snapshot < BRANCH_START_SNAPSHOT:
+        flags = IS_DEVELOPMENT if snapshot > 0 else 0
+    else:
+        flags = (IS_BRANCH_START if snapshot == BRANCH_START_SNAPSHOT else
+                 IS_RELEASE_CANDIDATE)
+    if patch == PRE_FULL_RELEASE:
+        flags |= IS_PRE_FULL_RELEASE
+    return flags
+
+
+_CLASSIFICATION_CACHE_SIZE = 1024
+
+# (raw patch, raw snapshot) -> flags.  Versions are tuples without instance
+# storage, so the classification of each distinct pair is computed once, when
+# the first version with it is constructed, and looked up afterwards.
+_classifications = {}
+
+
+def _classification(values):
+    """Return the flags of the raw (patch, snapshot) values, computed once."""
+    try:
+        return _classifications[values]
+    except KeyError:
+        pass
+    if len(_classifications) >= _CLASSIFICATION_CACHE_SIZE:
+        _classifications.clear()
+    patch, snapshot = values
+    flags = _classifications[values] = _classify(
+        0 if patch is None else patch, 0 if snapshot is None else snapshot)
+    return flags
+
 
 __all__.append('XorgVersion')
 class XorgVersion(Version):
@@ -59,52 +111,69 @@ class XorgVersion(Version):
 
     def validate(self):
         """Override for version scheme validations."""
-        if self.is_pre_full_release:
-            if self.is_release:
+        flags = self.classification
+        if flags & IS_PRE_FULL_RELEASE:
+            if flags & IS_RELEASE:
                 raise ValueError(
                     "Pre-full-release versions (patch = {}) must have a "
                     "snapshot > 0."
                     .format(PRE_FULL_RELEASE))
-        elif self.is_development:
+        elif flags & IS_DEVELOPMENT:
             raise ValueError(
                 "Development versions (0 < snapshot < {}) are only valid for "
                 "development branches (patch = {})."
                 .format(BRANCH_START_SNAPSHOT, PRE_FULL_RELEASE))
 
+    @property
+    def classification(self):
+        """The bitwise OR of the `CLASSIFICATIONS` flags of the version.
+
+        This is computed from the raw values in one step when the version is
+        constructed (and shared by the versions with the same patch and
+        snapshot values), and the other classification properties are derived
+        from it.
+
+        """
+        values = tuple.__getitem__(self, _CLASSIFIED)
+        try:
+            return _classifications[values]
+        except KeyError:
+            return _classification(values)
+
     @property
     def is_release(self):
         """Whether the version identifies a release."""
-        return (self[SNAPSHOT] or 0) == 0
+        return bool(self.classification & IS_RELEASE)
 
     @property
     def is_full_release(self):
         """Whether the version identifies a full release."""
-        return self.is_release and self[PATCH] == 0
+        return bool(self.classification & IS_FULL_RELEASE)
 
     @property
     def is_pre_full_release(self):
         """Whether the version is between feature freeze and a full release."""
-        return self[PATCH] == PRE_FULL_RELEASE
+        return bool(self.classification & IS_PRE_FULL_RELEASE)
 
     @property
     def is_bugfix_release(self):
         """Whether the version identifies a bug-fix release."""
-        return self.is_release and not self.is_full_release
+        return bool(self.classification & IS_BUGFIX_RELEASE)
 
     @property
     def is_development(self):
         """Whether the version is a non-release prior to feature freeze."""
-        return 0 < self[SNAPSHOT] < BRANCH_START_SNAPSHOT
+        return bool(self.classification & IS_DEVELOPMENT)
 
     @property
     def is_branch_start(self):
         """Whether the version is the start of a release branch."""
-        return self[SNAPSHOT] == BRANCH_START_SNAPSHOT
+        return bool(self.classification & IS_BRANCH_START)
 
     @property
     def is_release_candidate(self):
         """Whether the version identifies a release candidate."""
-        return self[SNAPSHOT] > BRANCH_START_SNAPSHOT
+        return bool(self.classification & IS_RELEASE_CANDIDATE)
 
     @property
     def release_candidate(self):
@@ -115,13 +184,62 @@ class XorgVersion(Version):
     @property
     def stable_branch_suffix(self):
         """The suffix of the stable branch name if not in development."""
-        if self.is_development:
-            return
-        major, minor = self[MAJOR], self[MINOR]
-        if self.is_pre_full_release:
-            if minor == PRE_FULL_RELEASE:
-                minor = 0
-                major += 1
-            else:
-                minor += 1
-        return '-{}.{}-branch'.format(major, minor)
+        return _stable_branch_suffix(
+            tuple.__getitem__(self, MAJOR), tuple.__getitem__(self, MINOR),
+            self.classification)
+
+
+def _stable_branch_suffix(major, minor, flags):
+    if flags & IS_DEVELOPMENT:
+        return
+    if minor is None:
+        minor = 0
+    if flags & IS_PRE_FULL_RELEASE:
+        if minor == PRE_FULL_RELEASE:
+            minor = 0
+            major += 1
+        else:
+            minor += 1
+    return '-{}.{}-branch'.format(major, minor)
+
+
+__all__.append('classify_many')
+def classify_many(versions):
+    """Return a list of the `~XorgVersion.classification` of each version."""
+    return [x.classification for x in versions]
+
+
+__all__.append('select')
+def select(versions, flags, exclude=0):
+    """Return a list of the versions with all of the given classifications.
+
+    Versions having any of the `exclude` classifications are left out.  For
+    example, ``select(versions, IS_RELEASE, exclude=IS_FULL_RELEASE)`` returns
+    the bug-fix releases.
+
+    """
+    return [x for x in versions
+            if x.classification & (flags | exclude) == flags]
+
+
+__all__.append('group_by_stable_branch')
+def group_by_stable_branch(versions):
+    """Return a dict of lists of the versions by their stable branch suffix.
+
+    Development versions, which have no stable branch, are under `None`.
+
+    """
+    result = {}
+    for version in versions:
+        suffix = version.stable_branch_suffix
+        try:
+            result[suffix].append(version)
+        except KeyError:
+            result[suffix] = [version]
+    return result
+
+
+@register_converter(XorgVersion, Version)
+def _to_version(version):
+    """Convert the version to a `~verschemes.Version` of its cooked values."""
+    return Version(*version[:])
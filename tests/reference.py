@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""Reference implementation of the verschemes semantics
+
+This restates the generic parsing, validation, rendering, and ordering of
+versions as plainly as possible, without any of the package's caches, lazy
+evaluation, or other fast paths, so that those can be checked against it (see
+test_differential).  Only the declarative parts of a scheme (its segment
+definitions and regular expression pattern) are used, and the intersegment
+rules of the shipped schemes are restated here.
+
+"""
+
+import re
+
+from verschemes import DEFAULT_SEGMENT_DEFINITION, DEFAULT_SEGMENT_SEPARATOR
+from verschemes import pep440, xorg
+
+
+def definitions(scheme, count):
+    """Return the segment definitions of a version of the scheme."""
+    return scheme.SEGMENT_DEFINITIONS or (DEFAULT_SEGMENT_DEFINITION,) * count
+
+
+def validate_value(definition, string):
+    """Return the raw value of the segment string."""
+    if string is None:
+        if not definition.optional and definition.default is None:
+            raise ValueError("required segment")
+        return None
+    fields = definition.fields
+    match = re.match('^' + ''.join('(?P<{}>{})'.format(x.name, x.re_pattern)
+                                   for x in fields) + '$', string)
+    if not match:
+        raise ValueError("invalid segment {!r}".format(string))
+    values = []
+    for field in fields:
+        try:
+            values.append(field.type(match.group(field.name)))
+        except (TypeError, ValueError):
+            values.append(None)
+    return values[0] if len(fields) == 1 else tuple(values)
+
+
+def _validate_xorg(raw):
+    patch = 0 if raw[xorg.PATCH] is None else raw[xorg.PATCH]
+    snapshot = 0 if raw[xorg.SNAPSHOT] is None else raw[xorg.SNAPSHOT]
+    if patch == xorg.PRE_FULL_RELEASE:
+        if snapshot == 0:
+            raise ValueError("pre-full release without a snapshot")
+    elif 0 < snapshot < xorg.BRANCH_START_SNAPSHOT:
+        raise ValueError("development version outside a development branch")
+
+
+VALIDATORS = {
+    xorg.XorgVersion: _validate_xorg,
+}
+"""The intersegment validation of the shipped schemes."""
+
+
+def parse(scheme, string):
+    """Return the tuple of raw segment values of the version string.
+
+    `ValueError` is raised if the string is not a version of the scheme.
+
+    """
+    if scheme.SEGMENT_DEFINITIONS:
+        match = re.match(scheme.REGULAR_EXPRESSION.pattern, string)
+        if not match:
+            raise ValueError("no match")
+        strings = match.groups()
+    else:
+        strings = string.split(DEFAULT_SEGMENT_SEPARATOR)
+    raw = tuple(validate_value(d, s) for d, s in
+                zip(definitions(scheme, len(strings)), strings))
+    for cls in scheme.__mro__:
+        if cls in VALIDATORS:
+            VALIDATORS[cls](raw)
+            break
+    return raw
+
+
+def cooked(scheme, raw):
+    """Return the cooked segment values (i.e., with defaults applied)."""
+    return tuple(d.default if v is None else v
+                 for d, v in zip(definitions(scheme, len(raw)), raw))
+
+
+def render(scheme, raw):
+    """Return the normal form (`str`) of the version."""
+    scope = range(len(raw))
+    always = ()
+    if issubclass(scheme, pep440.Pep440Version):
+        scope = [x for x in pep440.RELEASE_SEGMENTS if x != pep440.EPOCH]
+        always = (pep440.RELEASE1,)
+    result = []
+    for i, (definition, value) in enumerate(
+            zip(definitions(scheme, len(raw)), raw)):
+        value_or_default = definition.default if value is None else value
+        if definition.optional and value_or_default is None:
+            continue
+        followed = i in scope and any(raw[j] is not None
+                                      for j in range(i, max(scope) + 1))
+        if (i not in always and definition.optional and value is None and
+                not followed):
+            continue
+        if result:
+            result.append(definition.separator)
+        result.append(definition.render(value_or_default))
+    return ''.join(result)
+
+
+def compare(scheme, raw1, raw2):
+    """Return -1, 0, or 1 as the first version is less, equal, or greater.
+
+    `TypeError` is raised if the versions cannot be ordered.
+
+    """
+    key1, key2 = cooked(scheme, raw1), cooked(scheme, raw2)
+    return (key1 > key2) - (key1 < key2)
+
+
+def equal(scheme, raw1, raw2):
+    """Return whether the versions are equal (which never raises)."""
+    return cooked(scheme, raw1) == cooked(scheme, raw2)
+
+
+def sort(scheme, raws):
+    """Return the raw values sorted by their versions (stably)."""
+    return sorted(raws, key=lambda x: cooked(scheme, x))
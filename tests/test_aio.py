@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""asyncio verschemes tests"""
+
+import gc
+import sys
+import unittest
+
+from verschemes import InternPool, Version
+from verschemes.pep440 import Pep440Version
+from verschemes.postgresql import PgVersion
+
+if sys.version_info >= (3, 7):
+    import asyncio
+    import concurrent.futures
+    from verschemes import aio
+
+
+class AsyncStrings(object):
+
+    """An asynchronous iterable of strings (without the async syntax)."""
+
+    def __init__(self, strings):
+        self._strings = iter(strings)
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        future = asyncio.get_event_loop().create_future()
+        try:
+            future.set_result(next(self._strings))
+        except StopIteration:
+            future.set_exception(StopAsyncIteration())
+        return future
+
+
+@unittest.skipIf(sys.version_info < (3, 7), "requires Python 3.7")
+class AsyncParseTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.strings = ['1.{}.{}'.format(i % 13, i % 7) for i in range(2500)]
+        self.expected = [Version(x) for x in self.strings]
+
+    def tearDown(self):
+        self.loop.close()
+
+    def run_until_complete(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def collect(self, iterator):
+        result = []
+        while True:
+            try:
+                result.append(self.run_until_complete(iterator.__anext__()))
+            except StopAsyncIteration:
+                return result
+
+    def test_aparse_many(self):
+        self.assertEqual(self.expected, self.collect(
+            aio.aparse_many(self.strings, chunk_size=300)))
+        self.assertEqual(self.expected, self.collect(
+            aio.aparse_many(AsyncStrings(self.strings), offload_size=10000)))
+
+    def test_aparse_batch(self):
+        for offload_size in (1, 10000):
+            versions = self.run_until_complete(aio.aparse_batch(
+                self.strings, chunk_size=700, offload_size=offload_size))
+            self.assertEqual(self.expected, versions)
+        self.assertEqual([], self.run_until_complete(aio.aparse_batch([])))
+
+    def test_scheme(self):
+        versions = self.run_until_complete(aio.aparse_batch(
+            ['1.0rc1', '2!1.0.post3'], Pep440Version, offload_size=1))
+        self.assertEqual([Pep440Version('1.0rc1'),
+                          Pep440Version('2!1.0.post3')], versions)
+        self.assertIs(Pep440Version, type(versions[0]))
+
+    def test_errors(self):
+        strings = ['1.2', 'bogus', '1.3']
+        self.assertRaises(ValueError, self.run_until_complete,
+                          aio.aparse_batch(strings, offload_size=1))
+        self.assertRaises(ValueError, self.collect,
+                          aio.aparse_many(strings))
+        self.assertEqual(
+            [Version('1.2'), None, Version('1.3')],
+            self.run_until_complete(aio.aparse_batch(strings,
+                                                     errors='ignore')))
+        self.assertEqual(
+            [Version('1.2'), None, Version('1.3')],
+            self.collect(aio.aparse_many(AsyncStrings(strings),
+                                         offload_size=1, errors='ignore')))
+        self.assertRaises(ValueError, self.run_until_complete,
+                          aio.aparse_batch(strings, errors='bogus'))
+
+    def test_errors_retrieved(self):
+        # The other chunks' futures must not be left with exceptions that are
+        # never retrieved.
+        contexts = []
+        self.loop.set_exception_handler(lambda loop, x: contexts.append(x))
+        with concurrent.futures.ThreadPoolExecutor(2) as executor:
+            self.assertRaises(ValueError, self.run_until_complete,
+                              aio.aparse_batch(['bogus'] * 20, Version,
+                                               executor, chunk_size=1,
+                                               offload_size=1))
+        self.run_until_complete(asyncio.sleep(0))
+        gc.collect()
+        self.assertEqual([], contexts)
+
+    def test_process_executor(self):
+        strings = ['1.0rc1', '1.0', '2!3.0a2.dev4', 'bogus'] * 50
+        with concurrent.futures.ProcessPoolExecutor(2) as executor:
+            versions = self.run_until_complete(aio.aparse_batch(
+                strings, Pep440Version, executor, chunk_size=60,
+                offload_size=1, errors='ignore'))
+        self.assertEqual([None if x == 'bogus' else Pep440Version(x)
+                          for x in strings], versions)
+        self.assertEqual(type(Pep440Version('1.0rc1').pre_release),
+                         type(versions[0].pre_release))
+        self.assertEqual('2!3.0a2.dev4', str(versions[2]))
+
+    def test_process_executor_intern_pool(self):
+        class Pooled(PgVersion):
+            INTERN_POOL = InternPool()
+        version = aio._from_raw(Pooled, (9, 3, 4))
+        self.assertIs(version, Pooled('9.3.4'))
+
+    def test_yields_control(self):
+        ticks = []
+
+        def tick():
+            ticks.append(self.loop.call_soon(tick))
+
+        self.loop.call_soon(tick)
+        versions = self.run_until_complete(aio.aparse_batch(
+            self.strings, chunk_size=100, offload_size=10000))
+        ticks[-1].cancel()
+        self.assertEqual(self.expected, versions)
+        self.assertGreaterEqual(len(ticks), 25)
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""corpus verschemes tests"""
+
+import itertools
+import random
+import re
+import types
+import unittest
+
+from verschemes import SegmentDefinition, Version
+from verschemes.corpus import generate, long_tailed, sample_pattern
+from verschemes.pep440 import Pep440Version
+from verschemes.postgresql import PgVersion
+from verschemes.python import PythonVersion
+from verschemes.xorg import XorgVersion
+
+
+SCHEMES = [Version, PythonVersion, Pep440Version, PgVersion, XorgVersion]
+
+
+def accepts(scheme, string):
+    try:
+        scheme(string)
+    except ValueError:
+        return False
+    return True
+
+
+class CorpusTestCase(unittest.TestCase):
+
+    def test_deterministic(self):
+        for scheme in SCHEMES:
+            self.assertEqual(list(generate(scheme, 50, seed=3,
+                                           invalid_ratio=0.3)),
+                             list(generate(scheme, 50, seed=3,
+                                           invalid_ratio=0.3)))
+        self.assertNotEqual(list(generate(Version, 50, seed=3)),
+                            list(generate(Version, 50, seed=4)))
+
+    def test_streaming(self):
+        strings = generate(PgVersion, seed=1)
+        self.assertIsInstance(strings, types.GeneratorType)
+        self.assertEqual(1000, len(list(itertools.islice(strings, 1000))))
+        self.assertEqual(7, len(list(generate(PgVersion, 7, seed=1))))
+
+    def test_valid(self):
+        for scheme in SCHEMES:
+            for string in generate(scheme, 300, seed=5):
+                self.assertTrue(accepts(scheme, string),
+                                "{!r} {!r}".format(scheme, string))
+
+    def test_invalid_ratio(self):
+        for scheme in SCHEMES:
+            strings = list(generate(scheme, 400, seed=6, invalid_ratio=0.25))
+            invalid = [x for x in strings if not accepts(scheme, x)]
+            self.assertTrue(60 < len(invalid) < 140,
+                            "{!r} {}".format(scheme, len(invalid)))
+
+    def test_all_invalid(self):
+        for string in generate(XorgVersion, 100, seed=7, invalid_ratio=1):
+            self.assertFalse(accepts(XorgVersion, string))
+
+    def test_separator_variants(self):
+        strings = list(generate(Pep440Version, 2000, seed=8))
+        self.assertTrue(any('-dev' in x for x in strings))
+        self.assertTrue(any('-post' in x for x in strings))
+        self.assertTrue(any(re.search('[0-9]post', x) for x in strings))
+        self.assertTrue(any(re.search('(?i)alpha|beta|rc', x)
+                            for x in strings))
+
+    def test_default_overrides(self):
+        versions = [XorgVersion(x)
+                    for x in generate(XorgVersion, 500, seed=9)]
+        self.assertTrue(any(x.is_release_candidate for x in versions))
+        self.assertTrue(any(x.is_development for x in versions))
+        self.assertTrue(all(6 <= x.major1 <= 17
+                            for x in map(PgVersion,
+                                         generate(PgVersion, 200, seed=9))))
+
+    def test_overrides(self):
+        class Scheme(Version):
+            SEGMENT_DEFINITIONS = (
+                SegmentDefinition(name='major'),
+                SegmentDefinition(name='minor', optional=True),
+            )
+        strings = list(generate(Scheme, 100, seed=10,
+                                overrides={'major': lambda r: '7',
+                                           1: lambda r: None}))
+        self.assertEqual(['7'] * 100, strings)
+
+    def test_sample_pattern(self):
+        r = random.Random(0)
+        for pattern in ['[0-9]+', '[aAbB]|[rR][cC]', '(a|bc){2,3}x?',
+                        r'\d\w[^a-z]', '(?P<x>[ab])-(?P=x)']:
+            regex = re.compile('(?:' + pattern + r')\Z')
+            for _ in range(50):
+                self.assertTrue(regex.match(sample_pattern(pattern, r)))
+
+    def test_long_tailed(self):
+        r = random.Random(0)
+        numbers = [long_tailed(r) for _ in range(2000)]
+        self.assertTrue(all(x >= 0 for x in numbers))
+        self.assertGreater(numbers.count(0), 500)
+        self.assertGreater(max(numbers), 100)
+        self.assertTrue(all(x >= 3 for x in (long_tailed(r, low=3)
+                                             for _ in range(100))))
@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+"""differential verschemes tests
+
+Every optimized code path is run against the plain reference implementation
+(see the reference module) on generated corpora of every shipped scheme, and
+the parse results, error outcomes, renders, and orderings must be identical.
+A failing input is shrunk to a minimal case before it is reported.
+
+"""
+
+import io
+import itertools
+import operator
+import random
+import unittest
+
+from verschemes import (InternPool, Version, render_many, sort_versions)
+from verschemes.corpus import generate
+from verschemes.extsort import sort_lines
+from verschemes.pep440 import Pep440Version
+from verschemes.postgresql import PgMajorVersion, PgVersion
+from verschemes.python import (PythonMajorVersion, PythonMicroVersion,
+                               PythonMinorVersion, PythonVersion)
+from verschemes.registry import DEFAULT_REGISTRY
+from verschemes.xorg import XorgVersion
+
+from . import reference
+
+
+SCHEMES = [Version, PythonMajorVersion, PythonMinorVersion,
+           PythonMicroVersion, PythonVersion, Pep440Version, PgMajorVersion,
+           PgVersion, XorgVersion]
+
+COUNT = 300
+"""The number of strings generated for each scheme."""
+
+INVALID = {
+    XorgVersion: ['1.2.3.5', '1.2.99', '7.7.0.800', '1.13.99.0'],
+}
+"""Strings matching the scheme's regex that fail intersegment validation."""
+
+OPERATORS = [operator.eq, operator.ne, operator.lt, operator.le, operator.gt,
+             operator.ge]
+
+
+def raw(version):
+    return tuple(tuple.__iter__(version))
+
+
+def outcome(function, *args):
+    """Return ('ok', result) or ('error', exception type) of the call."""
+    try:
+        return 'ok', function(*args)
+    except (TypeError, ValueError) as e:
+        return 'error', type(e)
+
+
+def sign(number):
+    return (number > 0) - (number < 0)
+
+
+def _string_candidates(string):
+    for size in sorted(set([len(string) // 2, 2, 1]) - set([0]),
+                       reverse=True):
+        for i in range(0, len(string) - size + 1):
+            yield string[:i] + string[i + size:]
+    for i, character in enumerate(string):
+        if character.isdigit() and character not in '01':
+            yield string[:i] + '1' + string[i + 1:]
+        elif character.isalpha() and character != 'a':
+            yield string[:i] + 'a' + string[i + 1:]
+
+
+def shrink_string(string, fails):
+    """Return a minimal substring-like variant of the string that still fails.
+
+    Characters are removed and simplified greedily for as long as `fails`
+    (a function of a string) returns true for the result.
+
+    """
+    changed = True
+    while changed:
+        changed = False
+        for candidate in _string_candidates(string):
+            if candidate != string and fails(candidate):
+                string = candidate
+                changed = True
+                break
+    return string
+
+
+def shrink_list(items, fails):
+    """Return a minimal sublist of the strings that still fails.
+
+    Items are removed greedily, and then each remaining one is shrunk with
+    `shrink_string`, for as long as `fails` (a function of a list of strings)
+    returns true for the result.
+
+    """
+    items = list(items)
+    size = len(items) // 2
+    while size:
+        i = 0
+        while i < len(items):
+            candidate = items[:i] + items[i + size:]
+            if candidate and fails(candidate):
+                items = candidate
+            else:
+                i += size
+        size //= 2
+    for i in range(len(items)):
+        items[i] = shrink_string(
+            items[i], lambda x: fails(items[:i] + [x] + items[i + 1:]))
+    return items
+
+
+def sortable(scheme, raws):
+    """Return the largest group of the raw values that can be ordered."""
+    groups = {}
+    for values in raws:
+        key = tuple(x is None for x in reference.cooked(scheme, values))
+        groups.setdefault(key, []).append(values)
+    return max(groups.values(), key=len) if groups else []
+
+
+class DifferentialTestCase(unittest.TestCase):
+
+    def corpus(self, scheme, seed=0):
+        return (list(generate(scheme, COUNT, seed=seed, invalid_ratio=0.3)) +
+                INVALID.get(scheme, []))
+
+    def check(self, scheme, items, divergence):
+        """Fail with the shrunk input if `divergence` finds a difference.
+
+        `divergence` is a function of the scheme and a string (or list of
+        strings if `items` is a list of lists) that returns a description of
+        the difference, or `None` if there is none.
+
+        """
+        for item in items:
+            message = divergence(scheme, item)
+            if message is None:
+                continue
+            fails = lambda x: divergence(scheme, x) is not None
+            minimal = (shrink_list(item, fails) if isinstance(item, list) else
+                       shrink_string(item, fails))
+            self.fail("{}: {} (minimal input {!r})"
+                      .format(scheme.__name__, divergence(scheme, minimal),
+                              minimal))
+
+    def for_each_scheme(self, divergence, lists=False):
+        for scheme in SCHEMES:
+            strings = self.corpus(scheme)
+            if lists:
+                r = random.Random(scheme.__name__)
+                strings = [r.sample(strings, 40) + INVALID.get(scheme, [])
+                           for _ in range(5)]
+            self.check(scheme, strings, divergence)
+
+    def test_parse(self):
+        def divergence(scheme, string):
+            expected = outcome(reference.parse, scheme, string)
+            engines = [
+                ('constructor', lambda: raw(scheme(string))),
+                ('lazy', lambda: raw(scheme.lazy(string).materialize())),
+                ('bytes', lambda: raw(scheme(string.encode('utf-8')))),
+                ('memoryview',
+                 lambda: raw(scheme(memoryview(string.encode('utf-8'))))),
+                ('parse_many',
+                 lambda: raw(scheme.parse_many([bytearray(
+                     string.encode('utf-8'))])[0])),
+            ]
+            for name, engine in engines:
+                actual = outcome(engine)
+                if actual != expected:
+                    return "{} gave {!r} instead of {!r}".format(
+                        name, actual, expected)
+        self.for_each_scheme(divergence)
+
+    def test_parse_interned(self):
+        def divergence(scheme, string):
+            expected = outcome(reference.parse, scheme, string)
+            original = vars(scheme).get('INTERN_POOL')
+            scheme.INTERN_POOL = InternPool()
+            try:
+                actual = outcome(lambda: raw(scheme(string)))
+                again = outcome(lambda: raw(scheme(string)))
+            finally:
+                if original is None and scheme is not Version:
+                    del scheme.INTERN_POOL
+                else:
+                    scheme.INTERN_POOL = original
+            if not actual == again == expected:
+                return "interned {!r} and {!r} instead of {!r}".format(
+                    actual, again, expected)
+        self.for_each_scheme(divergence)
+
+    def test_detect(self):
+        def divergence(scheme, string):
+            expected = [x for x in DEFAULT_REGISTRY
+                        if outcome(reference.parse, x, string)[0] == 'ok']
+            actual = DEFAULT_REGISTRY.detect(string)
+            if actual != expected:
+                return "detected {!r} instead of {!r}".format(actual,
+                                                              expected)
+        self.for_each_scheme(divergence)
+
+    def test_project(self):
+        projections = [(PythonVersion, PythonMajorVersion),
+                       (PythonVersion, PythonMinorVersion),
+                       (PythonVersion, PythonMicroVersion),
+                       (PythonMicroVersion, PythonMinorVersion),
+                       (PgVersion, PgMajorVersion)]
+        for scheme, target in projections:
+            def divergence(scheme, string, target=target):
+                try:
+                    version = scheme(string)
+                except ValueError:
+                    return
+                count = len(target.SEGMENT_DEFINITIONS)
+                expected = outcome(lambda: raw(target(*raw(version)[:count])))
+                for _ in range(2):  # uncached and cached
+                    actual = outcome(lambda: raw(version.project(target)))
+                    if actual != expected:
+                        return "projected to {!r} instead of {!r}".format(
+                            actual, expected)
+            self.check(scheme, self.corpus(scheme), divergence)
+
+    def test_render(self):
+        def divergence(scheme, string):
+            try:
+                values = reference.parse(scheme, string)
+            except ValueError:
+                return
+            expected = reference.render(scheme, values)
+            engines = [
+                ('str', lambda: str(scheme(string))),
+                ('lazy', lambda: str(scheme.lazy(string))),
+                ('render', lambda: scheme(string).render()),
+            ]
+            for name, engine in engines:
+                actual = outcome(engine)
+                if actual != ('ok', expected):
+                    return "{} gave {!r} instead of {!r}".format(
+                        name, actual, expected)
+        self.for_each_scheme(divergence)
+
+    def test_render_many(self):
+        def divergence(scheme, strings):
+            raws = [outcome(reference.parse, scheme, x) for x in strings]
+            valid = [s for s, (status, _) in zip(strings, raws)
+                     if status == 'ok']
+            expected = '\n'.join(reference.render(scheme, v)
+                                 for status, v in raws if status == 'ok')
+            out = io.StringIO()
+            render_many((scheme(x) for x in valid), out, buffer_size=16)
+            if out.getvalue() != expected:
+                return "rendered {!r} instead of {!r}".format(out.getvalue(),
+                                                              expected)
+        self.for_each_scheme(divergence, lists=True)
+
+    def test_compare(self):
+        def divergence(scheme, strings):
+            parsed = [outcome(reference.parse, scheme, x) for x in strings]
+            pairs = [(s, v) for s, (status, v) in zip(strings, parsed)
+                     if status == 'ok']
+            for (string1, raw1), (string2, raw2) in itertools.combinations(
+                    pairs, 2):
+                expected = outcome(reference.compare, scheme, raw1, raw2)
+                version1, version2 = scheme(string1), scheme(string2)
+                lazy1, lazy2 = scheme.lazy(string1), scheme.lazy(string2)
+                engines = [
+                    ('compare_strings', sign, lambda: scheme.compare_strings(
+                        string1, string2)),
+                    ('lazy', sign, lambda: lazy1._compare(lazy2)),
+                ]
+                for op in OPERATORS:
+                    check = lambda x, op=op: op(x, 0)
+                    engines.extend([
+                        (op.__name__, check,
+                         lambda op=op: op(version1, version2)),
+                        (op.__name__ + ' string', check,
+                         lambda op=op: op(version1, string2)),
+                    ])
+                equal = reference.equal(scheme, raw1, raw2)
+                for name, expect, engine in engines:
+                    actual = outcome(engine)
+                    if name.split()[0] in ('eq', 'ne'):
+                        wanted = 'ok', (equal if name.startswith('eq') else
+                                        not equal)
+                    elif expected[0] == 'ok':
+                        wanted = 'ok', expect(expected[1])
+                        if actual[0] == 'ok' and name in ('compare_strings',
+                                                          'lazy'):
+                            actual = 'ok', sign(actual[1])
+                    else:
+                        wanted = expected
+                    if actual != wanted:
+                        return "{} of {!r} and {!r} gave {!r} not {!r}".format(
+                            name, string1, string2, actual, wanted)
+            invalid = [x for x, (status, _) in zip(strings, parsed)
+                       if status != 'ok']
+            for string1, (string2, _) in itertools.product(invalid, pairs):
+                for args in ((string1, string2), (string2, string1)):
+                    actual = outcome(scheme.compare_strings, *args)
+                    if actual != ('error', ValueError):
+                        return ("compare_strings of {!r} and {!r} gave {!r}"
+                                .format(args[0], args[1], actual))
+        self.for_each_scheme(divergence, lists=True)
+
+    def test_sort(self):
+        def divergence(scheme, strings):
+            by_raw = {}
+            for string in strings:
+                status, values = outcome(reference.parse, scheme, string)
+                if status == 'ok':
+                    by_raw.setdefault(values, string)
+            raws = sortable(scheme, list(by_raw))
+            valid = [by_raw[x] for x in raws]
+            expected = [reference.render(scheme, x)
+                        for x in reference.sort(scheme, raws)]
+            versions = [scheme(x) for x in valid]
+
+            def external():
+                out = io.StringIO()
+                sort_lines(valid, out, scheme=scheme, chunk_size=7)
+                return out.getvalue().splitlines()
+            engines = [
+                ('sorted', lambda: [str(x) for x in sorted(versions)]),
+                ('sort_versions',
+                 lambda: [str(x) for x in sort_versions(versions)]),
+                ('sort_strings', lambda: [str(scheme(x)) for x in
+                                          scheme.sort_strings(valid)]),
+                ('sort_lines', external),
+            ]
+            for name, engine in engines:
+                actual = outcome(engine)
+                if actual != ('ok', expected):
+                    return "{} gave {!r} instead of {!r}".format(
+                        name, actual, expected)
+            if any(outcome(reference.parse, scheme, x)[0] != 'ok'
+                   for x in strings):
+                actual = outcome(scheme.sort_strings, strings)
+                if actual != ('error', ValueError):
+                    return ("sort_strings with invalid strings gave {!r}"
+                            .format(actual))
+        self.for_each_scheme(divergence, lists=True)
+
+
+class ShrinkTestCase(unittest.TestCase):
+
+    def test_shrink_string(self):
+        self.assertEqual('1', shrink_string('12.345.9', lambda x: '1' in x))
+        self.assertEqual('.a', shrink_string('7.8rc2',
+                                             lambda x: '.' in x and
+                                             any(c.isalpha() for c in x)))
+
+    def test_shrink_list(self):
+        self.assertEqual(['1', '1'], shrink_list(
+            ['3.0', '9.9', '4', '7.7'],
+            lambda x: len([y for y in x if y[:1].isdigit()]) >= 2))
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""External sort verschemes tests"""
+
+import io
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from verschemes import Version, sort_versions
+from verschemes.__main__ import main
+from verschemes.extsort import sort_file, sort_lines
+from verschemes.pep440 import Pep440Version
+from verschemes.postgresql import PgVersion
+
+
+class ExternalSortTestCase(unittest.TestCase):
+
+    def setUp(self):
+        r = random.Random(0)
+        self.strings = ['{}.{}.{}'.format(r.randint(7, 9), r.randint(0, 4),
+                                          r.randint(0, 9))
+                        for _ in range(200)]
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def sort(self, strings, **kwargs):
+        out = io.StringIO()
+        count = sort_lines(strings, out, **kwargs)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(count, len(lines))
+        return lines
+
+    def expected(self, scheme, strings, unique=False):
+        result = []
+        for version in sort_versions(scheme(x) for x in strings):
+            if not (unique and result and version == result[-1]):
+                result.append(version)
+        return [str(x) for x in result]
+
+    def test_sort_lines(self):
+        self.assertEqual(self.expected(Version, self.strings),
+                         self.sort(self.strings, chunk_size=7))
+
+    def test_sort_lines_unique(self):
+        self.assertEqual(
+            self.expected(PgVersion, self.strings, unique=True),
+            self.sort(self.strings, scheme=PgVersion, unique=True,
+                      chunk_size=7))
+
+    def test_sort_lines_blank_and_padded(self):
+        self.assertEqual(['1.2', '1.10'],
+                         self.sort(['\n', ' 1.10 \n', '1.02\n']))
+
+    def test_sort_lines_segments(self):
+        strings = ['1.0b2', '1.0a1', '1.0b1', '1.0a1', '1.0c1', '1.0b2']
+        self.assertEqual(['1.0a1', '1.0b1', '1.0b2', '1.0c1'],
+                         self.sort(strings, scheme=Pep440Version,
+                                   unique=True, chunk_size=2))
+
+    def test_sort_lines_processes(self):
+        self.assertEqual(self.expected(PgVersion, self.strings),
+                         self.sort(self.strings, scheme=PgVersion,
+                                   chunk_size=9, processes=2))
+
+    def test_sort_lines_custom_order(self):
+        class Backward(Version):
+            def __lt__(self, other):
+                return Version.__gt__(self, other)
+        expected = [str(x) for x in sorted(Backward(x) for x in self.strings)]
+        self.assertEqual(expected, self.sort(self.strings, scheme=Backward,
+                                             chunk_size=7))
+        self.assertEqual(sorted(set(expected), key=expected.index),
+                         self.sort(self.strings, scheme=Backward, unique=True,
+                                   chunk_size=7))
+
+    def test_sort_lines_invalid(self):
+        self.assertRaises(ValueError, self.sort, ['1.2', 'bogus'])
+
+    def test_sort_file_in_place(self):
+        path = os.path.join(self.directory, 'versions')
+        with io.open(path, 'w') as f:
+            f.write('\n'.join(self.strings))
+        self.assertEqual(200, sort_file(path, path, chunk_size=50))
+        with io.open(path) as f:
+            self.assertEqual(self.expected(Version, self.strings),
+                             f.read().splitlines())
+        self.assertEqual(['versions'], os.listdir(self.directory))
+
+    @unittest.skipUnless(os.path.isdir('/proc/self/fd'), "requires /proc")
+    def test_sort_file_missing_input(self):
+        fds = len(os.listdir('/proc/self/fd'))
+        self.assertRaises(IOError, sort_file,
+                          os.path.join(self.directory, 'missing'),
+                          os.path.join(self.directory, 'versions'))
+        self.assertEqual(fds, len(os.listdir('/proc/self/fd')))
+        self.assertEqual([], os.listdir(self.directory))
+
+    def test_main(self):
+        input_path = os.path.join(self.directory, 'input')
+        output_path = os.path.join(self.directory, 'output')
+        with io.open(input_path, 'w') as f:
+            f.write('\n'.join(self.strings))
+        self.assertEqual(0, main(['sort', '-u', '-s', 'postgresql',
+                                  '--chunk-size', '20', input_path,
+                                  '-o', output_path]))
+        with io.open(output_path) as f:
+            self.assertEqual(
+                self.expected(PgVersion, self.strings, unique=True),
+                f.read().splitlines())
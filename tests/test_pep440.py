@@ -1,9 +1,15 @@
 # -*- coding: utf-8 -*-
 """PEP 440 verschemes tests"""
 
+import operator
+import random
+import subprocess
+import sys
 import unittest
 
+from verschemes import convert
 from verschemes.pep440 import Pep440Version
+from verschemes.python import PythonMinorVersion, PythonVersion
 
 
 class Pep440VersionTestCase(unittest.TestCase):
@@ -283,3 +289,49 @@ class Pep440VersionTestCase(unittest.TestCase):
         self.assertTrue(version.is_release)
         version = Pep440Version(release4=11)
         self.assertTrue(version.is_release)
+
+    def test_sort_strings(self):
+        rng = random.Random(3)
+        strings = ["{}{}.{}{}{}{}.post{}".format(
+            rng.choice(['', '1!']), rng.randint(0, 2), rng.randint(0, 3),
+            rng.choice(['', '.0', '.1']),
+            rng.choice(['a', 'b', 'rc', '.beta']),
+            rng.randint(0, 3), rng.randint(0, 2)) for i in range(300)]
+        self.assertEqual(sorted(strings, key=Pep440Version),
+                         Pep440Version.sort_strings(strings))
+        self.assertEqual(0,
+                         Pep440Version.compare_strings('1.0b1', '1.0.0-b01'))
+        self.assertTrue(Pep440Version.compare_strings('1.0rc1', '1.0a2') > 0)
+
+    def test_finditer(self):
+        self.assertEqual([((4, 11), Pep440Version('1.4.2b1'))],
+                         list(Pep440Version.finditer("foo-1.4.2b1.tar.gz")))
+        self.assertEqual(((7, 23), Pep440Version('2!3.0.post1.dev2')),
+                         Pep440Version.search("bump v 2!3.0.post1.dev2 now"))
+
+    def test_convert_python(self):
+        self.assertEqual(Pep440Version('3.4.1c2'),
+                         convert(PythonVersion('3.4.1c2'), Pep440Version))
+        self.assertEqual(Pep440Version(release1=3, release2=4),
+                         convert(PythonMinorVersion(3, 4), Pep440Version))
+        self.assertRaises(ValueError, convert, PythonVersion('3.4.1+'),
+                          Pep440Version)
+
+    def test_import_alone(self):
+        # The converter from Python versions is registered without importing
+        # the Python scheme module.
+        output = subprocess.check_output([sys.executable, '-c', (
+            "import sys, verschemes.pep440; "
+            "print('verschemes.python' in sys.modules)")])
+        self.assertEqual(b'False', output.strip())
+
+    def test_compare_python(self):
+        self.assertEqual(PythonVersion('3.4.1b2'), Pep440Version('3.4.1b2'))
+        self.assertLess(PythonVersion('3.4.9'), Pep440Version('3.4.10'))
+        self.assertGreater(Pep440Version('3.10'), PythonMinorVersion(3, 9))
+        self.assertNotEqual(Pep440Version('3.4.1'), PythonVersion('3.4.1+'))
+        # An unreleased version has no PEP 440 equivalent to compare with.
+        self.assertRaises(TypeError, operator.gt, PythonVersion('3.4.1+'),
+                          Pep440Version('10.0'))
+        self.assertRaises(TypeError, operator.lt, Pep440Version('3.4.1'),
+                          PythonVersion('3.4.1+'))
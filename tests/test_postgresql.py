@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
 """PostgreSQL verschemes tests"""
 
+import random
 import unittest
 
-from verschemes.postgresql import PgMajorVersion, PgVersion
+from verschemes import Version, convert, sort_versions
+from verschemes.postgresql import PgMajorVersion, PgVersion, PgVersionIndex
 
 
 class PgVersionTestCase(unittest.TestCase):
@@ -80,3 +82,78 @@ class PgVersionTestCase(unittest.TestCase):
     def test_invalid_minor_major_comparison(self):
         version = PgVersion(8, 3, 4)
         self.assertNotEqual(PgMajorVersion(8, 2), version.major_version)
+
+    def test_convert(self):
+        self.assertIs(Version, type(convert(PgVersion('9.3'), Version)))
+        self.assertEqual(Version(9, 3, 0), convert(PgVersion('9.3'), Version))
+        self.assertEqual(Version(9, 3, 0), PgVersion('9.3'))
+        self.assertEqual(PgVersion('9.3'), '9.3.0')
+
+    def test_sort_versions(self):
+        r = random.Random(0)
+        versions = [PgVersion(r.randint(7, 9), r.randint(0, 6),
+                              r.choice([None, 0, 1, 12]))
+                    for _ in range(500)]
+        self.assertEqual(sorted(versions), sort_versions(versions))
+
+
+class PgVersionIndexTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.index = PgVersionIndex(
+            ['9.4.1', '9.3.4', '9.3.9', '9.3.5', '8.4.22', '9.3.5'],
+            servers={'db1': '9.3.5', 'db2': '9.4.1', 'db3': '8.4'})
+
+    def test_len_contains_iter(self):
+        self.assertEqual(6, len(self.index))
+        self.assertIn('9.3.5', self.index)
+        self.assertIn(PgVersion(8, 4), self.index)
+        self.assertNotIn('9.3.6', self.index)
+        self.assertNotIn('bogus', self.index)
+        self.assertEqual(['8.4', '8.4.22', '9.3.4', '9.3.5', '9.3.9', '9.4.1'],
+                         [str(x) for x in self.index])
+
+    def test_majors(self):
+        self.assertEqual([PgMajorVersion(8, 4), PgMajorVersion(9, 3),
+                          PgMajorVersion(9, 4)], self.index.majors())
+
+    def test_latest(self):
+        self.assertEqual(PgVersion(9, 3, 9), self.index.latest('9.3'))
+        self.assertEqual(PgVersion(9, 3, 9),
+                         self.index.latest(PgVersion(9, 3, 1)))
+        self.assertRaises(KeyError, self.index.latest, '9.2')
+
+    def test_latest_per_major(self):
+        self.assertEqual(
+            [PgVersion(8, 4, 22), PgVersion(9, 3, 9), PgVersion(9, 4, 1)],
+            self.index.latest_per_major())
+
+    def test_add_incremental(self):
+        self.index.add('9.3.10')
+        self.index.add('9.5.0', server='db2')
+        self.assertEqual(PgVersion(9, 3, 10), self.index.latest('9.3'))
+        self.assertEqual(PgVersion(9, 5), self.index.latest_per_major()[-1])
+        self.assertEqual(PgVersion(9, 5, 0), self.index.server_version('db2'))
+
+    def test_behind_by(self):
+        self.assertEqual(2, self.index.behind_by('9.3.4'))
+        self.assertEqual(0, self.index.behind_by('9.3.9'))
+        self.assertEqual(1, self.index.behind_by('9.3.6'))
+        self.assertEqual(0, self.index.behind_by('9.2.1'))
+
+    def test_servers_behind(self):
+        self.assertEqual({'db1': 1, 'db3': 1}, self.index.servers_behind())
+        self.assertEqual({}, self.index.servers_behind(2))
+
+    def test_upgrade_path(self):
+        self.assertEqual([PgVersion(8, 4, 22), PgVersion(9, 4, 1)],
+                         self.index.upgrade_path('8.4'))
+        self.assertEqual([PgVersion(9, 3, 5)],
+                         self.index.upgrade_path('9.3.4', '9.3.5'))
+        self.assertEqual([PgVersion(9, 3, 9)],
+                         self.index.upgrade_path('9.3.4',
+                                                 PgMajorVersion(9, 3)))
+        self.assertEqual([PgVersion(8, 4, 22), PgVersion(9, 3, 5)],
+                         self.index.upgrade_path('8.4.1', '9.3.5'))
+        self.assertEqual([], self.index.upgrade_path('9.4.1'))
+        self.assertEqual([], PgVersionIndex().upgrade_path('9.4.1'))
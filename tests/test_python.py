@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 """Python verschemes tests"""
 
+import random
 import unittest
 
 from verschemes.python import (PythonMajorVersion, PythonMicroVersion,
@@ -157,6 +158,21 @@ class PythonVersionTestCase(unittest.TestCase):
         self.assertEqual(PythonMinorVersion(2, 3),
                          PythonVersion(2, 3, 4, '+').minor_version)
 
+    def test_subclass_other_definitions_projections(self):
+        # The leading segment definitions differ, so the projections are
+        # constructed instead.
+        class Dashed(PythonVersion):
+            SEGMENT_DEFINITIONS = (
+                PythonVersion.SEGMENT_DEFINITIONS[0],
+                PythonVersion.SEGMENT_DEFINITIONS[1]._replace(
+                    separator='-'),
+            ) + PythonVersion.SEGMENT_DEFINITIONS[2:]
+        version = Dashed('3-4.1c2')
+        self.assertEqual(PythonMajorVersion(3), version.major_version)
+        self.assertEqual(PythonMinorVersion(3, 4), version.minor_version)
+        self.assertEqual(PythonMicroVersion(3, 4, 1), version.micro_version)
+        self.assertIs(PythonMinorVersion, type(version.minor_version))
+
     def test_eq(self):
         version = PythonVersion(3, 4, 2, 'a2')
         self.assertEqual(version, PythonVersion(3, 4, 2, 'a2'))
@@ -193,3 +209,20 @@ class PythonVersionTestCase(unittest.TestCase):
 
     def test_invalid_alpha_string(self):
         self.assertRaises(ValueError, PythonVersion, 2, 7, 9, 'a')
+
+    def test_compare_strings(self):
+        rng = random.Random(2)
+        strings = ["{}.{}{}{}{}".format(rng.randint(2, 3), rng.randint(0, 12),
+                                        rng.choice(['.0', '.1', '.10']),
+                                        rng.choice('abc+'), rng.randint(1, 3))
+                   for i in range(200)]
+        strings = [x[:-1] if x[-2] == '+' else x for x in strings]
+        for string1, string2 in zip(strings, reversed(strings)):
+            version1, version2 = PythonVersion(string1), PythonVersion(string2)
+            expected = (version2 < version1) - (version1 < version2)
+            result = PythonVersion.compare_strings(string1, string2)
+            self.assertEqual(expected, (result > 0) - (result < 0))
+        self.assertEqual(sorted(strings, key=PythonVersion),
+                         PythonVersion.sort_strings(strings))
+        self.assertEqual(sorted(strings, key=PythonVersion, reverse=True),
+                         PythonVersion.sort_strings(strings, reverse=True))
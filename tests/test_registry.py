@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""registry verschemes tests"""
+
+import threading
+import unittest
+
+from verschemes import SegmentDefinition, SegmentField, Version
+from verschemes.pep440 import Pep440Version
+from verschemes.postgresql import PgVersion
+from verschemes.python import PythonVersion
+from verschemes.registry import (DEFAULT_REGISTRY, SchemeRegistry, detect,
+                                 detect_many)
+from verschemes.xorg import XorgVersion
+
+
+class SchemeRegistryTestCase(unittest.TestCase):
+
+    def test_default_registry(self):
+        self.assertEqual(['default', 'python', 'pep440', 'postgresql', 'xorg'],
+                         DEFAULT_REGISTRY.names())
+        self.assertIs(PgVersion, DEFAULT_REGISTRY['postgresql'])
+        self.assertRaises(KeyError, DEFAULT_REGISTRY.__getitem__, 'nope')
+
+    def test_detect(self):
+        self.assertEqual(
+            [Version, PythonVersion, Pep440Version, PgVersion, XorgVersion],
+            detect('1.2.3'))
+        self.assertEqual([PythonVersion, Pep440Version], detect('3.4.1c1'))
+        self.assertEqual([PythonVersion], detect('3.4.1+'))
+        self.assertEqual([Pep440Version], detect('1!2.0.post3'))
+        self.assertEqual([Version, Pep440Version, XorgVersion], detect('1'))
+        self.assertEqual([], detect('not a version'))
+        self.assertRaises(TypeError, detect, 1)
+
+    def test_detect_validates(self):
+        # This matches the X.org regular expression but fails validation.
+        self.assertTrue(XorgVersion.REGULAR_EXPRESSION.match('1.2.3.4'))
+        self.assertEqual([Version, Pep440Version], detect('1.2.3.4'))
+
+    def test_detect_same_as_constructors(self):
+        for string in ['1.2', '2.3.99.903', '1.2b3', '3.4.1a', '1.0rc',
+                       '1..2', '', '08.4.12', '1.2.3.4.5.6.7']:
+            expected = []
+            for scheme in DEFAULT_REGISTRY:
+                try:
+                    scheme(string)
+                except ValueError:
+                    continue
+                expected.append(scheme)
+            self.assertEqual(expected, detect(string))
+
+    def test_detect_many(self):
+        self.assertEqual([[PythonVersion], [Pep440Version]],
+                         detect_many(['3.4.1+', '1.0.dev1']))
+
+    def test_register(self):
+        registry = SchemeRegistry([PgVersion])
+        self.assertEqual(['verschemes.postgresql.PgVersion'], registry.names())
+        @registry.register
+        class NamedVersion(Version):
+            SEGMENT_DEFINITIONS = (
+                SegmentDefinition(name='first'),
+                SegmentDefinition(
+                    fields=SegmentField(type=str, name='word',
+                                        re_pattern='[a-z]+'),
+                    separator='-'),
+            )
+        self.assertEqual([NamedVersion], registry.detect('1-b'))
+        self.assertEqual([PgVersion], registry.detect('1.2'))
+        self.assertTrue(NamedVersion in registry)
+        self.assertRaises(ValueError, registry.register, XorgVersion,
+                          'verschemes.postgresql.PgVersion')
+        self.assertRaises(TypeError, registry.register, object)
+        registry.unregister(NamedVersion)
+        self.assertEqual([], registry.detect('1-b'))
+        registry.unregister('verschemes.postgresql.PgVersion')
+        self.assertEqual(0, len(registry))
+        self.assertEqual([], registry.detect('1.2'))
+        self.assertRaises(KeyError, registry.unregister, PgVersion)
+
+    def test_mapping(self):
+        registry = SchemeRegistry({'pg': PgVersion})
+        self.assertEqual([PgVersion], list(registry))
+
+    def test_threads(self):
+        registry = SchemeRegistry([('pg', PgVersion)])
+        schemes = [type(str('Scheme{}'.format(i)), (Version,), {
+            'SEGMENT_DEFINITIONS': (SegmentDefinition(),) * (i + 2),
+        }) for i in range(8)]
+        errors = []
+        def target(scheme):
+            try:
+                registry.register(scheme)
+                for _ in range(20):
+                    self.assertIn(PgVersion, registry.detect('9.3'))
+            except Exception as e:
+                errors.append(e)
+        threads = [threading.Thread(target=target, args=(x,))
+                   for x in schemes]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([], errors)
+        self.assertEqual(9, len(registry))
+        self.assertEqual([PgVersion, schemes[1]], registry.detect('1.2.3'))
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""shared version table verschemes tests"""
+
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from verschemes import InternPool, SegmentDefinition, Version
+from verschemes.pep440 import Pep440Version
+from verschemes.postgresql import PgVersion
+from verschemes.python import PythonVersion
+from verschemes.shared import NONE, NULL, VersionTable
+from verschemes.xorg import XorgVersion
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+PEP440 = ['1.0', '2!1.0rc1.post2.dev3', '1.0a1', '1.2.3.4.5.6', '0.1.dev0',
+          '1.0b2']
+
+
+def _strings(name):
+    """Return the strings of the versions in the table (in a worker)."""
+    table = VersionTable.attach(name)
+    try:
+        return [str(x) for x in table]
+    finally:
+        table.close()
+
+
+@unittest.skipIf(sys.version_info < (3, 8), "requires Python 3.8")
+class VersionTableTestCase(unittest.TestCase):
+
+    def test_shared_memory(self):
+        versions = [Pep440Version(x) for x in PEP440]
+        with VersionTable.create(PEP440, Pep440Version) as table:
+            self.assertTrue(table.owner)
+            self.assertIs(Pep440Version, table.scheme)
+            other = VersionTable.attach(table.name)
+            try:
+                self.assertFalse(other.owner)
+                self.assertIs(Pep440Version, other.scheme)
+                self.assertEqual(len(versions), len(other))
+                self.assertEqual(versions, list(other))
+                self.assertEqual(versions[1:3], other[1:3])
+                self.assertEqual(versions[-1], other[-1])
+                self.assertRaises(IndexError, other.__getitem__, 6)
+                self.assertEqual(
+                    [str(x) for x in versions], [str(x) for x in other])
+                self.assertEqual(
+                    [type(x) for x in tuple.__iter__(versions[1])],
+                    [type(x) for x in tuple.__iter__(other[1])])
+            finally:
+                other.close()
+        self.assertRaises(Exception, VersionTable.attach, table.name)
+
+    def test_columns(self):
+        with VersionTable.create(PEP440, Pep440Version) as table:
+            self.assertEqual(
+                ['epoch', 'release1', 'release2', 'release3', 'release4',
+                 'release5', 'release6', 'pre_release.level',
+                 'pre_release.serial', 'post_release', 'development'],
+                table.columns)
+            self.assertEqual(['a', 'b', 'rc'],
+                             table.strings('pre_release.level'))
+            column = table.column('pre_release.level')
+            try:
+                self.assertEqual([NONE, 2, 0, NONE, NONE, 1], list(column))
+            finally:
+                column.release()
+            column = table.column('epoch')
+            try:
+                self.assertEqual([NONE, 2, NONE, NONE, NONE, NONE],
+                                 column.tolist())
+            finally:
+                column.release()
+
+    def test_file(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'versions.table')
+        strings = ['1', '1.2.3', '4.5', '0.0.0.7']
+        table = VersionTable.create(strings, path=path)
+        self.assertEqual(path, table.name)
+        other = VersionTable.attach(path=path)
+        self.assertEqual([Version(x) for x in strings], list(other))
+        self.assertEqual(['0', '1', '2', '3'], other.columns)
+        other.close()
+        other.close()
+        table.close()
+        with VersionTable.attach(path=path) as other:
+            self.assertEqual(Version('4.5'), other[2])
+        self.assertTrue(os.path.exists(path))
+        table.unlink()
+        self.assertFalse(os.path.exists(path))
+        with VersionTable.create([], path=path) as table:
+            self.assertEqual([], list(table))
+            self.assertIs(Version, table.scheme)
+        self.assertFalse(os.path.exists(path))
+        with open(path, 'wb') as f:
+            f.write(b'\0' * 64)
+        self.assertRaises(ValueError, VersionTable.attach, path=path)
+
+    def test_schemes(self):
+        class Local(Version):
+            SEGMENT_DEFINITIONS = (
+                SegmentDefinition(),
+                SegmentDefinition(optional=True),
+            )
+            INTERN_POOL = InternPool()
+        for scheme, strings in ((PgVersion, ['9.3.4', '10.1', '8.4']),
+                                (XorgVersion, ['1.2.99.901', '7.7']),
+                                (Local, ['1', '2.3'])):
+            with VersionTable.create(strings, scheme) as table:
+                self.assertRaises(ValueError, VersionTable.attach,
+                                  table.name, scheme=Version)
+                if scheme is Local:
+                    self.assertRaises(ValueError, VersionTable.attach,
+                                      table.name)
+                other = VersionTable.attach(table.name, scheme=scheme)
+                self.assertEqual([scheme(x) for x in strings], list(other))
+                other.close()
+        with VersionTable.create(['1', '2.3'], Local) as table:
+            self.assertIs(Local('2.3'), table[1])
+        with VersionTable.create([PgVersion('9.3.4'), '9.2']) as table:
+            self.assertIs(PgVersion, table.scheme)
+            self.assertEqual([PgVersion('9.3.4'), PgVersion('9.2')],
+                             table[:])
+
+    def test_null_fields(self):
+        # The '+' suffix of an unreleased Python version has no serial.
+        strings = ['3.4.1+', '3.4.1', '2.7.6c1', '3.5', '3.4.1+']
+        versions = [PythonVersion(x) for x in strings]
+        with VersionTable.create(versions) as table:
+            other = VersionTable.attach(table.name)
+            try:
+                self.assertEqual(versions, list(other))
+                self.assertEqual(strings, [str(x) for x in other])
+                self.assertIsNone(other[0].suffix.serial)
+                self.assertIsNone(other[1].suffix)
+                self.assertEqual(['+', 'c'],
+                                 other.strings('suffix.releaselevel'))
+                column = other.column('suffix.serial')
+                try:
+                    self.assertEqual([NULL, NONE, 1, NONE, NULL], list(column))
+                finally:
+                    column.release()
+            finally:
+                other.close()
+
+    def test_errors(self):
+        self.assertRaises(TypeError, VersionTable.create, [Version(1 << 63)])
+        self.assertRaises(TypeError, VersionTable.create, [9.3])
+        self.assertRaises(TypeError, VersionTable.create,
+                          [Pep440Version('1.0')], PgVersion)
+        self.assertRaises(TypeError, VersionTable.attach)
+        self.assertRaises(TypeError, VersionTable.attach, 'x', path='y')
+
+    def test_worker_processes(self):
+        strings = ['{}.{}.{}'.format(x % 7, x % 11, x) for x in range(500)]
+        with VersionTable.create(strings, PgVersion) as table:
+            pool = multiprocessing.get_context('spawn').Pool(2)
+            try:
+                results = pool.map(_strings, [table.name] * 2)
+            finally:
+                pool.close()
+                pool.join()
+        self.assertEqual([[str(PgVersion(x)) for x in strings]] * 2,
+                         results)
+
+    @unittest.skipIf(numpy is None, "requires NumPy")
+    def test_numpy(self):
+        with VersionTable.create(['9.3.4', '10.1', '8.4'],
+                                 PgVersion) as table:
+            columns = table.numpy()
+            self.assertEqual((3, 3), columns.shape)
+            self.assertEqual([9, 10, 8], columns[0].tolist())
+            minor = table.numpy('minor')
+            self.assertEqual([4, NONE, NONE], minor.tolist())
+            self.assertEqual(numpy.int64, minor.dtype)
+            del columns, minor
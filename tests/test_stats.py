@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""statistics verschemes tests"""
+
+import threading
+import unittest
+
+import verschemes
+from verschemes import InternPool, SegmentDefinition, Version
+from verschemes import stats
+from verschemes.pep440 import Pep440Version
+from verschemes.postgresql import PgMajorVersion, PgVersion
+from verschemes.xorg import XorgVersion
+
+
+PEP440 = 'verschemes.pep440.Pep440Version'
+XORG = 'verschemes.xorg.XorgVersion'
+
+
+class StatsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        stats.disable()
+        stats.reset()
+
+    def tearDown(self):
+        stats.disable()
+        stats.reset()
+
+    def test_disabled(self):
+        originals = (Version.__dict__['__new__'], Version.__dict__['__lt__'],
+                     SegmentDefinition.__dict__['validate_value'],
+                     verschemes._fields_metadata,
+                     XorgVersion.__dict__['validate'])
+        self.assertFalse(stats.is_enabled())
+        stats.enable()
+        self.assertTrue(stats.is_enabled())
+        self.assertIsNot(originals[0], Version.__dict__['__new__'])
+        stats.disable()
+        self.assertFalse(stats.is_enabled())
+        self.assertEqual(originals,
+                         (Version.__dict__['__new__'],
+                          Version.__dict__['__lt__'],
+                          SegmentDefinition.__dict__['validate_value'],
+                          verschemes._fields_metadata,
+                          XorgVersion.__dict__['validate']))
+        Pep440Version('1.0')
+        result = stats.snapshot()
+        self.assertFalse(result['enabled'])
+        self.assertEqual(0, result['phases']['new']['calls'])
+
+    def test_phases(self):
+        stats.enable()
+        versions = [Pep440Version('1.{}b2'.format(x)) for x in range(3)]
+        xorg = XorgVersion('1.2.99.901')
+        [str(x) for x in versions]
+        versions[0] < versions[1]
+        xorg == XorgVersion('1.2.99.901')
+        phases = stats.snapshot()['phases']
+        self.assertEqual(set(stats.PHASES), set(phases))
+        self.assertEqual(5, phases['new']['calls'])
+        self.assertEqual({PEP440: 3, XORG: 2},
+                         dict((k, v['calls']) for k, v in
+                              phases['new']['schemes'].items()))
+        self.assertEqual(5, phases['match']['calls'])
+        self.assertEqual(3, phases['segment']['schemes'][PEP440]['calls'])
+        self.assertEqual(8, phases['validate_value']['schemes'][XORG]['calls'])
+        self.assertEqual(5, phases['validate']['calls'])
+        self.assertEqual(3, phases['render']['schemes'][PEP440]['calls'])
+        self.assertGreater(phases['render_callback']['calls'], 0)
+        self.assertEqual({PEP440: 1, XORG: 1},
+                         dict((k, v['calls']) for k, v in
+                              phases['compare']['schemes'].items()))
+        for phase in phases.values():
+            self.assertGreaterEqual(phase['seconds'], 0)
+        self.assertGreaterEqual(phases['new']['seconds'],
+                                phases['match']['seconds'])
+
+    def test_results_unchanged(self):
+        strings = ['1.0', '2!1.0rc1.post2.dev3', '1.0a1']
+        expected = [str(Pep440Version(x)) for x in strings]
+        with stats.measure():
+            self.assertEqual(expected,
+                             [str(Pep440Version(x)) for x in strings])
+            self.assertTrue(Pep440Version('1.0') < Pep440Version('1.1'))
+            self.assertTrue(PgVersion('9.3.4') > '9.3.2')
+            self.assertEqual(PgMajorVersion(9, 3),
+                             PgVersion('9.3.4').major_version)
+            self.assertRaises(ValueError, XorgVersion, '1.2.3.4')
+
+    def test_caches(self):
+        verschemes._thread_caches.parse.clear()
+        verschemes._thread_caches.projections.clear()
+        with stats.measure() as result:
+            version = PgVersion('9.3.4')
+            version.major_version
+            version.major_version
+            version < '9.3.5'
+            version < '9.3.5'
+            pool = InternPool()
+            pool.intern(version)
+            pool.intern(PgVersion('9.3.4'))
+        caches = result['caches']
+        self.assertEqual(set(stats.CACHES), set(caches))
+        self.assertEqual((1, 1, 0.5), (caches['projection']['hits'],
+                                       caches['projection']['misses'],
+                                       caches['projection']['hit_rate']))
+        self.assertEqual(1, caches['parse']['hits'])
+        self.assertEqual((1, 1), (caches['intern']['hits'],
+                                  caches['intern']['misses']))
+        self.assertGreater(caches['fields']['hits'], 0)
+
+    def test_measure(self):
+        stats.enable()
+        Version('1.0')
+        with stats.measure() as result:
+            Version('1.1')
+            Version('1.2')
+        self.assertEqual(2, result['phases']['new']['calls'])
+        self.assertTrue(stats.is_enabled())
+        self.assertEqual(3, stats.snapshot()['phases']['new']['calls'])
+        stats.disable()
+        with stats.measure() as result:
+            Version('1.3')
+        self.assertFalse(stats.is_enabled())
+        self.assertEqual(1, result['phases']['new']['calls'])
+        self.assertIsNone(result['caches']['intern']['hit_rate'])
+
+    def test_threads(self):
+        entered, release = threading.Event(), threading.Event()
+
+        class Blocking(Version):
+            def validate(self):
+                entered.set()
+                release.wait(10)
+
+        errors = []
+
+        def construct():
+            try:
+                Blocking('1.0')
+            except Exception as e:
+                errors.append(e)
+
+        stats.enable()
+        thread = threading.Thread(target=construct)
+        thread.start()
+        try:
+            self.assertTrue(entered.wait(10))
+            # Another thread's phase in progress does not keep this one's
+            # from being recorded.
+            XorgVersion('1.2.3')
+            self.assertEqual(
+                1, stats.snapshot()['phases']['validate']['schemes'][XORG]
+                ['calls'])
+            # Nor does disabling break the construction in progress.
+            stats.disable()
+        finally:
+            release.set()
+            thread.join()
+        self.assertEqual([], errors)
+
+    def test_reset(self):
+        stats.enable()
+        Version('1.0')
+        stats.reset()
+        self.assertEqual(0, stats.snapshot()['phases']['new']['calls'])
@@ -1,12 +1,25 @@
 """verschemes unit tests"""
 
+import io
+import json
 import operator
+import os
+import random
 import re
 import sys
+import tempfile
+import threading
 import types
 import unittest
 
-from verschemes import SegmentDefinition, SegmentField, Version, _VersionMeta
+from verschemes import (InternPool, SegmentDefinition, SegmentField, Version,
+                        _VersionMeta, convert, latest, make_scheme,
+                        register_converter, render_many, scheme_from_spec,
+                        sort_versions)
+from verschemes._types import int_empty_zero
+from verschemes.pep440 import Pep440Version
+from verschemes.postgresql import PgMajorVersion, PgVersion
+from verschemes.python import PythonVersion
 
 
 class SegmentFieldTestCase(unittest.TestCase):
@@ -191,6 +204,54 @@ class VersionTestCase(unittest.TestCase):
         version = Version('1.2.3')
         self.assertEqual(1, version[0])
 
+    def test_init_value_bytes(self):
+        for data in (b'1.02.3', bytearray(b'1.02.3'), memoryview(b'1.02.3')):
+            version = Version(data)
+            self.assertEqual(Version('1.2.3'), version)
+            self.assertEqual([int, int, int],
+                             [type(x) for x in tuple.__iter__(version)])
+        for data in (b'', b'1..2', b'1.x', b'1.2\xff'):
+            self.assertRaises(ValueError, Version, data)
+
+    def test_init_value_bytes_fields(self):
+        class Scheme(Version):
+            SEGMENT_DEFINITIONS = (
+                SegmentDefinition(name='number'),
+                SegmentDefinition(
+                    name='suffix',
+                    optional=True,
+                    separator='-',
+                    fields=(
+                        SegmentField(type=str, name='letter',
+                                     re_pattern='[a-z]'),
+                        SegmentField(type=int_empty_zero, name='count',
+                                     re_pattern='[0-9]*'),
+                    ),
+                ),
+            )
+        for string in ('7', '7-b', '7-b12'):
+            version = Scheme(string.encode('ascii'))
+            self.assertEqual(Scheme(string), version)
+            self.assertEqual(
+                [type(x) for x in tuple.__iter__(Scheme(string))],
+                [type(x) for x in tuple.__iter__(version)])
+        suffix = Scheme(b'7-b').suffix
+        self.assertEqual(('b', 0), suffix)
+        self.assertIs(str, type(suffix.letter))
+        self.assertIs(int_empty_zero, type(suffix.count))
+        self.assertEqual(Scheme(8, ('c', 1)), Scheme(b'7-b', number=8,
+                                                     suffix='c1'))
+        self.assertRaises(ValueError, Scheme, b'7-B')
+
+    def test_parse_many(self):
+        strings = ['1.2', b'1.3', bytearray(b'1.4'), 'bogus', b'1.x']
+        self.assertRaises(ValueError, Version.parse_many, strings)
+        self.assertEqual(
+            [Version(1, 2), Version(1, 3), Version(1, 4), None, None],
+            Version.parse_many(iter(strings), errors='ignore'))
+        self.assertEqual([], Version.parse_many([]))
+        self.assertRaises(ValueError, Version.parse_many, [], 'bogus')
+
     def test_init_value_string_not_parsed(self):
         class VersionString(Version):
             SEGMENT_DEFINITIONS = (
@@ -532,3 +593,676 @@ class VersionSegmentAccessTestCase(unittest.TestCase):
     def test_invalid_raw_keyword(self):
         self.assertEqual(7, self.version.get_raw_item('third'))
         self.assertRaises(KeyError, self.version.get_raw_item, 'fourth')
+
+
+class LazyVersionTestCase(unittest.TestCase):
+
+    def setUp(self):
+        converted = []
+        class RecordedInt(int):
+            def __new__(cls, value):
+                converted.append(value)
+                return super(RecordedInt, cls).__new__(cls, value)
+        class VersionChecked(Version):
+            SEGMENT_DEFINITIONS = (
+                SegmentDefinition(name='major'),
+                SegmentDefinition(name='minor', optional=True, default=0,
+                                  fields=SegmentField(type=RecordedInt)),
+            )
+        del converted[:]
+        self.converted = converted
+        self.version_class = VersionChecked
+
+    def test_invalid_string(self):
+        self.assertRaises(ValueError, self.version_class.lazy, '1.y')
+        self.assertRaises(TypeError, Version.lazy, 1)
+
+    def test_segment_validated_on_access(self):
+        version = self.version_class.lazy('1.2')
+        self.assertEqual(1, version[0])
+        self.assertEqual(1, version.major)
+        self.assertEqual([], self.converted)
+        self.assertEqual(2, version.minor)
+        self.assertEqual(2, version[1])
+        self.assertEqual(['2'], self.converted)
+
+    def test_materialize(self):
+        version = self.version_class.lazy('01')
+        materialized = version.materialize()
+        self.assertIs(self.version_class, type(materialized))
+        self.assertEqual(self.version_class('01'), materialized)
+        self.assertEqual((1, None), materialized.get_raw_item())
+        self.assertIs(materialized, version.materialize())
+        self.assertEqual("1", str(version))
+
+    def test_access(self):
+        version = self.version_class.lazy('3')
+        self.assertEqual(2, len(version))
+        self.assertEqual((3, 0), version[:])
+        self.assertEqual(0, version['minor'])
+        self.assertEqual((3, None), version.get_raw_item())
+        self.assertEqual(None, version.get_raw_item('minor'))
+        self.assertEqual([3, None], list(version))
+        self.assertRaises(IndexError, version.__getitem__, 2)
+        self.assertRaises(KeyError, version.__getitem__, 'micro')
+
+    def test_default_definitions(self):
+        version = Version.lazy('1.02.3')
+        self.assertEqual(3, len(version))
+        self.assertEqual((1, 2, 3), version[:])
+        self.assertEqual(Version('1.2.3'), version.materialize())
+        self.assertEqual("verschemes.Version.lazy('1.02.3')", repr(version))
+
+    def test_compare_stops_at_difference(self):
+        version = self.version_class.lazy('1.5')
+        self.assertTrue(version < self.version_class.lazy('2.7'))
+        self.assertTrue(version < self.version_class(2))
+        self.assertTrue(self.version_class(2) > version)
+        self.assertFalse(version == self.version_class(2))
+        self.assertTrue(version != self.version_class(2))
+        self.assertEqual([], self.converted)
+
+    def test_compare_like_version(self):
+        strings = ['1.2', '1.10', '1.2.0', '0.9', '1.2', '2']
+        lazy = sorted(Version.lazy(x) for x in strings)
+        self.assertEqual(sorted(Version(x) for x in strings),
+                         [x.materialize() for x in lazy])
+        self.assertTrue(Version.lazy('1.2') == Version('1.2'))
+        self.assertTrue(Version('1.2') == Version.lazy('1.2'))
+        self.assertTrue(Version.lazy('1.2') <= Version('1.2'))
+        self.assertTrue(Version.lazy('1.2') >= Version.lazy('1.1'))
+        self.assertTrue(Version.lazy('1.2') == '1.2')
+        self.assertEqual(hash(Version.lazy('1.02')), hash(Version.lazy('1.2')))
+
+    def test_compare_other_scheme(self):
+        self.assertTrue(PythonVersion('3.4') == Pep440Version.lazy('3.4'))
+        self.assertTrue(Pep440Version.lazy('3.4') == PythonVersion('3.4'))
+        self.assertFalse(PythonVersion('3.4') != Pep440Version.lazy('3.4'))
+        self.assertTrue(Pep440Version.lazy('3.4') < PythonVersion.lazy('3.5'))
+        self.assertTrue(PythonVersion('3.5') > Pep440Version.lazy('3.4'))
+        self.assertFalse(PgVersion.lazy('9.3') == PgMajorVersion.lazy('9.4'))
+
+    def test_compare_strings(self):
+        self.assertTrue(Version.compare_strings('1.10', '1.9') > 0)
+        self.assertTrue(Version.compare_strings('1.9', '1.10') < 0)
+        self.assertEqual(0, Version.compare_strings('1.09', '1.9'))
+        self.assertTrue(Version.compare_strings('1.9', '1.9.0') < 0)
+        self.assertRaises(ValueError, Version.compare_strings, '1.9', 'x')
+
+    def test_sort_strings(self):
+        strings = ['1.10', '1.9', '2', '1.09', '0.1.1']
+        self.assertEqual(['0.1.1', '1.9', '1.09', '1.10', '2'],
+                         Version.sort_strings(strings))
+        self.assertEqual(['2', '1.10', '1.9', '1.09', '0.1.1'],
+                         Version.sort_strings(strings, reverse=True))
+
+
+class RenderManyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        class Version1(Version):
+            SEGMENT_DEFINITIONS = (SegmentDefinition(),
+                                   SegmentDefinition(optional=True,
+                                                     default=0))
+        self.versions = [Version1(1), Version1(2, 3), Version1('04.5')]
+
+    def test_default(self):
+        out = io.StringIO()
+        self.assertEqual(3, render_many(self.versions, out))
+        self.assertEqual("1\n2.3\n4.5", out.getvalue())
+
+    def test_separator_and_options(self):
+        out = io.StringIO()
+        self.assertEqual(3, render_many(iter(self.versions), out, sep=",",
+                                        exclude_defaults=False))
+        self.assertEqual("1.0,2.3,4.5", out.getvalue())
+
+    def test_chunks(self):
+        writes = []
+        class Out(object):
+            write = writes.append
+        versions = [Version(x, x) for x in range(1000)]
+        self.assertEqual(1000, render_many(versions, Out(), buffer_size=100))
+        self.assertTrue(len(writes) > 10)
+        self.assertTrue(all(len(x) < 120 for x in writes))
+        self.assertEqual("\n".join(str(x) for x in versions), "".join(writes))
+
+    def test_empty(self):
+        out = io.StringIO()
+        self.assertEqual(0, render_many([], out))
+        self.assertEqual("", out.getvalue())
+
+
+class VersionSearchTestCase(unittest.TestCase):
+
+    def setUp(self):
+        class Version1(Version):
+            SEGMENT_DEFINITIONS = (SegmentDefinition(),
+                                   SegmentDefinition(optional=True))
+            def validate(self):
+                if self[0] == 13:
+                    raise ValueError("unlucky")
+        self.version_class = Version1
+
+    def test_search_regular_expression(self):
+        regex = self.version_class.SEARCH_REGULAR_EXPRESSION
+        self.assertEqual('1.2', regex.search("v1.2.3").group())
+        self.assertEqual(None, regex.search("none"))
+        self.assertEqual('1.22.333', Version.SEARCH_REGULAR_EXPRESSION
+                         .search("x-1.22.333.tar").group())
+
+    def test_finditer(self):
+        text = "built 4.5 from 13.1 and 7, not x9"
+        self.assertEqual([((6, 9), self.version_class(4, 5)),
+                          ((24, 25), self.version_class(7)),
+                          ((32, 33), self.version_class(9))],
+                         list(self.version_class.finditer(text)))
+        self.assertEqual([], list(self.version_class.finditer("")))
+
+    def test_finditer_longer_versions(self):
+        # The trailing segments of longer versions are not versions.
+        text = "v1.2.3 and 4.5.6.7"
+        self.assertEqual([((1, 4), self.version_class(1, 2)),
+                          ((11, 14), self.version_class(4, 5))],
+                         list(self.version_class.finditer(text)))
+
+    def test_search(self):
+        self.assertEqual(((2, 7), Version(1, 2, 3)),
+                         Version.search("v-1.2.3-"))
+        self.assertEqual(None, Version.search("no version"))
+
+    def test_finditer_file(self):
+        handle, path = tempfile.mkstemp()
+        self.addCleanup(os.remove, path)
+        with os.fdopen(handle, 'wb') as f:
+            f.write(b"gcc 4.8 \xc3\xa9 13.2 and 10.1\n")
+        self.assertEqual([((4, 7), self.version_class(4, 8)),
+                          ((20, 24), self.version_class(10, 1))],
+                         list(self.version_class.finditer_file(path)))
+        with open(path, 'wb') as f:
+            pass
+        self.assertEqual([], list(self.version_class.finditer_file(path)))
+
+
+class LazyMetadataTestCase(unittest.TestCase):
+
+    def test_submodule_attribute(self):
+        import verschemes
+        self.assertEqual('verschemes.xorg', verschemes.xorg.__name__)
+        self.assertRaises(AttributeError, getattr, verschemes, 'nonexistent')
+
+    def test_regular_expression_compiled_once(self):
+        class Version1(Version):
+            SEGMENT_DEFINITIONS = (SegmentDefinition(),)
+        self.assertIs(Version1.REGULAR_EXPRESSION, Version1.REGULAR_EXPRESSION)
+        self.assertIs(Version1.SEARCH_REGULAR_EXPRESSION,
+                      Version1.SEARCH_REGULAR_EXPRESSION)
+        self.assertEqual('^(?P<segment0>(?:[0-9]+))$',
+                         Version1.REGULAR_EXPRESSION.pattern)
+
+    def test_segment_type_shared(self):
+        definition = SegmentDefinition(fields=(SegmentField(name='a'),
+                                               SegmentField(name='b')))
+        self.assertIs(type(definition.validate_value((1, 2))),
+                      type(definition.validate_value('34')))
+
+
+class SchemeFactoryTestCase(unittest.TestCase):
+
+    def test_make_scheme(self):
+        definitions = (SegmentDefinition(name='major'),
+                       SegmentDefinition(name='minor', optional=True))
+        scheme = make_scheme('Dynamic', definitions)
+        self.assertTrue(issubclass(scheme, Version))
+        self.assertEqual('Dynamic', scheme.__name__)
+        self.assertEqual(definitions, scheme.SEGMENT_DEFINITIONS)
+        self.assertEqual(3, scheme('3.4').major)
+
+    def test_make_scheme_cached(self):
+        scheme = make_scheme('Dynamic', [SegmentDefinition()])
+        self.assertIs(scheme, make_scheme('Dynamic', (SegmentDefinition(),)))
+        self.assertIs(scheme, make_scheme('Dynamic', [{}]))
+        self.assertIsNot(scheme, make_scheme('Other', [SegmentDefinition()]))
+        self.assertIsNot(scheme, make_scheme('Dynamic', [SegmentDefinition()],
+                                             base=scheme))
+
+    def test_make_scheme_base(self):
+        class Base(Version):
+            SEGMENT_DEFINITIONS = (SegmentDefinition(),)
+            def double(self):
+                return self[0] * 2
+        scheme = make_scheme('Derived', [{'separator': '-'}] * 2, Base)
+        self.assertEqual(6, scheme('3-4').double())
+
+    def test_make_scheme_invalid(self):
+        self.assertRaises(TypeError, make_scheme, 'Bad', [{'bogus': 1}])
+        self.assertRaises(ValueError, make_scheme, 'Bad',
+                          [{'fields': {'type': 'float'}}])
+        self.assertRaises(ValueError, make_scheme, 'Bad', [{'optional': True}])
+
+    def test_scheme_from_spec(self):
+        spec = {
+            'name': 'Spec',
+            'segments': [
+                {'name': 'major'},
+                {'name': 'tag', 'optional': True, 'separator': '-',
+                 'fields': [{'type': 'str', 'name': 'word',
+                             're_pattern': '[a-z]+'},
+                            {'type': 'int_empty_zero', 'name': 'number',
+                             're_pattern': '[0-9]*'}]},
+            ],
+        }
+        scheme = scheme_from_spec(spec)
+        version = scheme('2-rc')
+        self.assertEqual('rc', version.tag.word)
+        self.assertEqual(0, version.tag.number)
+        self.assertIsInstance(version.tag.number, int_empty_zero)
+        self.assertIs(scheme, scheme_from_spec(json.dumps(spec)))
+
+
+class VersionProjectionTestCase(unittest.TestCase):
+
+    class Short(Version):
+        SEGMENT_DEFINITIONS = (SegmentDefinition(name='major'),
+                               SegmentDefinition(name='minor'))
+
+    class Long(Version):
+        SEGMENT_DEFINITIONS = (SegmentDefinition(name='major'),
+                               SegmentDefinition(name='minor'),
+                               SegmentDefinition(name='patch',
+                                                 optional=True))
+
+    def test_project(self):
+        projection = self.Long('1.2.3').project(self.Short)
+        self.assertIs(self.Short, type(projection))
+        self.assertEqual(self.Short(1, 2), projection)
+
+    def test_project_same_scheme(self):
+        version = self.Long('1.2.3')
+        self.assertIs(version, version.project(self.Long))
+
+    def test_project_interned(self):
+        self.assertIs(self.Long('1.2.3').project(self.Short),
+                      self.Long('1.2.4').project(self.Short))
+
+    def test_project_incompatible(self):
+        self.assertRaises(TypeError, self.Short('1.2').project, self.Long)
+        self.assertRaises(TypeError, self.Long('1.2.3').project, Version)
+
+    def test_project_validates(self):
+        class Even(self.Short):
+            def validate(self):
+                if self[0] % 2:
+                    raise ValueError("odd")
+        self.assertEqual(Even(2, 1), self.Long('2.1.0').project(Even))
+        self.assertRaises(ValueError, self.Long('1.2.3').project, Even)
+
+
+class VersionConversionTestCase(unittest.TestCase):
+
+    class Dotted(Version):
+        SEGMENT_DEFINITIONS = (SegmentDefinition(name='major'),
+                               SegmentDefinition(name='minor', optional=True,
+                                                 default=0))
+
+    class Dashed(Version):
+        SEGMENT_DEFINITIONS = (SegmentDefinition(name='minor'),
+                               SegmentDefinition(name='major', separator='-'))
+
+    def setUp(self):
+        register_converter(self.Dashed, self.Dotted,
+                           lambda x: self.Dotted(x.major, x.minor))
+
+    def test_convert(self):
+        self.assertIs(self.Dotted, type(convert(self.Dashed('2-1'),
+                                                self.Dotted)))
+        self.assertEqual(self.Dotted(1, 2), convert(self.Dashed('2-1'),
+                                                    self.Dotted))
+        version = self.Dotted(1)
+        self.assertIs(version, convert(version, self.Dotted))
+
+    def test_convert_subclass(self):
+        class Subclass(self.Dashed):
+            pass
+        self.assertEqual(self.Dotted(1, 2), convert(Subclass('2-1'),
+                                                    self.Dotted))
+
+    def test_convert_missing(self):
+        self.assertRaises(TypeError, convert, self.Dotted(1), self.Dashed)
+
+    def test_register_converter_decorator(self):
+        class Other(Version):
+            pass
+        @register_converter(Other, self.Dotted)
+        def to_dotted(version):
+            return self.Dotted(version[0])
+        self.assertEqual(self.Dotted(7), convert(Other(7, 8), self.Dotted))
+        self.assertIsNotNone(to_dotted)
+
+    def test_compare_converted(self):
+        self.assertEqual(self.Dotted(1, 2), self.Dashed('2-1'))
+        self.assertEqual(self.Dashed('2-1'), self.Dotted(1, 2))
+        self.assertLess(self.Dashed('9-1'), self.Dotted(2))
+        self.assertGreater(self.Dotted(2), self.Dashed('9-1'))
+        self.assertNotEqual(self.Dotted(1), self.Dashed('1-1'))
+
+    def test_compare_unconvertible(self):
+        class Reversed(Version):
+            SEGMENT_DEFINITIONS = (SegmentDefinition(name='minor'),
+                                   SegmentDefinition(name='major'))
+        self.assertNotEqual(self.Dotted(1, 2), Reversed(2, 1))
+        self.assertFalse(Reversed(2, 1) == self.Dotted(1, 2))
+        self.assertRaises(TypeError, operator.lt, self.Dotted(1, 2),
+                          Reversed(2, 1))
+        self.assertRaises(TypeError, operator.ge, Reversed(2, 1),
+                          self.Dotted(1, 2))
+        self.assertRaises(TypeError, operator.lt, Reversed.lazy('2.1'),
+                          self.Dotted(1, 2))
+
+    def test_compare_failed_conversion(self):
+        class Reversed(Version):
+            SEGMENT_DEFINITIONS = (SegmentDefinition(name='minor'),
+                                   SegmentDefinition(name='major'))
+
+        def to_dotted(version):
+            if version.minor:
+                raise ValueError("no equivalent")
+            return self.Dotted(version.major)
+        register_converter(Reversed, self.Dotted, to_dotted)
+        # The conversion in the other direction is used when this one fails.
+        register_converter(self.Dotted, Reversed,
+                           lambda x: Reversed(x.minor, x.major))
+        self.assertEqual(self.Dotted(1, 2), Reversed(2, 1))
+        self.assertLess(Reversed(2, 1), self.Dotted(1, 3))
+        self.assertEqual(self.Dotted(4), Reversed(0, 4))
+
+    def test_compare_string(self):
+        self.assertEqual(self.Dotted(1), '1.0')
+        self.assertNotEqual(self.Dotted(1), '1.1')
+        self.assertLess(self.Dotted(1, 9), '1.10')
+        self.assertGreaterEqual(self.Dotted(1, 10), '1.9')
+        self.assertLessEqual(Version(1, 2), '01.2')
+        self.assertNotEqual(Version(1, 2), 'bogus')
+        self.assertTrue(Version(1, 2) < 'bogus')  # rendered string comparison
+
+    def test_compare_defaults(self):
+        self.assertEqual(self.Dotted(1), self.Dotted(1, 0))
+        self.assertFalse(self.Dotted(1) != self.Dotted(1, 0))
+        self.assertTrue(self.Dotted(1) >= self.Dotted(1, 0))
+        self.assertTrue(self.Dotted(1) <= self.Dotted(1, 0))
+
+
+class InternPoolTestCase(unittest.TestCase):
+
+    class Tagged(Version):
+        SEGMENT_DEFINITIONS = (
+            SegmentDefinition(name='major'),
+            SegmentDefinition(name='tag', optional=True, separator='-',
+                              fields=(SegmentField(type=str, name='word',
+                                                   re_pattern='[a-z]+'),
+                                      SegmentField(name='number'))),
+        )
+
+    def test_intern(self):
+        pool = InternPool()
+        version = Version(1, 2)
+        self.assertIs(version, pool.intern(version))
+        self.assertIs(version, pool.intern(Version('1.2')))
+        self.assertIsNot(version, pool.intern(Version('1.2.0')))
+        self.assertEqual(2, len(pool))
+        pool.clear()
+        self.assertEqual(0, len(pool))
+        self.assertIsNot(version, pool.intern(Version('1.2')))
+
+    def test_intern_class(self):
+        pool = InternPool()
+        class Other(Version):
+            pass
+        self.assertIsNot(pool.intern(Version(1)), pool.intern(Other(1)))
+
+    def test_intern_segments(self):
+        pool = InternPool()
+        version1 = pool.intern(self.Tagged('1-rc2'))
+        version2 = pool.intern(self.Tagged('2-rc2'))
+        self.assertIs(version1.tag, version2.tag)
+        self.assertIs(self.Tagged, type(version2))
+        self.assertEqual(self.Tagged('2-rc2'), version2)
+
+    def test_intern_pool_attribute(self):
+        class Pooled(self.Tagged):
+            INTERN_POOL = InternPool()
+        class Derived(Pooled):
+            pass
+        self.assertIs(Pooled('1-a1'), Pooled(1, ('a', 1)))
+        self.assertIs(Derived('1'), Derived(1))
+        self.assertIsNot(self.Tagged('1'), self.Tagged('1'))
+        self.assertEqual(2, len(Pooled.INTERN_POOL))
+
+    def test_intern_pool_lazy_and_project(self):
+        class Pooled(self.Tagged):
+            INTERN_POOL = InternPool()
+        class Short(Version):
+            SEGMENT_DEFINITIONS = self.Tagged.SEGMENT_DEFINITIONS[:1]
+            INTERN_POOL = InternPool()
+        self.assertIs(Pooled('1-a1'), Pooled.lazy('1-a1').materialize())
+        self.assertIs(Short(1), Pooled('1-a1').project(Short))
+        self.assertIs(Short(1), self.Tagged('1-b2').project(Short))
+
+
+class ThreadSafetyTestCase(unittest.TestCase):
+
+    def run_threads(self, function, count=8):
+        """Return the results of calling the function in `count` threads."""
+        results = [None] * count
+        barrier = threading.Event()
+        def target(i):
+            barrier.wait()
+            results[i] = function(i)
+        threads = [threading.Thread(target=target, args=(i,))
+                   for i in range(count)]
+        for thread in threads:
+            thread.start()
+        barrier.set()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_parse_and_compare(self):
+        strings = ['1.{}.{}'.format(i % 7, i % 11) for i in range(500)]
+        versions = [Version(x) for x in strings]
+        def compare(i):
+            return ([x < y for x, y in zip(versions, reversed(strings))],
+                    [x == y for x, y in zip(versions, strings)])
+        expected = compare(None)
+        self.assertEqual([expected] * 8, self.run_threads(compare))
+
+    def test_thread_caches(self):
+        verschemes = sys.modules['verschemes']
+        Version(1) < '2'
+        self.assertEqual([0], self.run_threads(
+            lambda i: len(verschemes._thread_caches.parse), count=1))
+
+    def test_intern_pool(self):
+        pool = InternPool()
+        results = self.run_threads(lambda i: [pool.intern(Version(1, x))
+                                              for x in range(200)])
+        for result in results[1:]:
+            self.assertTrue(all(x is y for x, y in zip(results[0], result)))
+        self.assertEqual(200, len(pool))
+
+    def test_register_converter(self):
+        class Source(Version):
+            pass
+        class Target(Version):
+            pass
+        stop = threading.Event()
+        def compare(i):
+            while not stop.is_set():
+                Source(1) == Target(2)
+        threads = [threading.Thread(target=compare, args=(i,))
+                   for i in range(4)]
+        for thread in threads:
+            thread.start()
+        try:
+            register_converter(Source, Target, lambda x: Target(x[0] + 1))
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(Source(1), Target(2))
+        self.assertEqual(Target(2), convert(Source(1), Target))
+
+
+class SortVersionsTestCase(unittest.TestCase):
+
+    def assertSortsLikeSorted(self, versions):
+        for reverse in (False, True):
+            expected = sorted(versions, reverse=reverse)
+            actual = sort_versions(iter(versions), reverse=reverse)
+            self.assertEqual(expected, actual)
+            # Equal versions must keep their order (by identity) as well.
+            self.assertEqual([id(x) for x in expected],
+                             [id(x) for x in actual])
+
+    def test_empty(self):
+        self.assertEqual([], sort_versions([]))
+
+    def test_default_uniform(self):
+        r = random.Random(0)
+        self.assertSortsLikeSorted(
+            [Version(r.randint(0, 3), r.randint(0, 300), r.randint(0, 9))
+             for _ in range(500)])
+
+    def test_default_mixed_lengths(self):
+        r = random.Random(1)
+        self.assertSortsLikeSorted(
+            [Version(*[r.randint(0, 3) for _ in range(r.randint(1, 4))])
+             for _ in range(500)])
+
+    def test_defaults_applied(self):
+        class Scheme(Version):
+            SEGMENT_DEFINITIONS = (
+                SegmentDefinition(),
+                SegmentDefinition(optional=True, default=5),
+            )
+        r = random.Random(2)
+        self.assertSortsLikeSorted(
+            [Scheme(r.randint(0, 3), r.choice([None, 4, 5, 6]))
+             for _ in range(300)])
+
+    def test_string_fields(self):
+        class Scheme(Version):
+            SEGMENT_DEFINITIONS = (
+                SegmentDefinition(),
+                SegmentDefinition(
+                    separator='-',
+                    fields=(SegmentField(type=str, re_pattern='[a-z]+'),)),
+            )
+        r = random.Random(3)
+        self.assertSortsLikeSorted(
+            [Scheme(r.randint(0, 3), r.choice(['a', 'b', 'rc', 'z']))
+             for _ in range(300)])
+
+    def test_mixed_schemes(self):
+        class Other(Version):
+            pass
+        versions = [Version(2, 1), Other(1, 5), Version(1, 2), Other(3)]
+        self.assertSortsLikeSorted(versions)
+
+    def test_custom_order(self):
+        class Backward(Version):
+            def __lt__(self, other):
+                return Version.__gt__(self, other)
+        r = random.Random(4)
+        versions = [Backward(r.randint(0, 3), r.randint(0, 9))
+                    for _ in range(300)]
+        self.assertSortsLikeSorted(versions)
+        self.assertEqual(Backward(0, 0), sort_versions(versions)[-1])
+        strings = [str(x) for x in versions]
+        self.assertEqual([str(x) for x in sorted(versions)],
+                         Backward.sort_strings(strings))
+        self.assertTrue(Backward.compare_strings('1.0', '2.0') > 0)
+
+
+class LatestTestCase(unittest.TestCase):
+
+    def test_latest(self):
+        r = random.Random(0)
+        strings = ['{}.{}.{}'.format(r.randint(0, 3), r.randint(0, 30),
+                                     r.randint(0, 9)) for _ in range(2000)]
+        versions = [Version(x) for x in strings]
+        for n in (1, 5, 100, 3000):
+            expected = sorted(versions, reverse=True)[:n]
+            self.assertEqual(expected, latest(strings, n))
+            self.assertEqual(expected, latest(iter(versions), n))
+        self.assertEqual([Version('3.30.9')], latest(['3.30.9']))
+        self.assertEqual([], latest(strings, 0))
+        self.assertEqual([], latest([]))
+
+    def test_first_of_equal(self):
+        versions = [Version(1, 2), Version(1, 3), Version(1, 2),
+                    Version(1, 3), Version(1, 1)]
+        for n in range(1, 6):
+            actual = latest(versions, n)
+            expected = sorted(versions, reverse=True)[:n]
+            self.assertEqual([id(x) for x in expected],
+                             [id(x) for x in actual])
+
+    def test_where(self):
+        strings = ['1.0', '1.2rc1', '1.1', '1.3b2', '0.9']
+        self.assertEqual(
+            [Pep440Version('1.1'), Pep440Version('1.0')],
+            latest(strings, 2, lambda x: x.pre_release is None,
+                   Pep440Version))
+        self.assertEqual([], latest(strings, where=lambda x: False,
+                                    scheme=Pep440Version))
+
+    def test_skips_parsing(self):
+        calls = []
+
+        class Scheme(Version):
+            SEGMENT_DEFINITIONS = (
+                SegmentDefinition(),
+                SegmentDefinition(),
+            )
+
+            def validate(self):
+                calls.append(self)
+
+        strings = ['9.9'] + ['1.{}'.format(x) for x in range(100)]
+        self.assertEqual([Scheme('9.9')], latest(strings, scheme=Scheme))
+        self.assertEqual(2, len(calls))
+        self.assertRaises(ValueError, latest, ['bogus'], scheme=Scheme)
+
+    def test_scheme(self):
+        class Pooled(PgVersion):
+            INTERN_POOL = InternPool()
+        result = latest(['9.3.4', '9.3.5', '9.2'], 2, scheme=Pooled)
+        self.assertEqual([Pooled('9.3.5'), Pooled('9.3.4')], result)
+        self.assertEqual([Pooled, Pooled], [type(x) for x in result])
+        self.assertIs(Pooled('9.3.4'), result[1])
+        self.assertEqual([Version(9, 3, 5)],
+                         latest(['9.3.5', PgMajorVersion(9, 3)]))
+        result = latest([Pep440Version('1.0'), Pep440Version('2.0'), '1.5'])
+        self.assertEqual([Pep440Version('2.0')], result)
+        self.assertIs(Pep440Version, type(result[0]))
+        self.assertEqual([PgMajorVersion(9, 4), PgMajorVersion(9, 3)],
+                         latest([PgMajorVersion(9, 3), PgMajorVersion(9, 4)],
+                                2))
+        self.assertRaises(TypeError, latest, [9.3])
+
+    def test_custom_order(self):
+        class Backward(Version):
+            def __lt__(self, other):
+                return Version.__gt__(self, other)
+        r = random.Random(5)
+        strings = ['{}.{}'.format(r.randint(0, 3), r.randint(0, 9))
+                   for _ in range(300)]
+        versions = [Backward(x) for x in strings]
+        for n in (1, 5, 300):
+            expected = sorted(versions, reverse=True)[:n]
+            self.assertEqual(expected, latest(strings, n, scheme=Backward))
+            self.assertEqual(expected, latest(versions, n))
+        self.assertEqual([Backward(0, 0)], latest(versions))
+        self.assertRaises(TypeError, latest, [Pep440Version('1.0')],
+                          scheme=PgVersion)
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+"""sorted version collection verschemes tests"""
+
+import random
+import unittest
+
+from verschemes import Version
+from verschemes.pep440 import Pep440Version
+from verschemes.postgresql import PgMajorVersion, PgVersion
+from verschemes.versionset import VersionSet, VersionSortedDict
+
+
+def _random_versions(count, seed=0):
+    r = random.Random(seed)
+    return [PgVersion(r.randint(7, 12), r.randint(0, 6), r.randint(0, 30))
+            for _ in range(count)]
+
+
+class VersionSetTestCase(unittest.TestCase):
+
+    def test_order(self):
+        versions = VersionSet(['1.10', '1.2', '1.9.1', '1.2'])
+        versions.add('1.9')
+        self.assertIs(Version, versions.scheme)
+        self.assertEqual(4, len(versions))
+        self.assertEqual(['1.2', '1.9', '1.9.1', '1.10'],
+                         [str(x) for x in versions])
+        self.assertEqual(['1.10', '1.9.1', '1.9', '1.2'],
+                         [str(x) for x in reversed(versions)])
+        self.assertEqual(Version('1.2'), versions.min())
+        self.assertEqual(Version('1.10'), versions.max())
+
+    def test_scheme(self):
+        versions = VersionSet([PgVersion('9.3.4')])
+        self.assertIs(PgVersion, versions.scheme)
+        versions.add('9.3.2')
+        self.assertRaises(TypeError, versions.add, PgMajorVersion(9, 4))
+        self.assertEqual([PgVersion('9.3.2'), PgVersion('9.3.4')],
+                         list(versions))
+        versions = VersionSet(['9.3'])
+        versions.add(PgMajorVersion(9, 4))
+        self.assertEqual([Version('9.3'), Version('9.4')], list(versions))
+        self.assertTrue(all(type(x) is Version for x in versions))
+        self.assertRaises(ValueError, versions.add, 'bogus')
+        self.assertRaises(TypeError, versions.add, 9.3)
+        self.assertRaises(TypeError, VersionSet, [9.3])
+        self.assertIs(Pep440Version, VersionSet(scheme=Pep440Version).scheme)
+
+    def test_queries_keep_scheme_unset(self):
+        versions = VersionSet()
+        self.assertNotIn('1.0', versions)
+        versions.discard(PgVersion('9.3'))
+        self.assertIsNone(versions.floor('1.0'))
+        self.assertIsNone(versions.ceiling(PgVersion('9.3')))
+        self.assertEqual([], list(versions.irange('1.0', '2.0')))
+        self.assertIsNone(versions.scheme)
+        versions.add(PgVersion('9.3'))
+        self.assertIs(PgVersion, versions.scheme)
+        mapping = VersionSortedDict()
+        self.assertNotIn('1.0', mapping)
+        self.assertRaises(KeyError, mapping.__getitem__, PgVersion('9.3'))
+        self.assertRaises(KeyError, mapping.__delitem__, '1.0')
+        self.assertIsNone(mapping.scheme)
+        mapping[PgVersion('9.3')] = 1
+        self.assertIs(PgVersion, mapping.scheme)
+
+    def test_membership(self):
+        versions = VersionSet(['1.0', '1.1', '2!0.1'], Pep440Version)
+        self.assertIn('1.0', versions)
+        self.assertIn(Pep440Version('1.1'), versions)
+        self.assertNotIn('1.2', versions)
+        self.assertNotIn('1.0rc1', versions)
+        self.assertNotIn('bogus', versions)
+        self.assertNotIn(None, versions)
+        versions.discard('1.0')
+        versions.discard('1.0')
+        versions.discard('bogus')
+        self.assertNotIn('1.0', versions)
+        versions.remove('2!0.1')
+        self.assertRaises(KeyError, versions.remove, '2!0.1')
+        self.assertEqual([Pep440Version('1.1')], list(versions))
+        versions.clear()
+        self.assertEqual(0, len(versions))
+        self.assertRaises(ValueError, versions.min)
+        self.assertRaises(ValueError, versions.max)
+
+    def test_keeps_first(self):
+        first = PgVersion('9.3')
+        versions = VersionSet([first, PgVersion('9.3')])
+        versions.add(PgVersion('9.3'))
+        self.assertIs(first, versions.min())
+
+    def test_many(self):
+        # Enough versions to split the sublists several times.
+        items = _random_versions(3000)
+        versions = VersionSet()
+        for version in items:
+            versions.add(version)
+        expected = sorted(set(str(x) for x in items), key=PgVersion)
+        self.assertEqual(expected, [str(x) for x in versions])
+        self.assertGreater(len(versions._lists), 1)
+        for version in items[:2000]:
+            versions.discard(version)
+        expected = sorted(set(str(x) for x in items[2000:]) -
+                          set(str(x) for x in items[:2000]), key=PgVersion)
+        self.assertEqual(expected, [str(x) for x in versions])
+        self.assertEqual([x[-1] for x in versions._lists], versions._maxes)
+
+    def test_floor_ceiling(self):
+        versions = VersionSet(['1.2', '1.4', '1.6'])
+        self.assertEqual(Version('1.4'), versions.floor('1.5'))
+        self.assertEqual(Version('1.4'), versions.floor('1.4'))
+        self.assertEqual(Version('1.6'), versions.ceiling('1.5'))
+        self.assertEqual(Version('1.4'), versions.ceiling('1.4'))
+        self.assertIsNone(versions.floor('1.1'))
+        self.assertIsNone(versions.ceiling('1.7'))
+        self.assertIsNone(VersionSet().floor('1.0'))
+        items = _random_versions(2000)
+        versions = VersionSet(items)
+        ordered = sorted(versions)
+        for probe in _random_versions(50, seed=1):
+            self.assertEqual(max([x for x in ordered if x <= probe] or
+                                 [None]), versions.floor(probe))
+            self.assertEqual(min([x for x in ordered if x >= probe] or
+                                 [None]), versions.ceiling(probe))
+
+    def test_irange(self):
+        versions = VersionSet(['1.{}'.format(x) for x in range(10)])
+
+        def irange(*args, **kwargs):
+            return [str(x) for x in versions.irange(*args, **kwargs)]
+
+        self.assertEqual(['1.3', '1.4', '1.5'], irange('1.3', '1.5'))
+        self.assertEqual(['1.4'], irange('1.3', '1.5',
+                                         inclusive=(False, False)))
+        self.assertEqual(['1.5', '1.4', '1.3'], irange('1.3', '1.5',
+                                                       reverse=True))
+        self.assertEqual(['1.4', '1.3'], irange('1.3', '1.5', (True, False),
+                                                reverse=True))
+        self.assertEqual(['1.8', '1.9'], irange('1.7.5'))
+        self.assertEqual(['1.0', '1.1'], irange(maximum='1.1'))
+        self.assertEqual(['1.1', '1.0'], irange(maximum='1.1',
+                                                reverse=True))
+        self.assertEqual(10, len(irange()))
+        self.assertEqual([], irange('1.5', '1.3'))
+        versions = VersionSet(_random_versions(2000))
+        low, high = PgVersion('8.2.5'), PgVersion('10.1.3')
+        expected = [x for x in versions if low < x <= high]
+        self.assertEqual(expected, list(versions.irange(
+            low, high, inclusive=(False, True))))
+        self.assertEqual(expected[::-1], list(versions.irange(
+            low, high, inclusive=(False, True), reverse=True)))
+
+    def test_update(self):
+        items = _random_versions(3000)
+        expected = sorted(set(str(x) for x in items), key=PgVersion)
+        for first, second in ((items[:10], items[10:]),
+                              (items[:2900], items[2900:]),
+                              (items[:1500], VersionSet(items[1500:]))):
+            versions = VersionSet(first)
+            versions.update(second)
+            self.assertEqual(expected, [str(x) for x in versions])
+            self.assertEqual([x[-1] for x in versions._lists],
+                             versions._maxes)
+        versions = VersionSet(scheme=Version)
+        versions.update(VersionSet(['9.3.4', '9.3.2'], PgVersion), ['1.0'])
+        self.assertEqual([Version('1.0'), Version('9.3.2'),
+                          Version('9.3.4')], list(versions))
+        self.assertTrue(all(type(x) is Version for x in versions))
+
+    def test_set_operations(self):
+        a = VersionSet(['1.0', '1.1', '1.2'])
+        b = VersionSet(['1.1', '1.3'])
+        self.assertEqual(['1.0', '1.1', '1.2', '1.3'],
+                         [str(x) for x in a | b])
+        self.assertEqual(['1.1'], [str(x) for x in a & b])
+        self.assertEqual(['1.0', '1.2'], [str(x) for x in a - b])
+        self.assertIsInstance(a | b, VersionSet)
+        self.assertIs(Version, (a | b).scheme)
+        self.assertTrue(VersionSet(['1.1']) <= a)
+        self.assertEqual(a, a.copy())
+        self.assertIsNot(a, a.copy())
+        self.assertTrue(repr(VersionSet(['1.0'])).startswith(
+            'verschemes.versionset.VersionSet(['))
+        self.assertTrue(repr(VersionSet(['1.0'])).endswith(
+            '], scheme=verschemes.Version)'))
+
+    def test_incomparable(self):
+        # Like the versions themselves, a final release and a pre-release
+        # cannot be ordered.
+        versions = VersionSet(['1.0', '1.1'], Pep440Version)
+        self.assertRaises(TypeError, versions.add, '1.1rc1')
+        self.assertRaises(TypeError, versions.update,
+                          ['1.{}rc1'.format(x) for x in range(100)])
+        self.assertEqual(['1.0', '1.1'], [str(x) for x in versions])
+        self.assertEqual([x[-1] for x in versions._lists], versions._maxes)
+
+    def test_custom_order(self):
+        class Backward(Version):
+            def __lt__(self, other):
+                return Version.__gt__(self, other)
+        items = [Backward(str(x)) for x in _random_versions(2000)]
+        versions = VersionSet(items[:1000])
+        for version in items[1000:]:
+            versions.add(version)
+        ordered = sorted(set(str(x) for x in items), key=Backward)
+        self.assertEqual(ordered, [str(x) for x in versions])
+        self.assertEqual(Backward(ordered[0]), versions.min())
+        self.assertIn(str(items[0]), versions)
+        self.assertEqual(ordered[1:4], [str(x) for x in versions.irange(
+            ordered[1], ordered[3])])
+        self.assertEqual(Backward(ordered[2]), versions.floor(ordered[2]))
+        versions.discard(ordered[0])
+        self.assertEqual(Backward(ordered[1]), versions.min())
+
+
+class VersionSortedDictTestCase(unittest.TestCase):
+
+    def test_mapping(self):
+        mapping = VersionSortedDict({'1.10': 'c', '1.2': 'a'})
+        mapping['1.9'] = 'b'
+        mapping[Version('1.2')] = 'A'
+        self.assertEqual([('1.2', 'A'), ('1.9', 'b'), ('1.10', 'c')],
+                         [(str(k), v) for k, v in mapping.items()])
+        self.assertEqual('b', mapping['1.9'])
+        self.assertIn('1.10', mapping)
+        self.assertNotIn('1.11', mapping)
+        self.assertNotIn('bogus', mapping)
+        self.assertRaises(KeyError, mapping.__getitem__, '1.11')
+        self.assertRaises(KeyError, mapping.__getitem__, 'bogus')
+        self.assertEqual('x', mapping.get('1.11', 'x'))
+        del mapping['1.9']
+        self.assertRaises(KeyError, mapping.__delitem__, '1.9')
+        self.assertEqual(2, len(mapping))
+        self.assertEqual(['A', 'c'], list(mapping.values()))
+        self.assertEqual('A', mapping.pop('1.2'))
+        mapping.clear()
+        self.assertEqual([], list(mapping))
+
+    def test_queries(self):
+        mapping = VersionSortedDict(
+            [('9.{}'.format(x), x) for x in range(7)], PgVersion)
+        self.assertIs(PgVersion, mapping.scheme)
+        self.assertEqual(PgVersion('9.3'), mapping.floor('9.3.4'))
+        self.assertEqual(PgVersion('9.4'), mapping.ceiling('9.3.4'))
+        self.assertEqual(PgVersion('9.0'), mapping.min())
+        self.assertEqual(PgVersion('9.6'), mapping.max())
+        self.assertEqual([3, 4], [mapping[x] for x in
+                                  mapping.irange('9.3', '9.4')])
+        self.assertEqual([PgVersion('9.6'), PgVersion('9.5')],
+                         list(reversed(mapping))[:2])
+
+    def test_update(self):
+        items = [(x, i) for i, x in enumerate(_random_versions(2000))]
+        expected = {}
+        for version, value in items:
+            expected[str(version)] = value
+        for first, second in ((items[:10], items[10:]),
+                              (items[:1000],
+                               VersionSortedDict(items[1000:]))):
+            mapping = VersionSortedDict(first)
+            mapping.update(second)
+            self.assertEqual(sorted(expected, key=PgVersion),
+                             [str(x) for x in mapping])
+            self.assertEqual(expected, dict((str(k), v)
+                                            for k, v in mapping.items()))
+        mapping = VersionSortedDict(scheme=Version)
+        mapping.update(VersionSortedDict({'9.3.4': 1}, PgVersion))
+        self.assertEqual([(Version('9.3.4'), 1)], list(mapping.items()))
+        self.assertEqual(1, mapping['9.3.4'])
+        self.assertRaises(TypeError, mapping.update, v1=2)
+        self.assertEqual(mapping, mapping.copy())
+
+
+if __name__ == '__main__':
+    unittest.main()
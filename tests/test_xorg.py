@@ -2,6 +2,7 @@
 
 import unittest
 
+from verschemes import xorg
 from verschemes.xorg import XorgVersion
 
 
@@ -202,3 +203,70 @@ class XorgVersionTestCase(unittest.TestCase):
 
     def test_invalid_development(self):
         self.assertRaises(ValueError, XorgVersion, 7, 1, 3, 2)
+
+
+class XorgBatchTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.versions = [XorgVersion(x) for x in (
+            '1.2', '1.2.1', '1.2.99.1', '1.2.99.901', '1.2.99.903', '1.3',
+            '1.99.99.901', '1.2.99.900')]
+
+    def test_classification(self):
+        self.assertEqual(xorg.IS_RELEASE | xorg.IS_BUGFIX_RELEASE,
+                         XorgVersion('1.2.1').classification)
+        self.assertEqual(xorg.IS_PRE_FULL_RELEASE | xorg.IS_DEVELOPMENT,
+                         XorgVersion('1.2.99.1').classification)
+
+    def test_classification_computed_once(self):
+        calls = []
+        classify = xorg._classify
+
+        def counted(*args):
+            calls.append(args)
+            return classify(*args)
+        xorg._classifications.clear()
+        xorg._classify = counted
+        try:
+            version = XorgVersion('1.2.99.902')
+            self.assertEqual([(99, 902)], calls)
+            self.assertTrue(version.is_release_candidate)
+            self.assertFalse(version.is_development)
+            xorg.select([version, XorgVersion('7.2.99.902')],
+                        xorg.IS_RELEASE)
+            xorg.group_by_stable_branch([version])
+            self.assertEqual([(99, 902)], calls)
+        finally:
+            xorg._classify = classify
+
+    def test_classify_many(self):
+        self.assertEqual([x.classification for x in self.versions],
+                         xorg.classify_many(self.versions))
+
+    def test_select(self):
+        self.assertEqual(
+            [XorgVersion('1.2.99.901'), XorgVersion('1.2.99.903'),
+             XorgVersion('1.99.99.901')],
+            xorg.select(self.versions, xorg.IS_RELEASE_CANDIDATE))
+        self.assertEqual(
+            [XorgVersion('1.2.1')],
+            xorg.select(self.versions, xorg.IS_RELEASE,
+                        exclude=xorg.IS_FULL_RELEASE))
+
+    def test_group_by_stable_branch(self):
+        groups = xorg.group_by_stable_branch(self.versions)
+        self.assertEqual([XorgVersion('1.2.99.1')], groups[None])
+        self.assertEqual(
+            [XorgVersion('1.2.99.901'), XorgVersion('1.2.99.903'),
+             XorgVersion('1.3'), XorgVersion('1.2.99.900')],
+            groups['-1.3-branch'])
+        self.assertEqual([XorgVersion('1.99.99.901')], groups['-2.0-branch'])
+        self.assertEqual(
+            dict((k, [x.stable_branch_suffix for x in v])
+                 for k, v in groups.items()),
+            dict((k, [k] * len(v)) for k, v in groups.items()))
+
+    def test_compare_version(self):
+        from verschemes import Version
+        self.assertEqual(Version(1, 2, 0, 0), XorgVersion('1.2'))
+        self.assertLess(XorgVersion('1.2.99.901'), Version(1, 3))